@@ -27,6 +27,8 @@ export DJANGO_SETTINGS_MODULE=embark.settings.dev
 
 export NO_UPDATE_CHECK=1
 export IGNORE_EMBA=${IGNORE_EMBA:=0}
+# EMBA runs survive a server stop, the next start takes them over. STOP_EMBA=1 stops them
+export STOP_EMBA=${STOP_EMBA:=0}
 
 export WSL=0
 
@@ -38,8 +40,12 @@ cleaner() {
 
   if [[ ${#PID_FILES[@]} -ne 0 ]]; then
     for FILE in "${PID_FILES[@]}"; do
-      echo -e "${RED}""${BOLD}""Making sure the EMBA process with PID ""$(cat "${FILE}")"" from ""${FILE}"" is stopped""${NC}"
-      timeout 3s pkill -F "${FILE}"
+      if [[ ${STOP_EMBA} -eq 1 ]]; then
+        echo -e "${RED}""${BOLD}""Making sure the EMBA process with PID ""$(cat "${FILE}")"" from ""${FILE}"" is stopped""${NC}"
+        timeout 3s pkill -F "${FILE}"
+      elif pgrep -F "${FILE}" &>/dev/null; then
+        echo -e "${ORANGE}""${BOLD}""Leaving the EMBA process with PID ""$(cat "${FILE}")"" from ""${FILE}"" running, the next start takes it over""${NC}"
+      fi
     done
   fi
 
@@ -13,6 +13,7 @@ urlpatterns = [
     path('dashboard/', views.main_dashboard, name='embark-MainDashboard'),
     path('dashboard/main/', views.main_dashboard, name='embark-MainDashboard'),
     path('dashboard/service/', views.service_dashboard, name='embark-dashboard-service'),
+    path('dashboard/timings/', views.module_timings_dashboard, name='embark-dashboard-module-timings'),
     path('dashboard/report/', views.report_dashboard, name='embark-ReportDashboard'),
     path('dashboard/report/deleteAnalysis/<uuid:analysis_id>', views.delete_analysis, name='embark-dashboard-delete-analysis'),
     path('dashboard/report/archive/<uuid:analysis_id>', views.archive_analysis, name='embark-dashboard-archive'),
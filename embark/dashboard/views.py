@@ -10,6 +10,7 @@ from pathlib import Path
 import signal
 
 from django.conf import settings
+from django.db.models import F
 from django.shortcuts import render
 from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, HttpResponseServerError, JsonResponse
 from django.contrib.auth.decorators import login_required, permission_required
@@ -34,6 +35,9 @@ from workers.tasks import stop_remote_analysis
 logger = logging.getLogger(__name__)
 req_logger = logging.getLogger("requests")
 
+# finished analyses rendered on the service dashboard, the status snapshot only has the running ones
+SERVICE_DASHBOARD_FINISHED = 50
+
 
 @permission_required("users.dashboard_permission_minimal", login_url='/')
 @require_http_methods(["GET"])
@@ -67,6 +71,12 @@ def stop_analysis(request):
 
         logger.info("Stopping analysis with ID: %s", analysis.id)
 
+        # waiting analyses have no process yet
+        if BoundedExecutor.cancel_waiting(analysis.id):
+            form = StopAnalysisForm()
+            form.fields['analysis'].queryset = FirmwareAnalysis.objects.filter(user=request.user).filter(finished=False)
+            return render(request, 'dashboard/serviceDashboard.html', {'username': request.user.username, 'form': form, 'success_message': True, 'message': "Queued analysis removed."})
+
         pid = analysis.pid
         logger.debug("PID is %s", pid)
         try:
@@ -111,7 +121,22 @@ def service_dashboard(request):
     """
     form = StopAnalysisForm()
     form.fields['analysis'].queryset = FirmwareAnalysis.objects.filter(user=request.user).filter(finished=False).exclude(status__work=True)
-    return render(request, 'dashboard/serviceDashboard.html', {'username': request.user.username, 'form': form, 'success_message': False})
+    finished_analyses = FirmwareAnalysis.objects.filter(user=request.user, finished=True).exclude(failed=True).order_by(F('end_date').desc(nulls_last=True))[:SERVICE_DASHBOARD_FINISHED]
+    finished = [{'analysis': str(analysis.id), 'firmware_name': (analysis.status.get('firmware_name') or analysis.firmware_name).split(".")[0]} for analysis in finished_analyses]
+    return render(request, 'dashboard/serviceDashboard.html', {'username': request.user.username, 'form': form, 'success_message': False, 'finished': finished})
+
+
+@permission_required("users.dashboard_permission_minimal", login_url='/')
+@require_http_methods(["GET"])
+@login_required(login_url='/' + settings.LOGIN_URL)
+def module_timings_dashboard(request):
+    """
+    showing the EMBA modules that dominate the wall time of all analyses
+    uses get_module_timings for the data
+    :params request: req
+    :return httpresp: html module timings dashboard
+    """
+    return render(request, 'dashboard/moduleTimings.html', {'username': request.user.username})
 
 
 @permission_required("users.dashboard_permission_minimal", login_url='/')
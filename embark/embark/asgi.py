@@ -23,7 +23,11 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'embark.settings.deploy')
 django.setup()
 
 from embark.routing import ws_urlpatterns
+from embark.startup import reconcile_analyses
 
 application = ProtocolTypeRouter({
     'websocket': AuthMiddlewareStack(ws_urlpatterns)
 })
+
+# daphne loads this right at the start, the wsgi processes only with their first request
+reconcile_analyses()
@@ -24,8 +24,11 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'embark.settings.deploy')
 django.setup()
 
 from embark.routing import ws_urlpatterns
+from embark.startup import reconcile_analyses
 
 application = ProtocolTypeRouter({
     'http': get_asgi_application(),
     'websocket': AuthMiddlewareStack(ws_urlpatterns)
 })
+
+reconcile_analyses()
@@ -9,7 +9,7 @@ import logging
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
-from uploader.models import FirmwareAnalysis
+from embark.statussnapshot import get_status_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -20,13 +20,8 @@ class ProgressConsumer(AsyncWebsocketConsumer):
     @database_sync_to_async
     def get_message(self):
         logger.info("Getting status for user %s", self.scope['user'])
-        analysis_list = FirmwareAnalysis.objects.filter(user=self.scope['user']).exclude(failed=True)
-        logger.debug("Found the following list of analysis for user %s : %s", self.scope['user'], analysis_list)
-        logger.debug("User has %d analysis running", analysis_list.count())
-        if analysis_list.count() > 0:
-            message = {str(analysis_.id): analysis_.status for analysis_ in analysis_list}
-            return message
-        return "Please Wait"
+        # running analyses only, updates and the finish of each one arrive as deltas through the group
+        return get_status_snapshot(self.scope['user'])
 
     # this method is executed when the connection to the frontend is established
     async def connect(self):
@@ -45,8 +40,8 @@ class ProgressConsumer(AsyncWebsocketConsumer):
     async def receive(self, text_data=None, bytes_data=None):
         logger.info("WS - receive")
         if text_data == "Reload":
-            # Send message to room group
-            await self.channel_layer.group_send(self.room_group_name, {"type": 'send.message', "message": await self.get_message()})
+            # snapshot for this socket only, the other sockets of the user are up to date
+            await self.send(await self.get_message())
 
     # called when websocket connection is closed
     async def disconnect(self, code):
@@ -2,14 +2,120 @@ __copyright__ = 'Copyright 2022-2026 Siemens Energy AG, Copyright 2025 The AMOS
 __author__ = 'Benedikt Kuehne, ashiven'
 __license__ = 'MIT'
 
+import logging
 import socket
+import threading
 from random import randrange
 import os
 from pathlib import Path
 import subprocess
+from types import MappingProxyType
+from typing import NamedTuple
 
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
+# used if EMBA isn't installed (yet)
+EMBA_MODULES_FALLBACK = {
+    'D_Modules': [
+        ('d10', 'D10_firmware_diffing'),
+        ('d02', 'D02_firmware_diffing_bin_details'),
+        ('d05', 'D05_firmware_diffing_extractor')
+    ],
+    'F_Modules': [
+        ('f02', 'F02_toolchain'),
+        ('f50', 'F50_base_aggregator'),
+        ('f15', 'F15_cyclonedx_sbom'),
+        ('f05', 'F05_qs_resolver'),
+        ('f10', 'F10_license_summary'),
+        ('f20', 'F20_vul_aggregator')
+    ],
+    'L_Modules': [
+        ('l99', 'L99_cleanup'),
+        ('l35', 'L35_metasploit_check'),
+        ('l10', 'L10_system_emulation'),
+        ('l23', 'L23_vnc_checks'),
+        ('l25', 'L25_web_checks'),
+        ('l20', 'L20_snmp_checks'),
+        ('l22', 'L22_upnp_hnap_checks'),
+        ('l15', 'L15_emulated_checks_nmap')
+    ],
+    'P_Modules': [
+        ('p15', 'P15_ubi_extractor'),
+        ('p60', 'P60_deep_extractor'),
+        ('p02', 'P02_firmware_bin_file_check'),
+        ('p35', 'P35_UEFI_extractor'),
+        ('p14', 'P14_ext_mounter'),
+        ('p07', 'P07_windows_exe_extract'),
+        ('p25', 'P25_android_ota'),
+        ('p18', 'P18_BMC_decryptor'),
+        ('p99', 'P99_prepare_analyzer'),
+        ('p50', 'P50_binwalk_extractor'),
+        ('p20', 'P20_foscam_decryptor'),
+        ('p40', 'P40_DJI_extractor'),
+        ('p22', 'P22_Zyxel_zip_decrypt'),
+        ('p17', 'P17_gpg_decompress'),
+        ('p65', 'P65_package_extractor'),
+        ('p21', 'P21_buffalo_decryptor'),
+        ('p19', 'P19_bsd_ufs_mounter'),
+        ('p23', 'P23_qemu_qcow_mounter'),
+        ('p55', 'P55_unblob_extractor'),
+        ('p10', 'P10_vmdk_extractor')
+    ],
+    'Q_Modules': [('q02', 'Q02_openai_question')],
+    'S_Modules': [
+        ('s100', 'S100_command_inj_check'),
+        ('s99', 'S99_grepit'),
+        ('s90', 'S90_mail_check'),
+        ('s03', 'S03_firmware_bin_base_analyzer'),
+        ('s20', 'S20_shell_check'),
+        ('s02', 'S02_UEFI_FwHunt'),
+        ('s45', 'S45_pass_file_check'),
+        ('s12', 'S12_binary_protection'),
+        ('s23', 'S23_lua_check'),
+        ('s110', 'S110_yara_check'),
+        ('s60', 'S60_cert_file_check'),
+        ('s35', 'S35_http_file_check'),
+        ('s24', 'S24_kernel_bin_identifier'),
+        ('s16', 'S16_ghidra_decompile_checks'),
+        ('s50', 'S50_authentication_check'),
+        ('s108', 'S108_stacs_password_search'),
+        ('s21', 'S21_python_check'),
+        ('s109', 'S109_jtr_local_pw_cracking'),
+        ('s17', 'S17_cwe_checker'),
+        ('s25', 'S25_kernel_check'),
+        ('s09', 'S09_firmware_base_version_check'),
+        ('s65', 'S65_config_file_check'),
+        ('s18', 'S18_capa_checker'),
+        ('s36', 'S36_lighttpd'),
+        ('s05', 'S05_firmware_details'),
+        ('s115', 'S115_usermode_emulator'),
+        ('s55', 'S55_history_file_check'),
+        ('s27', 'S27_perl_check'),
+        ('s80', 'S80_cronjob_check'),
+        ('s19', 'S19_apk_check'),
+        ('s95', 'S95_interesting_files_check'),
+        ('s75', 'S75_network_check'),
+        ('s106', 'S106_deep_key_search'),
+        ('s107', 'S107_deep_password_search'),
+        ('s15', 'S15_radare_decompile_checks'),
+        ('s07', 'S07_bootloader_check'),
+        ('s22', 'S22_php_check'),
+        ('s26', 'S26_kernel_vuln_verifier'),
+        ('s85', 'S85_ssh_check'),
+        ('s10', 'S10_binaries_basic_check'),
+        ('s13', 'S13_weak_func_check'),
+        ('s08', 'S08_main_package_sbom'),
+        ('s40', 'S40_weak_perm_check'),
+        ('s118', 'S118_busybox_verifier'),
+        ('s14', 'S14_weak_func_radare_check'),
+        ('s116', 'S116_qemu_version_detection'),
+        ('s04', 'S04_windows_basic_analysis'),
+        ('s06', 'S06_distribution_identification')
+    ]
+}
+
 
 def rnd_rgb_color():
     """
@@ -110,6 +216,81 @@ def count_emba_modules(module_dict):
     return s_module_cnt, p_module_cnt, q_module_cnt, l_module_cnt, f_module_cnt, d_module_cnt
 
 
+class EmbaModuleCatalog(NamedTuple):
+    """
+    read-only view of the installed EMBA modules
+    modules: {"S_Modules": (('s02', 'S02_UEFI_FwHunt'), ...), ...}
+    counts: per-phase counts in the order of count_emba_modules
+    mtime: mtime of EMBA_ROOT/modules the catalog was built from (None for the fallback)
+    """
+    modules: MappingProxyType
+    counts: tuple
+    mtime: float
+
+
+_MODULE_CATALOG = None
+_MODULE_CATALOG_LOCK = threading.Lock()
+
+
+def _build_emba_module_catalog(emba_dir_path) -> EmbaModuleCatalog:
+    try:
+        mtime = os.stat(f"{emba_dir_path}/modules").st_mtime
+        module_dict = get_emba_modules(emba_dir_path)
+    except FileNotFoundError:
+        logger.info("EMBA modules not found in %s, using fallback module list", emba_dir_path)
+        mtime = None
+        module_dict = EMBA_MODULES_FALLBACK
+    return EmbaModuleCatalog(
+        modules=MappingProxyType({phase: tuple(modules) for phase, modules in module_dict.items()}),
+        counts=count_emba_modules(module_dict),
+        mtime=mtime
+    )
+
+
+def get_emba_module_catalog(check=False) -> EmbaModuleCatalog:
+    """
+    returns the shared module catalog, built on first use
+    without check no filesystem access is done (log parsing), with check the catalog gets
+    rebuilt if the mtime of EMBA_ROOT/modules changed
+
+    :param check: compare the mtime of the modules dir
+    :return: EmbaModuleCatalog
+    """
+    global _MODULE_CATALOG
+    catalog = _MODULE_CATALOG
+    if catalog is not None and not check:
+        return catalog
+    if catalog is not None:
+        try:
+            mtime = os.stat(f"{settings.EMBA_ROOT}/modules").st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime == catalog.mtime:
+            return catalog
+    with _MODULE_CATALOG_LOCK:
+        if _MODULE_CATALOG is catalog:
+            _MODULE_CATALOG = _build_emba_module_catalog(settings.EMBA_ROOT)
+            logger.debug("EMBA module catalog built with counts %s", _MODULE_CATALOG.counts)
+        return _MODULE_CATALOG
+
+
+def invalidate_emba_module_catalog():
+    """
+    drops the cached module catalog (e.g. after an EMBA update)
+    """
+    global _MODULE_CATALOG
+    with _MODULE_CATALOG_LOCK:
+        _MODULE_CATALOG = None
+
+
+def get_emba_module_choices():
+    """
+    choices for the scan_modules fields, evaluated on use
+    """
+    modules = get_emba_module_catalog(check=True).modules
+    return modules['F_Modules'] + modules['L_Modules'] + modules['P_Modules'] + modules['S_Modules'] + modules['Q_Modules']
+
+
 def get_version_strings():
     if Path(f"{settings.BASE_DIR}/VERSION.txt").exists():
         with open(Path(f"{settings.BASE_DIR}/VERSION.txt"), 'r', encoding='UTF-8') as embark_version_file:
@@ -0,0 +1,131 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import json
+import logging
+
+from django.conf import settings
+from redis import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+REDIS_CLIENT = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+
+# hash of the scalar status fields (json encoded values)
+LIVE_KEY = "LIVE_PROGRESS__{}"
+# append only event lists of the status
+LIVE_LISTS = ("module_list", "phase_list")
+# left overs of analyses nobody finalized expire, every update extends them
+LIVE_TTL = 7 * 24 * 3600
+
+
+class LiveProgress:
+    """
+    class LiveProgress
+    Live status of one running analysis in redis, FirmwareAnalysis.status is only written once it's done.
+    Scalar fields are single hash fields, modules and phases are appended to lists,
+    so an update costs the changed fields instead of rewriting the whole status row.
+    The db status is the base the live fields are laid over, the writer seeds the lists with replace
+    """
+
+    def __init__(self, analysis_id):
+        self.analysis_id = analysis_id
+        self.key = LIVE_KEY.format(analysis_id)
+        self.list_keys = {name: f"{self.key}__{name}" for name in LIVE_LISTS}
+
+    def _expire(self, pipe):
+        pipe.expire(self.key, LIVE_TTL)
+        for list_key in self.list_keys.values():
+            pipe.expire(list_key, LIVE_TTL)
+
+    def update(self, fields, appended=None):
+        """
+        Sets scalar fields and appends events in one round trip
+
+        :param fields: {field: json serializable value}
+        :param appended: {list name: [new entries]}
+        """
+        try:
+            with REDIS_CLIENT.pipeline() as pipe:
+                if fields:
+                    pipe.hset(self.key, mapping={field: json.dumps(value) for field, value in fields.items()})
+                for name, entries in (appended or {}).items():
+                    if entries:
+                        pipe.rpush(self.list_keys[name], *(json.dumps(entry) for entry in entries))
+                self._expire(pipe)
+                pipe.execute()
+        except RedisError as error:
+            logger.error("Live progress of %s not updated: %s", self.analysis_id, error)
+
+    def replace(self, status):
+        """
+        Replaces the live state with a complete status, e.g. the one a resumed reader restored
+
+        :param status: status dict like FirmwareAnalysis.status
+        """
+        try:
+            with REDIS_CLIENT.pipeline() as pipe:
+                pipe.delete(self.key, *self.list_keys.values())
+                pipe.hset(self.key, mapping={field: json.dumps(value) for field, value in status.items() if field not in LIVE_LISTS})
+                for name, list_key in self.list_keys.items():
+                    if status.get(name):
+                        pipe.rpush(list_key, *(json.dumps(entry) for entry in status[name]))
+                self._expire(pipe)
+                pipe.execute()
+        except RedisError as error:
+            logger.error("Live progress of %s not replaced: %s", self.analysis_id, error)
+
+    def read(self):
+        """
+        :return: (fields, {list name: entries}) or None if there is no live state
+        """
+        try:
+            with REDIS_CLIENT.pipeline(transaction=False) as pipe:
+                pipe.hgetall(self.key)
+                for list_key in self.list_keys.values():
+                    pipe.lrange(list_key, 0, -1)
+                fields, *lists = pipe.execute()
+        except RedisError as error:
+            logger.error("Live progress of %s not readable: %s", self.analysis_id, error)
+            return None
+        if not fields:
+            return None
+        return ({field.decode(): json.loads(value) for field, value in fields.items()},
+                {name: [json.loads(entry) for entry in entries] for name, entries in zip(LIVE_LISTS, lists) if entries})
+
+    def load(self, status):
+        """
+        :param status: db status of the analysis
+        :return: status with the live fields and events, the db status if there are none
+        """
+        live = self.read()
+        if live is None:
+            return status
+        fields, lists = live
+        return {**status, **fields, **lists}
+
+    def clear(self):
+        try:
+            REDIS_CLIENT.delete(self.key, *self.list_keys.values())
+        except RedisError as error:
+            logger.error("Live progress of %s not removed: %s", self.analysis_id, error)
+
+    def materialize(self, analysis, fields, update_fields):
+        """
+        Writes the live status into FirmwareAnalysis.status with one narrow update and drops the live state.
+        Without a live state the status the reader stored at its finish is reloaded, a stale instance doesn't overwrite it
+
+        :param analysis: FirmwareAnalysis of this live progress
+        :param fields: final status fields, e.g. finished
+        :param update_fields: other model fields saved with the status
+        """
+        live = self.read()
+        if live is None:
+            analysis.refresh_from_db(fields=["status"])
+        else:
+            analysis.status = {**analysis.status, **live[0], **live[1]}
+        analysis.status.update(fields)
+        analysis.save(update_fields=["status", *update_fields])
+        self.clear()
@@ -0,0 +1,113 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import logging
+import re
+
+from datetime import datetime
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# event kinds
+EVENT_MODULE_STARTED = "module_started"
+EVENT_MODULE_FINISHED = "module_finished"
+EVENT_PHASE = "phase"
+EVENT_TEST_ENDED = "test_ended"
+EVENT_FAILED = "failed"
+
+COLOR_PATTERN = re.compile(r"\x1b\[.{1,5}m")
+# [*] Wed May 10 11:18:18 CEST 2023 - P02_firmware_bin_file_check finished
+MODULE_PATTERN = re.compile(r"\[\*\] (?P<stamp>[^-]+?) - (?P<module>\S+) (?P<state>starting|finished)")
+# [!] Testing phase started on Wed May 10 11:20:22 CEST 2023
+PHASE_PATTERN = re.compile(r"\[!\] ?(?P<text>\S.*)")
+# timestamp inside phase lines
+PHASE_STAMP_PATTERN = re.compile(r" on (?P<stamp>\w{3} \w{3} +\d+ [\d:]{8} \S+ \d{4})")
+
+DONE_PATTERN = "Test ended on"
+FAILED_PATTERN = "EMBA failed in docker mode!"
+
+# date format of emba.log without the timezone token
+STAMP_FORMAT = "%a %b %d %H:%M:%S %Y"
+
+
+class LogEvent(NamedTuple):
+    """
+    one classified line of emba.log
+    kind: one of the EVENT_* constants
+    text: module name for module events, phase text for all others
+    stamp: raw timestamp string as written by EMBA (or "")
+    """
+    kind: str
+    text: str
+    stamp: str = ""
+
+    @property
+    def timestamp(self):
+        """
+        :return: naive datetime of the event, None if there is none or it can't be parsed
+        """
+        return parse_stamp(self.stamp)
+
+
+def parse_stamp(stamp):
+    """
+    parses EMBA timestamps like "Wed May 10 11:18:18 CEST 2023", the timezone token is ignored
+
+    :param stamp: timestamp string
+    :return: naive datetime or None
+    """
+    tokens = stamp.split()
+    if len(tokens) == 6:
+        del tokens[4]
+    try:
+        return datetime.strptime(" ".join(tokens), STAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def classify_line(line):
+    """
+    classifies a single line of emba.log in one pass
+
+    :param line: log line (with or without line ending and color codes)
+    :return: LogEvent or None for uninteresting lines
+    """
+    if "\x1b" in line:
+        line = COLOR_PATTERN.sub('', line)
+    if line.startswith("[*"):
+        match = MODULE_PATTERN.match(line)
+        if match is None:
+            return None
+        kind = EVENT_MODULE_FINISHED if match.group("state") == "finished" else EVENT_MODULE_STARTED
+        return LogEvent(kind, match.group("module"), match.group("stamp"))
+    if line.startswith("[!"):
+        match = PHASE_PATTERN.match(line)
+        return _phase_event(match.group("text").rstrip()) if match else None
+    if FAILED_PATTERN in line:
+        return LogEvent(EVENT_FAILED, line.strip())
+    return None
+
+
+def _phase_event(text):
+    stamp_match = PHASE_STAMP_PATTERN.search(text)
+    stamp = stamp_match.group("stamp") if stamp_match else ""
+    if DONE_PATTERN in text:
+        return LogEvent(EVENT_TEST_ENDED, text, stamp)
+    if FAILED_PATTERN in text:
+        return LogEvent(EVENT_FAILED, text, stamp)
+    return LogEvent(EVENT_PHASE, text, stamp)
+
+
+def classify_lines(lines):
+    """
+    classifies lines in order, skipping everything that isn't an event
+
+    :param lines: iterable of log lines
+    :return: generator of LogEvent
+    """
+    for line in lines:
+        event = classify_line(line)
+        if event is not None:
+            yield event
@@ -1,28 +1,29 @@
-# pylint: disable=W0602
+# pylint: disable=W0602, R0902
 # ignores no-assignment error since there is one!
 __copyright__ = 'Copyright 2021-2026 Siemens Energy AG, Copyright 2021 The AMOS Projects'
 __author__ = 'Benedikt Kuehne, m-1-k-3, diegiesskanne, Maximilian Wagner, Garima Chauhan, Ashutosh Singh'
 __license__ = 'MIT'
 
-import builtins
-import difflib
+import json
+import os
 import pathlib
 import re
-import time
 import logging
+import threading
 
-import rx
-import rx.operators as ops
-
-from inotify_simple import INotify, flags
-from asgiref.sync import async_to_sync
-
-from channels.layers import get_channel_layer
 from django.conf import settings
+from django.db import close_old_connections
 from django.utils import timezone
 
-from uploader.models import FirmwareAnalysis
-from embark.helper import count_emba_modules, get_emba_modules
+from uploader.models import FirmwareAnalysis, ModuleTiming, jsonfield_default_value
+from embark.helper import get_emba_module_catalog
+from embark.logparser import EVENT_FAILED, EVENT_MODULE_FINISHED, EVENT_MODULE_STARTED, EVENT_PHASE, EVENT_TEST_ENDED, classify_line
+from embark.liveprogress import LIVE_LISTS, LiveProgress
+from embark.logwatcher import EVENT_CREATED, log_watcher
+from embark.progress import ProgressEstimator, phase_name, record_module_durations
+from embark.statussnapshot import publish_status
+from embark.statuswriter import StatusWriter
+from embark.tailer import LogTailer
 
 
 logger = logging.getLogger(__name__)
@@ -33,9 +34,20 @@ EMBA_P_PHASE = 0
 EMBA_S_PHASE = 1
 EMBA_L_PHASE = 2
 EMBA_F_PHASE = 3
+# status fields the reader changes, written to the live progress with every status write
+LIVE_FIELDS = ("percentage", "eta", "last_update", "last_module", "last_phase", "finished")
 
 
 class LogReader:
+    """
+    class LogReader
+    Follows the emba.log of one analysis and pushes status updates to the live progress and the frontend,
+    the status row is written once at the finish
+    Doesn't block a thread, the reader is driven by the shared log_watcher
+    Progress is checkpointed with every status write, a new reader for the same analysis resumes from there
+    Percentage and ETA are weighted with the historical module runtimes once there is a history
+    """
+
     def __init__(self, firmware_id):
 
         # global module count and status_msg directory
@@ -46,55 +58,92 @@ class LogReader:
             self.analysis = FirmwareAnalysis.objects.get(id=self.firmware_id)
         except FirmwareAnalysis.DoesNotExist:
             logger.error("No Analysis with this id (%s)", self.firmware_id_str)
+            self.analysis = None
+            return
 
-        # set variables for channels communication
         self.user = self.analysis.user
-        self.room_group_name = f"services_{self.user}"
-        self.channel_layer = get_channel_layer()
 
         # variables for cleanup
         self.finish = False
-        # self.wd = None
+
+        # incremental reader for emba.log
+        self.log_path = f"{self.analysis.path_to_logs}/emba.log"
+        self.tailer = LogTailer(self.log_path)
+        # watcher thread and the starting thread might read at the same time
+        self.lock = threading.Lock()
+
+        # merges status updates, writes at most once per STATUS_FLUSH_INTERVAL
+        self.status_writer = StatusWriter(self.write_status, settings.STATUS_FLUSH_INTERVAL)
+        # the status row is only written at the finish, until then the changes go to the live progress
+        self.live = LiveProgress(self.firmware_id)
+        # entries of the status lists already appended to the live progress
+        self.live_lengths = {name: 0 for name in LIVE_LISTS}
 
         # status update dict (appended to db)
         self.status_msg = {
             "percentage": 0,
             "module": "",
             "phase": "",
+            "eta": None,
         }
 
+        # time weighted progress from the historical module runtimes
+        self.progress = ProgressEstimator.from_history()
+        # finished module timings, bulk inserted with the next status write
+        self.timing_buffer = []
+
+        # offset after the last processed line
+        self.line_offset = 0
+        self.checkpoint_path = f"{settings.EMBA_LOG_ROOT}/{self.firmware_id}/logreader.json"
+        self.load_checkpoint()
+
         # start processing
-        time.sleep(10)   # embas dep-check takes some time
-        if self.analysis:
-            self.read_loop()
-        else:
-            self.cleanup()
+        self.start()
 
     def save_status(self):
         logger.debug("Appending status with message: %s", self.status_msg)
-        # append message to the json-field structure of the analysis
-        self.analysis.status["percentage"] = self.status_msg["percentage"]
-        self.analysis.status["last_update"] = str(timezone.now())
-        # append modules and phase list
-        if self.status_msg["module"] != self.analysis.status["last_module"]:
-            self.analysis.status["last_module"] = self.status_msg["module"]
-            self.analysis.status["module_list"].append(self.status_msg["module"])
-        if self.status_msg["phase"] != self.analysis.status["last_phase"]:
-            self.analysis.status["last_phase"] = self.status_msg["phase"]
-            self.analysis.status["phase_list"].append(self.status_msg["phase"])
-        if self.status_msg["percentage"] == 100:
-            self.analysis.status["finished"] = True
+        with self.status_writer.lock:
+            # append message to the json-field structure of the analysis
+            self.analysis.status["percentage"] = self.status_msg["percentage"]
+            self.analysis.status["eta"] = self.status_msg.get("eta")
+            self.analysis.status["last_update"] = str(timezone.now())
+            # append modules and phase list
+            if self.status_msg["module"] != self.analysis.status["last_module"]:
+                self.analysis.status["last_module"] = self.status_msg["module"]
+                self.analysis.status["module_list"].append(self.status_msg["module"])
+            phase_changed = self.status_msg["phase"] != self.analysis.status["last_phase"]
+            if phase_changed:
+                self.analysis.status["last_phase"] = self.status_msg["phase"]
+                self.analysis.status["phase_list"].append(self.status_msg["phase"])
+            if self.status_msg["percentage"] == 100:
+                self.analysis.status["finished"] = True
+        # db write and websocket push are coalesced, phase changes and the finish go out right away
+        self.status_writer.update(force=phase_changed or self.analysis.status["finished"])
+
+    def write_status(self):
+        """
+        Persists the current status and sends it to the users group, called by the status writer
+        """
+        # timings and checkpoint first, a resumed reader restores the status from it
+        self.flush_timings()
+        self.write_checkpoint()
+        if self.analysis.status["finished"]:
             self.analysis.save(update_fields=["status"], force_update=True)
+            self.live.clear()
         else:
-            self.analysis.save(update_fields=["status"])
+            self.write_live_status()
         logger.debug("Checking status: %s", self.analysis.status)
-        # send it to group
-        async_to_sync(self.channel_layer.group_send)(
-            self.room_group_name, {
-                "type": 'send.message',
-                "message": {str(self.analysis.id): self.analysis.status}
-            }
-        )
+        # update the users snapshot and send the delta to the group
+        publish_status(self.analysis)
+
+    def write_live_status(self):
+        """
+        Sets the changed scalar fields and appends the new modules and phases to the live progress
+        """
+        status = self.analysis.status
+        appended = {name: status[name][self.live_lengths[name]:] for name in LIVE_LISTS}
+        self.live.update({field: status[field] for field in LIVE_FIELDS}, appended)
+        self.live_lengths = {name: len(status[name]) for name in LIVE_LISTS}
 
     @staticmethod
     def phase_identify(status_message):
@@ -105,108 +154,8 @@ class LogReader:
         reporting_phase_pattern = "Reporting phase"             # P-Modules
         done_pattern = "Test ended on"
         failed_pattern = "EMBA failed in docker mode!"
-        try:
-            emba_module_dict = get_emba_modules(settings.EMBA_ROOT)
-        except FileNotFoundError:
-            emba_module_dict = {
-                'D_Modules': [
-                    ('d10', 'D10_firmware_diffing'),
-                    ('d02', 'D02_firmware_diffing_bin_details'),
-                    ('d05', 'D05_firmware_diffing_extractor')
-                ],
-                'F_Modules': [
-                    ('f02', 'F02_toolchain'),
-                    ('f50', 'F50_base_aggregator'),
-                    ('f15', 'F15_cyclonedx_sbom'),
-                    ('f05', 'F05_qs_resolver'),
-                    ('f10', 'F10_license_summary'),
-                    ('f20', 'F20_vul_aggregator')
-                ],
-                'L_Modules': [
-                    ('l99', 'L99_cleanup'),
-                    ('l35', 'L35_metasploit_check'),
-                    ('l10', 'L10_system_emulation'),
-                    ('l23', 'L23_vnc_checks'),
-                    ('l25', 'L25_web_checks'),
-                    ('l20', 'L20_snmp_checks'),
-                    ('l22', 'L22_upnp_hnap_checks'),
-                    ('l15', 'L15_emulated_checks_nmap')
-                ],
-                'P_Modules': [
-                    ('p15', 'P15_ubi_extractor'),
-                    ('p60', 'P60_deep_extractor'),
-                    ('p02', 'P02_firmware_bin_file_check'),
-                    ('p35', 'P35_UEFI_extractor'),
-                    ('p14', 'P14_ext_mounter'),
-                    ('p07', 'P07_windows_exe_extract'),
-                    ('p25', 'P25_android_ota'),
-                    ('p18', 'P18_BMC_decryptor'),
-                    ('p99', 'P99_prepare_analyzer'),
-                    ('p50', 'P50_binwalk_extractor'),
-                    ('p20', 'P20_foscam_decryptor'),
-                    ('p40', 'P40_DJI_extractor'),
-                    ('p22', 'P22_Zyxel_zip_decrypt'),
-                    ('p17', 'P17_gpg_decompress'),
-                    ('p65', 'P65_package_extractor'),
-                    ('p21', 'P21_buffalo_decryptor'),
-                    ('p19', 'P19_bsd_ufs_mounter'),
-                    ('p23', 'P23_qemu_qcow_mounter'),
-                    ('p55', 'P55_unblob_extractor'),
-                    ('p10', 'P10_vmdk_extractor')
-                ],
-                'Q_Modules': [('q02', 'Q02_openai_question')],
-                'S_Modules': [
-                    ('s100', 'S100_command_inj_check'),
-                    ('s99', 'S99_grepit'),
-                    ('s90', 'S90_mail_check'),
-                    ('s03', 'S03_firmware_bin_base_analyzer'),
-                    ('s20', 'S20_shell_check'),
-                    ('s02', 'S02_UEFI_FwHunt'),
-                    ('s45', 'S45_pass_file_check'),
-                    ('s12', 'S12_binary_protection'),
-                    ('s23', 'S23_lua_check'),
-                    ('s110', 'S110_yara_check'),
-                    ('s60', 'S60_cert_file_check'),
-                    ('s35', 'S35_http_file_check'),
-                    ('s24', 'S24_kernel_bin_identifier'),
-                    ('s16', 'S16_ghidra_decompile_checks'),
-                    ('s50', 'S50_authentication_check'),
-                    ('s108', 'S108_stacs_password_search'),
-                    ('s21', 'S21_python_check'),
-                    ('s109', 'S109_jtr_local_pw_cracking'),
-                    ('s17', 'S17_cwe_checker'),
-                    ('s25', 'S25_kernel_check'),
-                    ('s09', 'S09_firmware_base_version_check'),
-                    ('s65', 'S65_config_file_check'),
-                    ('s18', 'S18_capa_checker'),
-                    ('s36', 'S36_lighttpd'),
-                    ('s05', 'S05_firmware_details'),
-                    ('s115', 'S115_usermode_emulator'),
-                    ('s55', 'S55_history_file_check'),
-                    ('s27', 'S27_perl_check'),
-                    ('s80', 'S80_cronjob_check'),
-                    ('s19', 'S19_apk_check'),
-                    ('s95', 'S95_interesting_files_check'),
-                    ('s75', 'S75_network_check'),
-                    ('s106', 'S106_deep_key_search'),
-                    ('s107', 'S107_deep_password_search'),
-                    ('s15', 'S15_radare_decompile_checks'),
-                    ('s07', 'S07_bootloader_check'),
-                    ('s22', 'S22_php_check'),
-                    ('s26', 'S26_kernel_vuln_verifier'),
-                    ('s85', 'S85_ssh_check'),
-                    ('s10', 'S10_binaries_basic_check'),
-                    ('s13', 'S13_weak_func_check'),
-                    ('s08', 'S08_main_package_sbom'),
-                    ('s40', 'S40_weak_perm_check'),
-                    ('s118', 'S118_busybox_verifier'),
-                    ('s14', 'S14_weak_func_radare_check'),
-                    ('s116', 'S116_qemu_version_detection'),
-                    ('s04', 'S04_windows_basic_analysis'),
-                    ('s06', 'S06_distribution_identification')
-                ]
-            }
-        emba_s_mod_cnt, emba_p_mod_cnt, _emba_q_mod_cnt, emba_l_mod_cnt, emba_f_mod_cnt, _emba_d_mod_cnt = count_emba_modules(emba_module_dict)
+        # shared catalog, no filesystem access per status line
+        emba_s_mod_cnt, emba_p_mod_cnt, _emba_q_mod_cnt, emba_l_mod_cnt, emba_f_mod_cnt, _emba_d_mod_cnt = get_emba_module_catalog().counts
         del _emba_q_mod_cnt, _emba_d_mod_cnt
         # calculate percentage
         max_module = -2
@@ -235,7 +184,7 @@ class LogReader:
         return max_module, phase_nmbr
 
     # update our dict whenever a new module is being processed
-    def update_status(self, stream_item_list):
+    def update_status(self, module):
         percentage = 0
         max_module, phase_nmbr = self.phase_identify(self.status_msg)
         if max_module == 0:
@@ -253,172 +202,245 @@ class LogReader:
             logger.error("Undefined state in logreader %s ", self.status_msg)
             percentage = self.status_msg["percentage"]  # stays the same
 
+        # weighted with the module runtimes, falls back to the module count without history
+        estimate = self.progress.estimate() if max_module > 0 else None
+        if estimate is not None:
+            percentage = max(estimate[0], self.status_msg["percentage"])
+            self.status_msg["eta"] = estimate[1]
+
         logger.debug("Status is %d, in phase %d, with modules %d", percentage, phase_nmbr, max_module)
 
         # set attributes of current message
-        self.status_msg["module"] = stream_item_list[0]
+        self.status_msg["module"] = module
 
         # ignore all Q-modules for percentage calc
-        if not re.match(".*Q[0-9][0-9]", stream_item_list[0]):
+        if not re.match(".*Q[0-9][0-9]", module):
             self.status_msg["percentage"] = percentage
         # ignore all D-modules for percentage calc
-        elif not re.match(".*D[0-9][0-9]", stream_item_list[0]):
+        elif not re.match(".*D[0-9][0-9]", module):
             self.status_msg["percentage"] = percentage
 
         # get copy of the current status message
         self.save_status()
 
     # update dictionary with phase changes
-    def update_phase(self, stream_item_list):
+    def update_phase(self, phase, finished=False, stamp=None):
         self.module_cnt = 0
-        self.status_msg["phase"] = stream_item_list[1]
-        if "Test ended" in stream_item_list[1]:
+        self.status_msg["phase"] = phase
+        phase_nmbr = self.phase_identify(self.status_msg)[1]
+        self.progress.phase_changed(phase_nmbr, stamp)
+        if finished:
             self.finish = True
             self.status_msg["percentage"] = 100
+            self.status_msg["eta"] = 0
 
         # get copy of the current status message
         self.save_status()
 
-    def read_loop(self):
+    def start(self):
         """
-        Infinite Loop for waiting for emba.log changes
+        Registers the reader with the shared log watcher and catches up with already written lines
             :param: None
-            :exit condition: Not in this Function, but if emba has terminated this process is also killed
             :return: None
-       """
+        """
+        if self.finish:
+            logger.info("Log of %s was already processed completely", self.firmware_id)
+            return
         logger.info("read loop started for %s", self.firmware_id)
+        # pick up module changes once per analysis, the status updates use the cached catalog
+        get_emba_module_catalog(check=True)
+        # a resumed reader continues with the status of its checkpoint
+        self.live.replace(self.analysis.status)
+        self.live_lengths = {name: len(self.analysis.status[name]) for name in LIVE_LISTS}
+        log_watcher.watch(self.log_path, self.on_log_event)
+        self.process_new_lines()
+
+    def on_log_event(self, event):
+        """
+        Callback for emba.log changes, called by the log watcher thread
+            :param event: EVENT_CREATED or EVENT_MODIFIED
+            :return: None
+        """
+        if event == EVENT_CREATED:
+            logger.debug("emba.log created for %s", self.firmware_id)
+        close_old_connections()
+        self.process_new_lines()
 
-        # if file does not exist create it otherwise delete its content
-        pat = f"{settings.EMBA_LOG_ROOT}/{self.firmware_id}/logreader.log"
-        if not pathlib.Path(pat).exists():
-            with open(pat, 'x', encoding='utf-8'):
-                pass
-
-        while not self.finish:
-            emba_log_path = f"{self.analysis.path_to_logs}/emba.log"
-            if not pathlib.Path(emba_log_path).exists():
-                time.sleep(5)
-                continue
-
-            # look for new events in log
-            logger.debug("looking for events in %s", emba_log_path)
-            got_event = self.inotify_events(emba_log_path)
-
-            for eve in got_event:
-                for flag in flags.from_mask(eve.mask):
-                    # Ignore irrelevant flags TODO: add other possible flags
-                    if flag is flags.CLOSE_NOWRITE or flag is flags.CLOSE_WRITE:
-                        pass
-                    # Act on file change
-                    elif flag is flags.MODIFY:
-                        # get the actual difference
-                        tmp = self.get_diff(emba_log_path)
-                        logger.debug("Got diff-output: %s", tmp)
-                        # send changes to frontend
-                        self.input_processing(tmp)
-                        # copy diff to tmp file
-                        self.copy_file_content(tmp)
-
-        self.cleanup()
-        logger.info("read loop done for %s", self.firmware_id)
-        # return
+    def process_new_lines(self):
+        """
+        Reads and processes everything appended to emba.log since the last call
+            :param: None
+            :exit condition: emba reported the end of the test or a failure
+            :return: None
+        """
+        with self.lock:
+            if self.finish:
+                return
+            # get the newly appended lines
+            restarts = self.tailer.restarts
+            new_entries = self.tailer.read_entries()
+            if self.tailer.restarts != restarts:
+                self.reset_status()
+            if new_entries:
+                logger.debug("Got %d new lines at offset %d", len(new_entries), self.tailer.offset)
+                # send changes to frontend
+                self.input_processing(new_entries)
+            if self.finish:
+                self.cleanup()
+                logger.info("read loop done for %s", self.firmware_id)
+
+    def reset_status(self):
+        """
+        Forgets the parsed status, emba.log got replaced by a different log that is parsed from its beginning
+            :param: None
+            :return: None
+        """
+        logger.warning("emba.log of %s got replaced, parsing it again", self.firmware_id)
+        with self.status_writer.lock:
+            self.module_cnt = 0
+            self.line_offset = 0
+            self.status_msg = {
+                "percentage": 0,
+                "module": "",
+                "phase": "",
+                "eta": None,
+            }
+            self.progress = ProgressEstimator.from_history()
+            self.timing_buffer = []
+            initial = jsonfield_default_value()
+            for field in ("percentage", "last_module", "module_list", "last_phase", "phase_list", "eta"):
+                self.analysis.status[field] = initial[field]
+            self.live.replace(self.analysis.status)
+            self.live_lengths = {name: len(self.analysis.status[name]) for name in LIVE_LISTS}
+        self.status_writer.update(force=True)
 
     def cleanup(self):
         """
         Called when logreader should be cleaned up
         """
-        # inotify = INotify()
-        # inotify.rm_watch(self.wd)
+        log_watcher.unwatch(self.log_path)
+        self.status_writer.close()
         logger.debug("Log reader cleaned up for %s", self.firmware_id)
-        # TODO do cleanup of emba_new_<self.firmware_id>.log
-
-    @classmethod
-    def process_line(cls, inp, pat):
 
+    def input_processing(self, new_entries):
         """
-        Regex function for lambda
-            :param inp: String to apply regex to
-            :param pat: Regex pattern
-            :return: True if regex matches otherwise False
+        Classifies the new lines in one pass and triggers the status updates in log order
+            :param new_entries: list of (end offset, line) appended to the emba log
+            :return: None
         """
-        if re.match(pat, inp):
-            return True
-        return False
-
-    def copy_file_content(self, diff):
+        for end_offset, log_line in new_entries:
+            event = classify_line(log_line)
+            # offset, counters and status change together, a write in between would checkpoint half a line
+            with self.status_writer.lock:
+                self.line_offset = end_offset
+                if event is None:
+                    continue
+                if event.kind == EVENT_MODULE_STARTED:
+                    self.progress.module_started(event.text, event.timestamp)
+                elif event.kind == EVENT_MODULE_FINISHED:
+                    self.record_module_timing(event.text, event.timestamp)
+                    self.update_status(event.text)
+                elif event.kind == EVENT_PHASE:
+                    self.update_phase(event.text, stamp=event.timestamp)
+                elif event.kind == EVENT_TEST_ENDED:
+                    self.update_phase(event.text, finished=True, stamp=event.timestamp)
+                    # only complete runs go into the history
+                    self.flush_timings()
+                    record_module_durations(self.firmware_id)
+                elif event.kind == EVENT_FAILED:
+                    logger.error("EMBA failed for %s: %s", self.firmware_id, event.text)
+                    self.update_phase(event.text, finished=True)
+
+    def record_module_timing(self, module, stamp):
         """
-        Helper function to copy new emba log messages to temporary file continuously
-            :param diff: new line in emba log
+        Buffers the runtime of a finished module
+            :param module: module name
+            :param stamp: naive datetime of the finished line
             :return: None
         """
-        with open(f"{settings.EMBA_LOG_ROOT}/{self.firmware_id}/logreader.log", 'a+', encoding='utf-8') as diff_file:
-            diff_file.write(diff)
-        logger.debug("wrote file-diff")
-
-    def get_diff(self, log_file):
+        started, duration = self.progress.module_finished(module, stamp)
+        if started is None:
+            return
+        # EMBA logs local time without a usable zone, the durations are what matters
+        self.timing_buffer.append(ModuleTiming(
+            analysis=self.analysis,
+            module=module,
+            phase=phase_name(self.progress.phase),
+            started=timezone.make_aware(started),
+            finished=timezone.make_aware(stamp),
+            duration=duration
+        ))
+
+    def flush_timings(self):
         """
-        Get diff between two files via difflib
-        copied from stack overflow : https://stackoverflow.com/questions/15864641/python-difflib-comparing-files
+        Bulk inserts the buffered module timings
             :param: None
-            :return: result of difflib call without preceding symbols
+            :return: None
         """
-        # open the two files to get diff from
-        logger.debug("getting diff from %s", log_file)
-        with open(log_file, mode='r', encoding='utf-8') as old_file, open(f"{settings.EMBA_LOG_ROOT}/{self.firmware_id}/logreader.log", encoding='utf-8') as new_file:
-            diff = difflib.ndiff(old_file.readlines(), new_file.readlines())
-            return ''.join(x[2:] for x in diff if x.startswith('- '))
-
-    def input_processing(self, tmp_inp):
+        if not self.timing_buffer:
+            return
+        # lines after the last checkpoint are parsed again after a restart, keep the stored ones
+        ModuleTiming.objects.bulk_create(self.timing_buffer, ignore_conflicts=True)
+        logger.debug("Stored %d module timings for %s", len(self.timing_buffer), self.firmware_id)
+        self.timing_buffer = []
+
+    def write_checkpoint(self):
         """
-        RxPy Function for processing the file diffs and trigger send packet to frontend
-            :param tmp_inp: file diff = new line in emba log
+        Atomically writes the parser state belonging to the current status
+            :param: None
             :return: None
         """
-        logger.debug("starting observers for log file %s", self.analysis.path_to_logs)
-
-        status_pattern = "\\[\\*\\]*"
-        phase_pattern = "\\[\\!\\]*"
-
-        color_pattern = "\\x1b\\[.{1,5}m"
-
-        cur_ar = tmp_inp.splitlines()
-
-        # create observable
-        source_stream = rx.from_iterable(cur_ar)
-
-        # observer for status messages
-        source_stream.pipe(
-            ops.map(lambda s: re.sub(color_pattern, '', s)),
-            ops.filter(lambda s: self.process_line(s, status_pattern)),
-            ops.map(lambda a: a.split("- ")),
-            ops.map(lambda t: t[1]),
-            ops.map(lambda b: b.split(" ")),
-            ops.filter(lambda c: c[1] == 'finished')
-        ).subscribe(
-            lambda x: [self.update_status(x)]    # , self.test_list1.append(x)]
-        )
-
-        # observer for phase messages
-        source_stream.pipe(
-            ops.map(lambda s: re.sub(color_pattern, '', s)),
-            ops.filter(lambda u: self.process_line(u, phase_pattern)),
-            ops.map(lambda v: v.split(" ", 1)),
-            ops.filter(lambda w: w[1])
-        ).subscribe(
-            lambda x: [self.update_phase(x)]     # , self.test_list2.append(x)
-        )
-
-    @classmethod
-    def inotify_events(cls, path):
-        inotify = INotify()
-        watch_flags = flags.CREATE | flags.DELETE | flags.MODIFY | flags.DELETE_SELF | flags.CLOSE_NOWRITE | flags.CLOSE_WRITE
+        checkpoint = {
+            "offset": self.line_offset,
+            "inode": self.tailer.inode,
+            # identifies the parsed part in a replaced emba.log, unknown while the tailer is ahead
+            "tail_digest": self.tailer.tail_digest if self.tailer.offset == self.line_offset else None,
+            "module_cnt": self.module_cnt,
+            "finish": self.finish,
+            "status_msg": self.status_msg,
+            "status": self.analysis.status,
+            "progress": self.progress.to_dict(),
+        }
         try:
-            # add watch on file
-            inotify.add_watch(path, watch_flags)
-            return inotify.read()
-        except builtins.Exception as error:
-            logger.error("inotify_event error in %s:%s", path, error)
-            return []
+            with open(f"{self.checkpoint_path}.tmp", 'w', encoding='utf-8') as checkpoint_file:
+                json.dump(checkpoint, checkpoint_file)
+            os.replace(f"{self.checkpoint_path}.tmp", self.checkpoint_path)
+        except OSError as error:
+            logger.error("Can't write checkpoint for %s: %s", self.firmware_id, error)
+
+    def load_checkpoint(self):
+        """
+        Restores the parser state of a previous reader (e.g. before a server restart)
+            :param: None
+            :return: True if a checkpoint got restored
+        """
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as error:
+            logger.error("Ignoring unreadable checkpoint for %s: %s", self.firmware_id, error)
+            return False
+        try:
+            inode = os.stat(self.log_path).st_ino
+        except FileNotFoundError:
+            inode = None
+        if inode != checkpoint["inode"] and not checkpoint.get("tail_digest"):
+            logger.warning("emba.log of %s got replaced, ignoring checkpoint", self.firmware_id)
+            return False
+        # a replaced emba.log is compared by the tailer, the status gets reset if it differs
+        self.line_offset = checkpoint["offset"]
+        self.tailer = LogTailer(self.log_path, offset=checkpoint["offset"], inode=checkpoint["inode"],
+                                tail_digest=checkpoint.get("tail_digest"))
+        self.module_cnt = checkpoint["module_cnt"]
+        self.finish = checkpoint["finish"]
+        self.status_msg = checkpoint["status_msg"]
+        self.analysis.status = checkpoint["status"]
+        if "progress" in checkpoint:
+            self.progress.load_dict(checkpoint["progress"])
+        logger.info("Resuming log reader for %s at offset %d", self.firmware_id, self.line_offset)
+        return True
 
 
 if __name__ == "__main__":
@@ -3,33 +3,62 @@ __author__ = 'Christian Bieg, Benedikt Kuehne'
 __license__ = 'MIT'
 
 import asyncio
+import bisect
 import os
 import base64
 import logging
 import json
-
+import mmap
+import re
+import struct
+import sys
+import threading
+import time
+
+from array import array
+from collections import OrderedDict
 from pathlib import Path
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
 from embark.helper import user_is_auth
+from embark.logwatcher import get_async_log_watcher
+from uploader.archiver import GZIP_CACHED_CHUNKS, SeekableGzipFile
 from uploader.models import FirmwareAnalysis
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 logger = logging.getLogger(__name__)
 
+# binary frame of the follow mode: first line number (counted from the beginning), number of lines; then the lines
+FOLLOW_HEADER = struct.Struct("!II")
+
 
-class LogConsumer(AsyncWebsocketConsumer):
+class LogConsumer(AsyncWebsocketConsumer):    # pylint: disable=too-many-instance-attributes
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         self.log_file_path = None
-        self.line_cache = None
+        self.shared_log = None
         self.file_view = None
-        self.observer = None
+        self.loop = None
+        # follow mode: appended lines are pushed as binary frames instead of the whole view
+        self.following = False
+        self.follow_line = 0
+        self.follow_tail = 0
+        self.follow_rebuilds = None
+        # changes are coalesced, at most one push per LOG_FOLLOW_INTERVAL
+        self.changed = False
+        self.update_task = None
+        # running LogSearch, at most one per connection
+        self.search = None
+        self.search_task = None
 
     def load_file_content(self):
         logger.info(
@@ -38,32 +67,137 @@ class LogConsumer(AsyncWebsocketConsumer):
             self.file_view,
         )
 
-        num_lines = self.line_cache.num_lines()
-        limit = min(num_lines, self.file_view.limit)
+        # the index might still get built in a worker thread
+        with self.shared_log.lock:
+            line_cache = self.shared_log.line_cache
+            num_lines = line_cache.num_lines()
+            limit = min(num_lines, self.file_view.limit)
 
-        # Ensure you can't read negative lines
-        offset = max(self.file_view.offset, 0)
-        # Ensure you can't read lines bigger than the last line
-        offset = min(num_lines - limit, offset)
+            # Ensure you can't read negative lines
+            offset = max(self.file_view.offset, 0)
+            # Ensure you can't read lines bigger than the last line
+            offset = min(num_lines - limit, offset)
 
-        # Fix the offset, in case the user tried to read invalid lines
-        self.file_view.offset = offset
+            # Fix the offset, in case the user tried to read invalid lines
+            self.file_view.offset = offset
 
-        content = self.line_cache.read_lines(offset, offset + limit - 1)
+            content = line_cache.read_lines(offset, offset + limit - 1)
         self.file_view.content = base64.b64encode(content).decode("ascii")
         self.file_view.num_lines = num_lines
 
     async def connect(self):
         pass
 
+    async def follow_log(self, use_mmap: bool = True) -> None:
+        """
+        Subscribes to the shared line cache of log_file_path and sends the first view
+        """
+        if not os.path.isfile(self.log_file_path):
+            await self.send_message({"error": "The log file does not exist, yet."})
+            await self.close()
+            return
+
+        self.loop = asyncio.get_running_loop()
+        self.file_view = FileView()
+        # started inside the loop, changes are reported to the loop directly
+        watcher = get_async_log_watcher(settings.LOG_FOLLOW_INTERVAL)
+        try:
+            # building the index of a big file must not block the event loop
+            self.shared_log = await sync_to_async(log_registry.subscribe, thread_sensitive=False)(self.log_file_path, self, watcher, use_mmap)
+        except OSError as error:
+            logger.error("Can't follow %s: %s", self.log_file_path, error)
+            await self.send_message({"error": "The log file can't be read."})
+            await self.close()
+            return
+        await self.send_file_content()
+
+    def on_log_change(self) -> None:
+        """
+        Called by the shared log after the cache got refreshed, inside the loop of its watcher
+        """
+        if asyncio.get_running_loop() is self.loop:
+            self.schedule_update()
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.schedule_update)
+        except RuntimeError:
+            # the loop of a closed connection
+            pass
+
+    def schedule_update(self) -> None:
+        self.changed = True
+        if self.update_task is None or self.update_task.done():
+            self.update_task = asyncio.ensure_future(self.send_updates())
+
+    async def send_updates(self) -> None:
+        """
+        Sends the changes, the watcher already debounced them to one call per LOG_FOLLOW_INTERVAL
+        """
+        while self.changed and self.shared_log is not None:
+            self.changed = False
+            if self.following:
+                await self.send_appended_lines()
+            else:
+                await self.send_file_content()
+            if self.changed:
+                # the rest of a capped frame, don't exceed LOG_FOLLOW_MAX_FRAME per interval
+                await asyncio.sleep(settings.LOG_FOLLOW_INTERVAL)
+
+    def start_follow(self, lines: int) -> None:
+        """
+        :param lines: number of lines before the end sent with the first frame
+        """
+        self.following = True
+        self.follow_tail = max(lines, 0)
+        # the first frame always (re)starts the client
+        self.follow_rebuilds = None
+
+    def read_appended_lines(self):
+        """
+        :return: (first line, number of lines, content) of the complete lines since the last frame or None
+        """
+        with self.shared_log.lock:
+            line_cache = self.shared_log.line_cache
+            if line_cache is None:
+                return None
+            # the last entry is the beginning of the incomplete line, it's sent once it's finished
+            complete = line_cache.num_lines() - 1
+            restart = line_cache.rebuilds != self.follow_rebuilds or self.follow_line > complete
+            if restart:
+                # new follower or rewritten log, the client drops its lines when a frame doesn't continue them
+                self.follow_rebuilds = line_cache.rebuilds
+                self.follow_line = max(complete - self.follow_tail, 0)
+            first_line = self.follow_line
+            if first_line == complete and not restart:
+                return None
+
+            offsets = line_cache.offsets
+            # at most LOG_FOLLOW_MAX_FRAME bytes (but at least one line) per frame
+            stop = bisect.bisect_right(offsets, offsets[first_line] + settings.LOG_FOLLOW_MAX_FRAME, first_line + 1, complete + 1) - 1
+            stop = min(max(stop, first_line + 1), complete)
+            content = line_cache.read_bytes(offsets[first_line], offsets[stop])
+        if stop < complete:
+            # the rest goes with the next frame
+            self.changed = True
+        self.follow_line = stop
+        return first_line, stop - first_line, content
+
+    async def send_appended_lines(self) -> None:
+        if self.shared_log is None:
+            return
+        appended = self.read_appended_lines()
+        if appended is None:
+            return
+        first_line, line_count, content = appended
+        await self.send(bytes_data=FOLLOW_HEADER.pack(first_line, line_count) + content)
+
     async def send_file_content(self) -> None:
+        if self.shared_log is None:
+            # already disconnected
+            return
         self.load_file_content()
         await self.send_message({"file_view": self.file_view.__dict__})
 
-    async def update_lines(self) -> None:
-        self.line_cache.refresh()
-        await self.send_file_content()
-
     async def receive(self, text_data: str = "", bytes_data=None) -> None:
         logger.info("WS - receive")
         try:
@@ -72,20 +206,73 @@ class LogConsumer(AsyncWebsocketConsumer):
                 logger.info("WS - action: change view")
                 logger.info(data["file_view"])
                 self.file_view = FileView(**data["file_view"])
+                self.following = False
                 await self.send_file_content()
+            elif data["action"] == "follow":
+                logger.info("WS - action: follow")
+                self.start_follow(int(data.get("lines", FileView().limit)))
+                await self.send_appended_lines()
+            elif data["action"] == "search":
+                logger.info("WS - action: search")
+                await self.start_search(data)
+            elif data["action"] == "cancel_search":
+                logger.info("WS - action: cancel search")
+                self.cancel_search()
             else:
                 raise NotImplementedError("Unknown action")
         except Exception as exception:
             logger.error(exception)
             await self.send_message({"error": "Unknown error"})
 
+    async def start_search(self, request: dict) -> None:
+        """
+        Cancels the running search and starts a new one, the matches are streamed as search messages
+
+        :param request: {"id", "pattern", "regex", "ignore_case"}, the id is sent back with every result
+        """
+        self.cancel_search()
+        if self.shared_log is None:
+            return
+        try:
+            with self.shared_log.lock:
+                search = LogSearch(self.shared_log.line_cache, request.get("pattern", ""),
+                                   regex=bool(request.get("regex")), ignore_case=bool(request.get("ignore_case")))
+        except (re.error, ValueError) as error:
+            await self.send_message({"search": {"id": request.get("id"), "error": str(error), "done": True}})
+            return
+        self.search = search
+        self.search_task = asyncio.ensure_future(self.run_search(search, request.get("id")))
+
+    async def run_search(self, search, search_id) -> None:
+        results = asyncio.Queue()
+        loop = self.loop
+
+        def report(result):
+            loop.call_soon_threadsafe(results.put_nowait, result)
+
+        worker = asyncio.ensure_future(sync_to_async(search.run, thread_sensitive=False)(report))
+        done = False
+        while not done:
+            result = await results.get()
+            done = result["done"]
+            result["id"] = search_id
+            if self.shared_log is not None:
+                await self.send_message({"search": result})
+        await worker
+
+    def cancel_search(self) -> None:
+        if self.search is not None:
+            self.search.cancel()
+            self.search = None
+
     async def disconnect(self, code):
         logger.info("WS - disconnected: %s", code)
-        if self.line_cache:
-            self.line_cache.close()
-
-        if self.observer:
-            self.observer.stop()
+        self.cancel_search()
+        if self.update_task is not None:
+            self.update_task.cancel()
+        if self.shared_log:
+            self.shared_log = None
+            log_registry.unsubscribe(self.log_file_path, self)
 
     # send data to frontend
     async def send_message(self, message: dict) -> None:
@@ -103,55 +290,198 @@ class FileView:
         self.num_lines = num_lines
 
 
-REFRESH_LINES = 10  # This will define how many of the last lines will be refreshed
+READ_CHUNK_SIZE = 1 << 20  # bytes read per step while scanning for new lines
+SCAN_CHUNK_SIZE = 1 << 24  # bytes compared per numpy step (bounds the temporary arrays)
+NUMPY_MIN_BYTES = 1 << 16  # below this bytes.find is faster than setting up numpy
+REMAP_MIN_BYTES = 1 << 24  # smaller appends are read behind the mapping instead of remapping the file
+
+# sidecar index of finished logs (<log>.idx): magic, size and mtime (ns) of the log, number of offsets; then the offsets
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"EMBAIDX1"
+INDEX_HEADER = struct.Struct("<8sQQQ")
 
 
 class LineCache:
-    def __init__(self, filepath: str) -> None:
-        self.line_beginnings = [0]
-        self.line_endings = [0]
+    """
+    class LineCache
+    Index of the line beginnings of a growing log file, one 8 byte offset per line.
+    Line endings aren't stored, a line ends where the next one begins (minus the line break)
+    or at the scanned end of the file. Lines are counted from the end of the file (0 is the last line).
+    With numpy installed the file is memory mapped by default: new lines are found with numpy (bytes.find
+    for small appends) on the mapping and read_lines slices the mapping. Small appends are read behind the
+    mapping until they are worth a new mapping. Without numpy plain reads are faster than scanning a mapping. Files that get truncated fall back to plain reads,
+    a mapping faults on access behind the end of a truncated file.
+    Finished logs get a sidecar index (write_index), later opens map it instead of scanning the log
+    as long as size and mtime of the log match. The mapped offsets are copied once the log changes again.
+    """
+
+    def __init__(self, filepath: str, use_mmap: bool = True, use_index: bool = True) -> None:
+        # beginning of every line, the last entry is the (possibly incomplete) line after the last line break
+        self.offsets = array("Q", [0])
+        # scanned size of the file
+        self.end = 0
+        # number of rebuilds after the file shrank, line numbers of earlier reads are void
+        self.rebuilds = 0
+        self.use_mmap = use_mmap and numpy is not None
+        self.mapping = None
+        # mapping of the sidecar index, offsets is a view of it while it's set
+        self.index_mapping = None
         # Intentionally not using with to save resources
         # because we don't have to open the file as often
         # pylint: disable-next=consider-using-with
         self.filehandle = open(filepath, "rb")
+        if not (use_index and self.load_index()):
+            self.refresh()
+
+    @property
+    def index_path(self) -> str:
+        return f"{self.filehandle.name}{INDEX_SUFFIX}"
+
+    def load_index(self) -> bool:
+        """
+        Maps the sidecar index instead of scanning the log, in constant time
+
+        :return: True if the index exists and matches size and mtime of the log
+        """
+        if sys.byteorder != "little":
+            return False
+        stat = os.fstat(self.filehandle.fileno())
+        try:
+            with open(self.index_path, "rb") as index_file:
+                mapping = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # missing or empty
+            return False
+        if len(mapping) >= INDEX_HEADER.size:
+            magic, size, mtime_ns, count = INDEX_HEADER.unpack_from(mapping)
+            valid = magic == INDEX_MAGIC and size == stat.st_size and mtime_ns == stat.st_mtime_ns
+            if valid and count > 0 and len(mapping) == INDEX_HEADER.size + count * 8:
+                self.index_mapping = mapping
+                self.offsets = memoryview(mapping)[INDEX_HEADER.size:].cast("Q")
+                self.end = size
+                if self.use_mmap and size > 0:
+                    self.mapping = mmap.mmap(self.filehandle.fileno(), size, access=mmap.ACCESS_READ)
+                logger.debug("Loaded line index %s, %d lines", self.index_path, count)
+                return True
+        logger.debug("Ignoring stale line index %s", self.index_path)
+        mapping.close()
+        return False
+
+    def write_index(self) -> bool:
+        """
+        Writes the offsets next to the log, only useful once the log doesn't change anymore
+
+        :return: False if the log changed while indexing
+        """
+        if sys.byteorder != "little":
+            return False
+        stat = os.fstat(self.filehandle.fileno())
         self.refresh()
+        if self.end != stat.st_size:
+            logger.warning("%s is still written, no line index", self.filehandle.name)
+            return False
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "wb") as index_file:
+            index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, self.end, stat.st_mtime_ns, len(self.offsets)))
+            index_file.write(self.offsets)
+        os.replace(temp_path, self.index_path)
+        logger.info("Wrote line index %s, %d lines", self.index_path, len(self.offsets))
+        return True
+
+    def drop_index(self) -> None:
+        """
+        Copies the mapped offsets, the log changed after the index got written
+        """
+        self.offsets = array("Q", self.offsets)
+        # closed together with the last view of it (a running search might still use it)
+        self.index_mapping = None
 
     def refresh(self) -> None:
-        # Make sure to not go out of bounds
-        refresh_from_line = min(len(self.line_beginnings), REFRESH_LINES)
-        refresh_from_byte = self.line_beginnings[-refresh_from_line]
-
-        # Remove the line beginnings and endings to be refreshed
-        self.line_beginnings = self.line_beginnings[:-refresh_from_line]
-        self.line_endings = self.line_endings[:-refresh_from_line]
-
-        logger.debug(
-            "Start refreshing line cache from line %s (start counting from end of the file)", refresh_from_line
-        )
-        logger.debug("Start refreshing line cache from byte %s", refresh_from_byte)
-
-        self.filehandle.seek(refresh_from_byte)
+        """
+        Appends the lines written since the last refresh, only the last line gets scanned again
+        """
+        size = os.fstat(self.filehandle.fileno()).st_size
+        if self.index_mapping is not None:
+            if size == self.end:
+                return
+            self.drop_index()
+        if size < self.end:
+            # truncated or rotated, start over in place
+            logger.debug("Log file shrank from %d to %d bytes, rebuilding line cache", self.end, size)
+            self.stop_mapping()
+            del self.offsets[1:]
+            self.end = 0
+            self.rebuilds += 1
+        if size == self.end:
+            return
 
+        # everything before the beginning of the last line is final
+        position = self.offsets[-1]
+        if self.use_mmap and (self.mapping is None or size - len(self.mapping) >= REMAP_MIN_BYTES):
+            self.scan_mapping(size)
+        else:
+            self.scan_file()
+        logger.debug("Line cache refreshed from byte %d, %d lines", position, len(self.offsets))
+
+    def scan_file(self) -> None:
+        """
+        Reads the file from the scanned end to EOF and appends the line beginnings
+        """
+        scan_from = self.end
+        self.filehandle.seek(scan_from)
         while True:
-            line_beginning = self.filehandle.tell()
-            line = self.filehandle.readline()
-
-            line_ending = self.filehandle.tell()
-
-            if len(line) > 0 and line[-1:] == b'\n':
-                line_ending = line_ending - 1
-
-            if len(line) > 1 and line[-2:] == b'\r\n':
-                line_ending = line_ending - 1
-
-            self.line_beginnings.append(line_beginning)
-            self.line_endings.append(line_ending)
-
-            if len(line) == 0 or line[-1:] != b'\n':
+            chunk = self.filehandle.read(READ_CHUNK_SIZE)
+            if not chunk:
                 break
+            index = chunk.find(b"\n")
+            while index != -1:
+                self.offsets.append(scan_from + index + 1)
+                index = chunk.find(b"\n", index + 1)
+            scan_from += len(chunk)
+        self.end = scan_from
+
+    def scan_mapping(self, size: int) -> None:
+        """
+        (Re)maps the file up to size and appends the line beginnings between the scanned end and size
+        """
+        mapping = mmap.mmap(self.filehandle.fileno(), size, access=mmap.ACCESS_READ)
+        if self.mapping is not None:
+            self.mapping.close()
+        self.mapping = mapping
+        if numpy is not None and size - self.end >= NUMPY_MIN_BYTES:
+            buffer = numpy.frombuffer(self.mapping, dtype=numpy.uint8, count=size)
+            for chunk_start in range(self.end, size, SCAN_CHUNK_SIZE):
+                newlines = numpy.flatnonzero(buffer[chunk_start:min(chunk_start + SCAN_CHUNK_SIZE, size)] == 0x0a)
+                newlines += chunk_start + 1
+                self.offsets.frombytes(newlines.astype(numpy.uint64).tobytes())
+            # the mapping can't be closed while numpy holds a view of it
+            del buffer
+        else:
+            index = self.mapping.find(b"\n", self.end, size)
+            while index != -1:
+                self.offsets.append(index + 1)
+                index = self.mapping.find(b"\n", index + 1, size)
+        self.end = size
+
+    def stop_mapping(self) -> None:
+        """
+        Drops the mapping and continues with plain reads
+        """
+        if self.mapping is not None:
+            self.mapping.close()
+            self.mapping = None
+        self.use_mmap = False
 
     def num_lines(self) -> int:
-        return len(self.line_beginnings)
+        return len(self.offsets)
+
+    def line_range(self, line: int) -> tuple:
+        """
+        :param line: line number counted from the beginning of the file
+        :return: (first byte, byte after the line including the line break)
+        """
+        stop = self.offsets[line + 1] if line + 1 < len(self.offsets) else self.end
+        return self.offsets[line], stop
 
     def read_lines(self, first_line: int, last_line: int) -> bytes:
         num_lines = self.num_lines()
@@ -165,17 +495,382 @@ class LineCache:
         if last_line >= num_lines:
             raise IndexError("The first line cannot be equal or above the number of lines")
 
-        first_byte = self.line_beginnings[num_lines - last_line - 1]
-        last_byte = self.line_endings[num_lines - first_line - 1]
-        self.filehandle.seek(first_byte)
-        output = self.filehandle.read(last_byte - first_byte)
+        first_byte = self.offsets[num_lines - last_line - 1]
+        last_byte = self.line_range(num_lines - first_line - 1)[1]
+        output = self.read_bytes(first_byte, last_byte)
 
+        # the line break of the last requested line isn't part of the output
+        if first_line > 0:
+            output = output[:-2] if output.endswith(b"\r\n") else output[:-1]
         return output
 
+    def read_bytes(self, first_byte: int, last_byte: int) -> bytes:
+        """
+        Reads from the mapping if it covers the range, from the file otherwise
+        """
+        if self.mapping is not None and os.fstat(self.filehandle.fileno()).st_size < self.end:
+            # truncated since the last refresh, don't touch the mapping behind the new end
+            self.stop_mapping()
+        if self.mapping is not None and last_byte <= len(self.mapping):
+            return self.mapping[first_byte:last_byte]
+        self.filehandle.seek(first_byte)
+        return self.filehandle.read(last_byte - first_byte)
+
+    def open_reader(self):
+        """
+        :return: new file object of the log for reads in another thread
+        """
+        return open(self.filehandle.name, "rb")
+
+    def memory_usage(self) -> int:
+        """
+        :return: bytes used by the offset index
+        """
+        return len(self.offsets) * self.offsets.itemsize
+
     def close(self) -> None:
+        if self.mapping is not None:
+            self.mapping.close()
+            self.mapping = None
+        self.index_mapping = None
         self.filehandle.close()
 
 
+class GzipLineOffsets:
+    """
+    class GzipLineOffsets
+    Read only sequence of the line beginnings of a SeekableGzipFile (what LineCache.offsets is for a plain log).
+    An offset is looked up in the line table of its member, built from the decompressed member when needed.
+    """
+
+    def __init__(self, gzip_file: SeekableGzipFile) -> None:
+        self.gzip_file = gzip_file
+        self.itemsize = 8
+        # member -> line beginnings relative to the member
+        self.tables = OrderedDict()
+
+    def __len__(self) -> int:
+        return self.gzip_file.lines + 1
+
+    def __getitem__(self, line: int) -> int:
+        if line < 0:
+            line += len(self)
+        if not 0 <= line < len(self):
+            raise IndexError("line out of range")
+        if not self.gzip_file.first_lines:
+            return 0
+        number = bisect.bisect_right(self.gzip_file.first_lines, line) - 1
+        return self.gzip_file.chunk_start(number) + self.line_table(number)[line - self.gzip_file.first_lines[number]]
+
+    def line_table(self, number: int) -> array:
+        table = self.tables.get(number)
+        if table is not None:
+            self.tables.move_to_end(number)
+            return table
+        content = self.gzip_file.chunk(number)
+        table = array("Q", [0])
+        index = content.find(b"\n")
+        while index != -1:
+            table.append(index + 1)
+            index = content.find(b"\n", index + 1)
+        self.tables[number] = table
+        if len(self.tables) > GZIP_CACHED_CHUNKS:
+            self.tables.popitem(last=False)
+        return table
+
+    def memory_usage(self) -> int:
+        return sum(len(table) * table.itemsize for table in self.tables.values())
+
+
+class GzipLineCache(LineCache):
+    """
+    class GzipLineCache
+    LineCache of a gzip archived log, e.g. emba_run.log.gz of an archived analysis.
+    With the members and index of Archiver.gzip_seekable a view decompresses one or two members
+    instead of the whole log. Archives don't change, refresh does nothing.
+    """
+
+    def __init__(self, filepath: str) -> None:    # pylint: disable=super-init-not-called
+        self.filehandle = SeekableGzipFile(filepath)
+        self.offsets = GzipLineOffsets(self.filehandle)
+        self.end = self.filehandle.size
+        self.rebuilds = 0
+        self.use_mmap = False
+        self.mapping = None
+        self.index_mapping = None
+
+    def refresh(self) -> None:
+        pass
+
+    def read_bytes(self, first_byte: int, last_byte: int) -> bytes:
+        self.filehandle.seek(first_byte)
+        return self.filehandle.read(last_byte - first_byte)
+
+    def open_reader(self):
+        return SeekableGzipFile(self.filehandle.name)
+
+    def memory_usage(self) -> int:
+        return self.offsets.memory_usage()
+
+    def close(self) -> None:
+        self.filehandle.close()
+
+
+def open_line_cache(path: str, use_mmap: bool = True) -> LineCache:
+    """
+    :return: GzipLineCache for .gz archives, LineCache otherwise
+    """
+    if path.endswith(".gz"):
+        return GzipLineCache(path)
+    return LineCache(path, use_mmap=use_mmap)
+
+
+def write_line_index(log_path: str) -> bool:
+    """
+    Writes the sidecar index of a finished log, called when an analysis gets finalized
+
+    :param log_path: e.g. emba_run.log of the analysis
+    :return: True if the log has a valid index afterwards
+    """
+    if not os.path.isfile(log_path):
+        return False
+    line_cache = LineCache(log_path, use_mmap=True)
+    try:
+        return line_cache.index_mapping is not None or line_cache.write_index()
+    except OSError as error:
+        logger.error("Can't write the line index of %s: %s", log_path, error)
+        return False
+    finally:
+        line_cache.close()
+
+
+SEARCH_CHUNK_SIZE = 1 << 20      # bytes matched per step, also bounds how long the GIL is held in one go
+SEARCH_MAX_MATCHES = 10000       # matching lines reported per search
+SEARCH_REPORT_INTERVAL = 0.2     # seconds between two result batches
+
+
+class LogSearch:
+    """
+    class LogSearch
+    Line oriented regex or literal search over the indexed part of a log, meant to run in a worker thread.
+    Reads the file with its own handle (open_reader of the cache) in chunks of whole lines, counts the line breaks
+    up to every match for its line number (counted from the beginning) and reports them in batches.
+    Every line is reported once, matches spanning several lines aren't found.
+    """
+
+    def __init__(self, line_cache: LineCache, pattern: str, regex: bool = False, ignore_case: bool = False) -> None:
+        """
+        Takes a snapshot of the index, has to be called with the lock of the cache held
+
+        :param line_cache: index of the log
+        :param pattern: regex (bytes semantics, multiline) or literal
+        :raises re.error: invalid regex
+        :raises ValueError: empty pattern
+        """
+        if not pattern:
+            raise ValueError("Empty search pattern")
+        needle = pattern.encode("utf-8")
+        self.literal = None
+        # ascii literals are matched with bytes.find, case folded with bytes.lower (much faster than re.IGNORECASE)
+        self.fold = ignore_case and not regex and needle.isascii()
+        if not regex and (not ignore_case or self.fold):
+            self.literal = needle.lower() if self.fold else needle
+        if not regex:
+            needle = re.escape(needle)
+        self.regex = re.compile(needle, re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+        self.line_cache = line_cache
+        self.end = line_cache.end
+        self.num_lines = line_cache.num_lines()
+        self.rebuilds = line_cache.rebuilds
+        self.cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def find(self, chunk: bytes):
+        """
+        :param chunk: whole lines
+        :return: iterator of the position of the first match in every matching line
+        """
+        position = 0
+        if self.fold:
+            chunk = chunk.lower()
+        while True:
+            if self.literal is not None:
+                position = chunk.find(self.literal, position)
+                if position == -1:
+                    return
+            else:
+                match = self.regex.search(chunk, position)
+                if match is None:
+                    return
+                position = match.start()
+            yield position
+            # continue with the next line
+            position = chunk.find(b"\n", position) + 1
+            if position == 0:
+                return
+
+    def run(self, report) -> None:
+        """
+        :param report: called with the result dicts, the last one has done set
+        """
+        lines = []
+        found = 0
+        last_line = -1
+        position = 0
+        # line breaks before position
+        line_base = 0
+        error = None
+        last_report = time.monotonic()
+        try:
+            with self.line_cache.open_reader() as log_file:
+                while position < self.end and found < SEARCH_MAX_MATCHES and not self.cancelled.is_set():
+                    if self.line_cache.rebuilds != self.rebuilds:
+                        error = "The log file got rewritten"
+                        break
+                    log_file.seek(position)
+                    chunk = log_file.read(min(SEARCH_CHUNK_SIZE, self.end - position))
+                    if not chunk:
+                        break
+                    if position + len(chunk) < self.end:
+                        # end on a line break, unless a single line is longer than the chunk
+                        cut = chunk.rfind(b"\n")
+                        if cut != -1:
+                            chunk = chunk[:cut + 1]
+                    counted = 0
+                    line = line_base
+                    for match_position in self.find(chunk):
+                        line += chunk.count(b"\n", counted, match_position)
+                        counted = match_position
+                        if line == last_line:
+                            continue
+                        last_line = line
+                        lines.append(line)
+                        found += 1
+                        if found >= SEARCH_MAX_MATCHES:
+                            break
+                    position += len(chunk)
+                    line_base += chunk.count(b"\n")
+                    if time.monotonic() - last_report >= SEARCH_REPORT_INTERVAL:
+                        report(self.result(lines, position))
+                        lines = []
+                        last_report = time.monotonic()
+        except OSError as os_error:
+            error = str(os_error)
+        finally:
+            result = self.result(lines, position, done=True)
+            result.update({"truncated": found >= SEARCH_MAX_MATCHES, "cancelled": self.cancelled.is_set(), "error": error})
+            report(result)
+
+    def result(self, lines: list, position: int, done: bool = False) -> dict:
+        return {"lines": lines, "scanned": position, "size": self.end, "num_lines": self.num_lines, "done": done}
+
+
+class SharedLog:
+    """
+    class SharedLog
+    One LineCache and one AsyncLogWatcher registration for all consumers following the same file.
+    The cache is refreshed once per (debounced) change inside the event loop,
+    the subscribed consumers only read their view of it.
+    """
+
+    def __init__(self, path: str, watcher, use_mmap: bool) -> None:
+        self.path = path
+        self.watcher = watcher
+        self.use_mmap = use_mmap
+        # guards the cache, built in a worker thread and refreshed and read in the event loop
+        self.lock = threading.Lock()
+        self.line_cache = None
+        # consumers, changed under the registry lock
+        self.subscribers = set()
+
+    def open(self) -> None:
+        """
+        Builds the index and starts watching, done by the first subscriber
+        """
+        with self.lock:
+            if self.line_cache is None:
+                self.line_cache = open_line_cache(self.path, use_mmap=self.use_mmap)
+                if not isinstance(self.line_cache, GzipLineCache):
+                    self.watcher.watch(self.path, self.on_log_event)
+
+    def close(self) -> None:
+        with self.lock:
+            if self.line_cache is not None:
+                self.line_cache.close()
+                self.line_cache = None
+
+    def on_log_event(self, _event) -> None:
+        """
+        AsyncLogWatcher callback, refreshes the cache and notifies all subscribers
+        """
+        with self.lock:
+            if self.line_cache is None:
+                return
+            self.line_cache.refresh()
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber.on_log_change()
+
+
+class LogRegistry:
+    """
+    class LogRegistry
+    Process wide, refcounted SharedLog per log path: n viewers of a file share one index and one watch.
+    The SharedLog is torn down when its last consumer leaves.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._logs = {}
+
+    def subscribe(self, path: str, consumer, watcher, use_mmap: bool = True) -> SharedLog:
+        """
+        :param path: log file
+        :param consumer: gets on_log_change() calls from the loop of the watcher
+        :param watcher: AsyncLogWatcher used if the consumer is the first subscriber
+        :param use_mmap: passed to the LineCache of the first subscriber
+        :return: SharedLog with a built index
+        """
+        with self._lock:
+            shared_log = self._logs.get(path)
+            if shared_log is None:
+                shared_log = self._logs[path] = SharedLog(path, watcher, use_mmap)
+            shared_log.subscribers.add(consumer)
+        try:
+            # outside the registry lock, indexing a big file must not stall other logs
+            shared_log.open()
+        except OSError:
+            self.unsubscribe(path, consumer)
+            raise
+        return shared_log
+
+    def unsubscribe(self, path: str, consumer) -> None:
+        with self._lock:
+            shared_log = self._logs.get(path)
+            if shared_log is None:
+                return
+            shared_log.subscribers.discard(consumer)
+            if shared_log.subscribers:
+                return
+            # unwatch before a new SharedLog for the path can watch it again
+            del self._logs[path]
+            shared_log.watcher.unwatch(path)
+        shared_log.close()
+        logger.debug("Last viewer of %s left", path)
+
+    def stats(self) -> dict:
+        """
+        :return: {path: number of subscribers}
+        """
+        with self._lock:
+            return {path: len(shared_log.subscribers) for path, shared_log in self._logs.items()}
+
+
+log_registry = LogRegistry()
+
+
 class AnalysisLogConsumer(LogConsumer):
 
     def __init__(self, *args, **kwargs):
@@ -209,28 +904,13 @@ class AnalysisLogConsumer(LogConsumer):
             return
 
         self.log_file_path = f"{Path(firmware.path_to_logs).parent}/emba_run.log"
+        if not os.path.isfile(self.log_file_path) and os.path.isfile(f"{self.log_file_path}.gz"):
+            # archived analysis
+            self.log_file_path = f"{self.log_file_path}.gz"
 
-        if not os.path.isfile(self.log_file_path):
-            await self.send_message({"error": "The log file does not exist, yet."})
-            await self.close()
-
-        self.line_cache = LineCache(self.log_file_path)
-
-        self.file_view = FileView()
-
-        this = self
-
-        class ModifyEventHandler(FileSystemEventHandler):
-            def on_modified(self, _event):
-                asyncio.run(this.update_lines())
-
-        event_handler = ModifyEventHandler()
-
-        self.observer = Observer()
-        self.observer.schedule(event_handler, self.log_file_path)
-        self.observer.start()
-
-        await self.update_lines()
+        # logs of running worker analyses are downloaded again every cycle, sftp truncates the file
+        # before it's rewritten and a mapping of it faults (SIGBUS), only map logs that don't change
+        await self.follow_log(use_mmap=firmware.finished or not firmware.running_on_worker)
 
 
 class UpdateLogConsumer(LogConsumer):
@@ -244,24 +924,5 @@ class UpdateLogConsumer(LogConsumer):
         await self.accept()
         logger.info("WS - connect - accept")
 
-        if not os.path.isfile(self.log_file_path):
-            await self.send_message({"error": "The log file does not exist, yet."})
-            await self.close()
-
-        self.line_cache = LineCache(self.log_file_path)
-
-        self.file_view = FileView()
-
-        this = self
-
-        class ModifyEventHandler(FileSystemEventHandler):
-            def on_modified(self, _event):
-                asyncio.run(this.update_lines())
-
-        event_handler = ModifyEventHandler()
-
-        self.observer = Observer()
-        self.observer.schedule(event_handler, self.log_file_path)
-        self.observer.start()
-
-        await self.update_lines()
+        # emba_update.log is rewritten with every update, no mapping for it
+        await self.follow_log(use_mmap=False)
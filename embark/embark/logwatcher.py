@@ -0,0 +1,364 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import asyncio
+import logging
+import os
+import selectors
+import threading
+import weakref
+
+from inotify_simple import INotify, flags
+
+logger = logging.getLogger(__name__)
+
+# events handed to the callbacks
+EVENT_CREATED = "created"
+EVENT_MODIFIED = "modified"
+
+# flags for directories containing watched files
+DIR_WATCH_FLAGS = flags.CREATE | flags.MODIFY | flags.MOVED_TO | flags.CLOSE_WRITE | flags.DELETE_SELF | flags.MOVE_SELF | flags.ONLYDIR | flags.MASK_ADD
+# flags for ancestors of directories that do not exist (yet)
+PARENT_WATCH_FLAGS = flags.CREATE | flags.MOVED_TO | flags.ONLYDIR | flags.MASK_ADD
+
+
+class LogWatcher:
+    """
+    class LogWatcher
+    Process wide inotify multiplexer for log files (e.g. emba.log of every running analysis)
+    Uses a single inotify fd and a single thread (started on first use) to watch the directories of all registered files.
+    Callbacks are executed inside the watcher thread, one call per file and batch of events.
+    Files (and their directories) don't need to exist on registration, their creation is reported as EVENT_CREATED.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._inotify = None
+        self._thread = None
+        self._wake_r = self._wake_w = None
+        self._closing = False
+        # directory -> {file name: callback}
+        self._callbacks = {}
+        # watch_desc -> directory with registered files
+        self._dir_watches = {}
+        # watch_desc -> set of missing directories waiting for their creation below the watched ancestor
+        self._parent_watches = {}
+        # watch_desc -> path of the watched ancestor
+        self._parent_paths = {}
+
+    def watch(self, path, callback):
+        """
+        Registers callback for changes of path
+
+        :param path: path of the file to watch
+        :param callback: callable taking one of EVENT_CREATED, EVENT_MODIFIED
+        """
+        directory, name = os.path.split(os.path.abspath(path))
+        with self._lock:
+            self._start()
+            already_watched = directory in self._callbacks
+            self._callbacks.setdefault(directory, {})[name] = callback
+            if not already_watched:
+                self._add_dir_watch(directory)
+        logger.debug("Watching %s", path)
+
+    def unwatch(self, path):
+        """
+        Removes the callback of path, the directory watch is dropped together with the last file in it
+
+        :param path: path of the file to stop watching
+        """
+        directory, name = os.path.split(os.path.abspath(path))
+        with self._lock:
+            files = self._callbacks.get(directory, {})
+            files.pop(name, None)
+            if files:
+                return
+            self._callbacks.pop(directory, None)
+            for watch_desc, watched in list(self._dir_watches.items()):
+                if watched == directory:
+                    del self._dir_watches[watch_desc]
+                    self._rm_watch(watch_desc)
+            for watch_desc, waiting in list(self._parent_watches.items()):
+                waiting.discard(directory)
+                if not waiting:
+                    self._drop_parent_watch(watch_desc)
+        logger.debug("Stopped watching %s", path)
+
+    def close(self):
+        """
+        Stops the watcher thread and drops all watches
+        """
+        with self._lock:
+            if self._thread is None:
+                return
+            self._closing = True
+            os.write(self._wake_w, b'\0')
+            thread = self._thread
+        thread.join()
+        with self._lock:
+            self._inotify.close()
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._inotify = self._thread = self._wake_r = self._wake_w = None
+            self._callbacks.clear()
+            self._dir_watches.clear()
+            self._parent_watches.clear()
+            self._parent_paths.clear()
+            self._closing = False
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        self._inotify = INotify()
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, name="LogWatcher", daemon=True)
+        self._thread.start()
+
+    def _add_dir_watch(self, directory):
+        """
+        Watches directory, falls back to watching its nearest existing ancestor if it doesn't exist (yet)
+
+        :param directory: directory containing registered files
+        :return: True if the directory itself is watched
+        """
+        try:
+            watch_desc = self._inotify.add_watch(directory, DIR_WATCH_FLAGS)
+            self._dir_watches[watch_desc] = directory
+            return True
+        except FileNotFoundError:
+            pass
+        ancestor = os.path.dirname(directory)
+        while True:
+            try:
+                watch_desc = self._inotify.add_watch(ancestor, PARENT_WATCH_FLAGS)
+                break
+            except FileNotFoundError:
+                if ancestor == os.path.dirname(ancestor):
+                    logger.error("Can't watch %s, no existing ancestor", directory)
+                    return False
+                ancestor = os.path.dirname(ancestor)
+            except OSError as error:
+                logger.error("Can't watch %s or its ancestor %s: %s", directory, ancestor, error)
+                return False
+        self._parent_watches.setdefault(watch_desc, set()).add(directory)
+        self._parent_paths[watch_desc] = ancestor
+        # closes the gap between both add_watch calls
+        if os.path.isdir(self._next_step(ancestor, directory)):
+            self._parent_watches[watch_desc].discard(directory)
+            if not self._parent_watches[watch_desc]:
+                self._drop_parent_watch(watch_desc)
+            return self._add_dir_watch(directory)
+        return False
+
+    @staticmethod
+    def _next_step(ancestor, directory):
+        """
+        :return: child of ancestor on the way to directory
+        """
+        relative = os.path.relpath(directory, ancestor)
+        return os.path.join(ancestor, relative.split(os.sep, 1)[0])
+
+    def _drop_parent_watch(self, watch_desc):
+        del self._parent_watches[watch_desc]
+        del self._parent_paths[watch_desc]
+        if watch_desc not in self._dir_watches:
+            self._rm_watch(watch_desc)
+
+    def _rm_watch(self, watch_desc):
+        try:
+            self._inotify.rm_watch(watch_desc)
+        except OSError:
+            # watch is already gone together with the directory
+            pass
+
+    def _run(self):
+        logger.info("Log watcher started")
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._inotify.fileno(), selectors.EVENT_READ)
+            selector.register(self._wake_r, selectors.EVENT_READ)
+            while not self._closing:
+                for key, _mask in selector.select():
+                    if key.fd == self._wake_r:
+                        os.read(self._wake_r, 64)
+                        continue
+                    for callback, event in self._collect(self._inotify.read(timeout=0)):
+                        try:
+                            callback(event)
+                        except Exception as error:    # pylint: disable=broad-exception-caught
+                            logger.error("Log watcher callback failed: %s", error, exc_info=True)
+        logger.info("Log watcher stopped")
+
+    def _collect(self, events):
+        """
+        Translates a batch of inotify events into one (callback, event) pair per touched file
+
+        :param events: list of inotify events
+        :return: list of (callback, event)
+        """
+        touched = {}
+        with self._lock:
+            for event in events:
+                if event.mask & flags.Q_OVERFLOW:
+                    logger.warning("inotify queue overflow, notifying all watched files")
+                    for directory, files in self._callbacks.items():
+                        for name in files:
+                            touched.setdefault((directory, name), EVENT_MODIFIED)
+                    continue
+                if event.wd in self._parent_watches:
+                    self._parent_event(event, touched)
+                if event.wd in self._dir_watches:
+                    self._dir_event(event, touched)
+            return [(self._callbacks[directory][name], event) for (directory, name), event in touched.items()
+                    if name in self._callbacks.get(directory, {})]
+
+    def _parent_event(self, event, touched):
+        waiting = self._parent_watches[event.wd]
+        if event.mask & flags.IGNORED:
+            # ancestor is gone as well, there is nothing left to watch
+            for directory in waiting:
+                logger.error("Ancestor of %s got removed, stop waiting for it", directory)
+            del self._parent_watches[event.wd]
+            del self._parent_paths[event.wd]
+            return
+        if not event.mask & flags.ISDIR:
+            return
+        created = os.path.join(self._parent_paths[event.wd], event.name)
+        for directory in [d for d in waiting if self._next_step(self._parent_paths[event.wd], d) == created]:
+            waiting.discard(directory)
+            if self._add_dir_watch(directory):
+                # files might got created before the watch was in place
+                for name in self._callbacks.get(directory, {}):
+                    touched[(directory, name)] = EVENT_CREATED
+        if not waiting and event.wd in self._parent_watches:
+            self._drop_parent_watch(event.wd)
+
+    def _dir_event(self, event, touched):
+        directory = self._dir_watches[event.wd]
+        if event.mask & flags.IGNORED:
+            # directory got removed or moved, wait for it to come back
+            del self._dir_watches[event.wd]
+            if directory in self._callbacks and self._add_dir_watch(directory):
+                for name in self._callbacks[directory]:
+                    touched[(directory, name)] = EVENT_CREATED
+            return
+        if event.name not in self._callbacks.get(directory, {}):
+            return
+        if event.mask & (flags.CREATE | flags.MOVED_TO):
+            touched[(directory, event.name)] = EVENT_CREATED
+        else:
+            touched.setdefault((directory, event.name), EVENT_MODIFIED)
+
+
+class AsyncLogWatcher(LogWatcher):
+    """
+    class AsyncLogWatcher
+    LogWatcher driven by an asyncio event loop instead of a thread: the inotify fd is registered with loop.add_reader
+    and the callbacks are executed inside the loop.
+    Bursts are debounced, the first batch of events is dispatched right away, the events of the following
+    interval are collected and dispatched together (one call per file).
+    Stops reading (and closes the fd) when the last file got unwatched.
+    """
+
+    def __init__(self, loop, interval):
+        """
+        :param loop: event loop executing the callbacks
+        :param interval: minimum seconds between two dispatches
+        """
+        super().__init__()
+        self.loop = loop
+        self.interval = interval
+        # callback -> event, waiting for the next dispatch
+        self._pending = {}
+        self._dispatch_handle = None
+        self._last_dispatch = None
+
+    def unwatch(self, path):
+        super().unwatch(path)
+        with self._lock:
+            if self._callbacks:
+                return
+        try:
+            self.loop.call_soon_threadsafe(self._stop_if_idle)
+        except RuntimeError:
+            # loop is closed already
+            self.close()
+
+    def close(self):
+        """
+        Stops reading and drops all watches, must be called inside the loop or after it got closed
+        """
+        with self._lock:
+            if self._inotify is None:
+                return
+            if not self.loop.is_closed():
+                self.loop.remove_reader(self._inotify.fileno())
+            if self._dispatch_handle is not None:
+                self._dispatch_handle.cancel()
+                self._dispatch_handle = None
+            self._pending.clear()
+            self._inotify.close()
+            self._inotify = None
+            self._callbacks.clear()
+            self._dir_watches.clear()
+            self._parent_watches.clear()
+            self._parent_paths.clear()
+
+    def _start(self):
+        if self._inotify is not None:
+            return
+        self._inotify = INotify()
+        # watch() might be called from a worker thread, the reader is added inside the loop
+        self.loop.call_soon_threadsafe(self.loop.add_reader, self._inotify.fileno(), self._on_readable, self._inotify)
+        logger.info("Async log watcher started")
+
+    def _stop_if_idle(self):
+        with self._lock:
+            if self._callbacks or self._inotify is None:
+                return
+            self.close()
+        logger.info("Async log watcher stopped")
+
+    def _on_readable(self, inotify):
+        if inotify is not self._inotify:
+            # stale reader of an already closed fd
+            return
+        for callback, event in self._collect(inotify.read(timeout=0)):
+            if self._pending.get(callback) != EVENT_CREATED:
+                self._pending[callback] = event
+        if self._dispatch_handle is None:
+            delay = 0.0
+            if self._last_dispatch is not None:
+                delay = max(self._last_dispatch + self.interval - self.loop.time(), 0.0)
+            self._dispatch_handle = self.loop.call_later(delay, self._dispatch)
+
+    def _dispatch(self):
+        self._dispatch_handle = None
+        self._last_dispatch = self.loop.time()
+        pending, self._pending = self._pending, {}
+        for callback, event in pending.items():
+            try:
+                callback(event)
+            except Exception as error:    # pylint: disable=broad-exception-caught
+                logger.error("Log watcher callback failed: %s", error, exc_info=True)
+
+
+# shared instance for the whole process
+log_watcher = LogWatcher()
+
+# event loop -> AsyncLogWatcher
+_async_watchers = weakref.WeakKeyDictionary()
+
+
+def get_async_log_watcher(interval):
+    """
+    :param interval: minimum seconds between two dispatches
+    :return: the AsyncLogWatcher of the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    watcher = _async_watchers.get(loop)
+    if watcher is None:
+        watcher = _async_watchers[loop] = AsyncLogWatcher(loop, interval)
+    watcher.interval = interval
+    return watcher
@@ -0,0 +1,188 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import logging
+
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from uploader.models import ModuleDurationStat, ModuleTiming
+
+logger = logging.getLogger(__name__)
+
+# module prefix -> phase number (same order as the EMBA_*_PHASE constants of the logreader)
+# Q- and D-modules run beside the phases and are not weighted
+MODULE_PHASES = {"P": 0, "S": 1, "L": 2, "F": 3}
+PHASE_NAMES = ("Pre-checking", "Testing", "System emulation", "Reporting")
+# no ETA before this share of the expected work is done
+ETA_MIN_PROGRESS = 0.02
+# a running module is never counted as more done than this share of its mean
+RUNNING_CAP = 0.95
+
+
+def module_phase(module):
+    """
+    :param module: module name like S20_shell_check
+    :return: phase number or None for modules that are not weighted
+    """
+    return MODULE_PHASES.get(module[:1].upper()) if module else None
+
+
+def phase_name(phase_nmbr):
+    """
+    :param phase_nmbr: phase number of the logreader
+    :return: short phase name for the module timings
+    """
+    return PHASE_NAMES[phase_nmbr] if 0 <= phase_nmbr < len(PHASE_NAMES) else ""
+
+
+def load_duration_table():
+    """
+    reads the aggregated module runtimes
+
+    :return: {module: (mean seconds, share of analyses running the module)}
+    """
+    stats = list(ModuleDurationStat.objects.filter(runs__gt=0).values_list("module", "runs", "total_seconds"))
+    if not stats:
+        return {}
+    # pre-checking modules run in every analysis, the busiest module is a good guess for the number of analyses
+    analyses = max(runs for _module, runs, _total in stats)
+    return {module: (total / runs, runs / analyses) for module, runs, total in stats}
+
+
+def record_module_durations(analysis_id):
+    """
+    adds the module timings of a finished analysis to the historical table
+
+    :param analysis_id: id of the FirmwareAnalysis
+    """
+    timings = ModuleTiming.objects.filter(analysis_id=analysis_id, duration__gt=0).values_list("module", "duration")
+    now = timezone.now()
+    with transaction.atomic():
+        for module, duration in timings:
+            ModuleDurationStat.objects.get_or_create(module=module)
+            ModuleDurationStat.objects.filter(module=module).update(
+                runs=F("runs") + 1, total_seconds=F("total_seconds") + duration, last_seconds=duration, last_update=now)
+    logger.info("Module durations of %s added to the history", analysis_id)
+
+
+class ProgressEstimator:
+    """
+    class ProgressEstimator
+    Time weighted progress of one analysis: every module counts with its historical mean runtime
+    (times the share of analyses it runs in) instead of 1/module count of its phase.
+    The clock is the last timestamp seen in emba.log, so a replayed or resumed log gives the same numbers.
+    """
+
+    def __init__(self, durations):
+        """
+        :param durations: {module: (mean seconds, share)} as returned by load_duration_table
+        """
+        self.durations = durations
+        self.phase = 0
+        self.started = {}
+        self.finished = set()
+        self.first_stamp = None
+        self.last_stamp = None
+
+    @classmethod
+    def from_history(cls):
+        return cls(load_duration_table())
+
+    @property
+    def has_history(self):
+        return bool(self.durations)
+
+    def observe(self, stamp):
+        """
+        advances the clock
+
+        :param stamp: naive datetime of a log event or None
+        """
+        if stamp is None:
+            return
+        if self.first_stamp is None:
+            self.first_stamp = stamp
+        if self.last_stamp is None or stamp > self.last_stamp:
+            self.last_stamp = stamp
+
+    def phase_changed(self, phase_nmbr, stamp=None):
+        self.observe(stamp)
+        if phase_nmbr >= 0:
+            self.phase = phase_nmbr
+
+    def module_started(self, module, stamp):
+        self.observe(stamp)
+        if stamp is not None:
+            self.started[module] = stamp
+
+    def module_finished(self, module, stamp):
+        """
+        :return: (start, runtime in seconds) or (None, None) if the start is unknown
+        """
+        self.observe(stamp)
+        self.finished.add(module)
+        started = self.started.pop(module, None)
+        if started is None or stamp is None:
+            return None, None
+        return started, max((stamp - started).total_seconds(), 0.0)
+
+    def estimate(self):
+        """
+        :return: (percentage, eta in seconds or None), None without history
+        """
+        if not self.durations:
+            return None
+        done = 0.0
+        remaining = 0.0
+        for module, (mean, share) in self.durations.items():
+            phase = module_phase(module)
+            if phase is None:
+                continue
+            if module in self.finished:
+                done += mean
+            elif module in self.started:
+                elapsed = (self.last_stamp - self.started[module]).total_seconds()
+                running = min(elapsed, mean * RUNNING_CAP)
+                done += running
+                remaining += mean - running
+            elif phase >= self.phase:
+                # modules of earlier phases that didn't run won't run anymore
+                remaining += mean * share
+        if done + remaining <= 0:
+            return None
+        progress = done / (done + remaining)
+        eta = None
+        if progress >= ETA_MIN_PROGRESS and self.first_stamp is not None:
+            # modules run in parallel, extrapolate the wall clock instead of summing up module runtimes
+            wall = (self.last_stamp - self.first_stamp).total_seconds()
+            eta = int(wall * (1 - progress) / progress)
+        return min(progress * 100, 99.0), eta
+
+    def to_dict(self):
+        """
+        :return: json serializable state for the logreader checkpoint
+        """
+        return {
+            "phase": self.phase,
+            "started": {module: stamp.isoformat() for module, stamp in self.started.items()},
+            "finished": sorted(self.finished),
+            "first_stamp": self.first_stamp.isoformat() if self.first_stamp else None,
+            "last_stamp": self.last_stamp.isoformat() if self.last_stamp else None,
+        }
+
+    def load_dict(self, state):
+        """
+        restores the state written by to_dict
+
+        :param state: dict from the checkpoint
+        """
+        self.phase = state["phase"]
+        self.started = {module: datetime.fromisoformat(stamp) for module, stamp in state["started"].items()}
+        self.finished = set(state["finished"])
+        self.first_stamp = datetime.fromisoformat(state["first_stamp"]) if state["first_stamp"] else None
+        self.last_stamp = datetime.fromisoformat(state["last_stamp"]) if state["last_stamp"] else None
@@ -308,3 +308,52 @@ WORKER_SETUP_LOGS = "worker_setup_{timestamp}.log"
 CELERY_BROKER_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/0"
 CELERY_RESULT_BACKEND = f"redis://{REDIS_HOST}:{REDIS_PORT}/0"
 CELERY_TASK_TRACK_STARTED = True
+
+# LogReader: status db writes and websocket pushes per analysis are coalesced to at most one per interval (seconds)
+STATUS_FLUSH_INTERVAL = float(os.environ.get('STATUS_FLUSH_INTERVAL', 2))
+
+# Log viewer: changes of followed logs are debounced to at most one update per interval (seconds),
+# a frame of the follow mode carries at most LOG_FOLLOW_MAX_FRAME bytes
+LOG_FOLLOW_INTERVAL = float(os.environ.get('LOG_FOLLOW_INTERVAL', 0.5))
+LOG_FOLLOW_MAX_FRAME = int(os.environ.get('LOG_FOLLOW_MAX_FRAME', 1 << 20))
+
+# BoundedExecutor: one thread pool per job class, "workers" jobs run at once and "queue" more wait in memory,
+# further submissions are rejected (local analyses wait in the db queue instead)
+EXECUTOR_POOLS = {
+    "analysis": {
+        "workers": int(os.environ.get('EXECUTOR_ANALYSIS_WORKERS', 4)),
+        "queue": 0,
+    },
+    "archive": {
+        "workers": int(os.environ.get('EXECUTOR_ARCHIVE_WORKERS', 2)),
+        "queue": int(os.environ.get('EXECUTOR_ARCHIVE_QUEUE', 4)),
+    },
+    "maintenance": {
+        "workers": int(os.environ.get('EXECUTOR_MAINTENANCE_WORKERS', 2)),
+        "queue": int(os.environ.get('EXECUTOR_MAINTENANCE_QUEUE', 2)),
+    },
+}
+
+# local EMBA runs of all web processes share ANALYSIS_HOST_SLOTS leases in redis,
+# the lease of a crashed process is taken over ANALYSIS_SLOT_TTL seconds after its last heartbeat
+ANALYSIS_HOST_SLOTS = int(os.environ.get('ANALYSIS_HOST_SLOTS', 4))
+ANALYSIS_SLOT_TTL = int(os.environ.get('ANALYSIS_SLOT_TTL', 60))
+# admission control of local analyses keeps these free for embark, db and redis, decisions are kept for tuning
+ADMISSION_MEMORY_RESERVE_MB = int(os.environ.get('ADMISSION_MEMORY_RESERVE_MB', 2048))
+ADMISSION_DISK_RESERVE_MB = int(os.environ.get('ADMISSION_DISK_RESERVE_MB', 4000))
+ADMISSION_DECISION_LOG = int(os.environ.get('ADMISSION_DECISION_LOG', 200))
+# queued analyses are decided again after this many seconds if no finished analysis does it before
+ADMISSION_RETRY_INTERVAL = int(os.environ.get('ADMISSION_RETRY_INTERVAL', 60))
+# process tree sampling of local EMBA runs, the series is thinned out beyond RESOURCE_SAMPLE_POINTS
+RESOURCE_SAMPLE_INTERVAL = int(os.environ.get('RESOURCE_SAMPLE_INTERVAL', 15))
+RESOURCE_SAMPLE_POINTS = int(os.environ.get('RESOURCE_SAMPLE_POINTS', 480))
+# mail outbox: sent every OUTBOX_INTERVAL seconds in batches of OUTBOX_BATCH over one connection,
+# digest mails (e.g. admin alerts of failed runs) wait OUTBOX_DIGEST_WINDOW seconds to be merged with the rest of a burst
+OUTBOX_INTERVAL = int(os.environ.get('OUTBOX_INTERVAL', 30))
+OUTBOX_BATCH = int(os.environ.get('OUTBOX_BATCH', 100))
+OUTBOX_DIGEST_WINDOW = int(os.environ.get('OUTBOX_DIGEST_WINDOW', 60))
+OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 8))
+# log archives of finished analyses: "zip" (importable by the porter) or "tar.zst" (needs zstandard),
+# LOG_ARCHIVE_WORKERS threads compress one archive
+LOG_ARCHIVE_FORMAT = os.environ.get('LOG_ARCHIVE_FORMAT', 'zip')
+LOG_ARCHIVE_WORKERS = int(os.environ.get('LOG_ARCHIVE_WORKERS', min(os.cpu_count() or 1, 4)))
@@ -0,0 +1,27 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_reconciled = threading.Event()
+_lock = threading.Lock()
+
+
+def reconcile_analyses():
+    """
+    Startup hook of every server entry point (wsgi, asgi, asgi_dev), runs once per process.
+    Takes over the local analyses a previous server instance left behind and starts what was queued when it stopped.
+    Several server processes run it, the analysis claims and the queue locks let each analysis go to one of them
+    """
+    with _lock:
+        if _reconciled.is_set():
+            return
+        _reconciled.set()
+    from uploader.boundedexecutor import BoundedExecutor  # pylint: disable=import-outside-toplevel
+    logger.info("Reconciling local analyses of a previous server instance")
+    BoundedExecutor.reattach_running_analyses()
+    BoundedExecutor.dispatch_in_thread()
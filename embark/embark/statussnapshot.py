@@ -0,0 +1,118 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import json
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from redis import Redis
+from redis.exceptions import RedisError
+
+from embark.liveprogress import LiveProgress
+from uploader.models import FirmwareAnalysis
+
+logger = logging.getLogger(__name__)
+
+REDIS_CLIENT = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+
+# hash per user: analysis id -> status json of the analyses that are still running
+SNAPSHOT_KEY = "STATUS_SNAPSHOT__{}"
+# snapshots of users that don't come back expire, every update extends them
+SNAPSHOT_TTL = 7 * 24 * 3600
+
+
+def snapshot_key(user_id):
+    return SNAPSHOT_KEY.format(user_id)
+
+
+def is_active(analysis):
+    return not (analysis.finished or analysis.failed or analysis.status.get("finished"))
+
+
+def publish_status(analysis):
+    """
+    Updates the snapshot of the analysis owner and sends the status of this one analysis to the users group
+    Finished analyses are dropped from the snapshot after their last delta went out
+
+    :param analysis: FirmwareAnalysis with the current status
+    """
+    analysis_id = str(analysis.id)
+    key = snapshot_key(analysis.user_id)
+    try:
+        if is_active(analysis):
+            with REDIS_CLIENT.pipeline() as pipe:
+                pipe.hset(key, analysis_id, json.dumps(analysis.status))
+                pipe.expire(key, SNAPSHOT_TTL)
+                pipe.execute()
+        else:
+            REDIS_CLIENT.hdel(key, analysis_id)
+    except RedisError as error:
+        # the next reload rebuilds it from the db
+        logger.error("Status snapshot of %s not updated: %s", analysis_id, error)
+    async_to_sync(get_channel_layer().group_send)(
+        f"services_{analysis.user}", {
+            "type": 'send.message',
+            "message": {analysis_id: analysis.status}
+        }
+    )
+
+
+def active_analyses():
+    """
+    :return: queryset of the analyses is_active is true for
+    """
+    return FirmwareAnalysis.objects.filter(finished=False, failed=False).exclude(status__finished=True)
+
+
+def load_active_statuses(user, analysis_ids=None):
+    """
+    :param user: owner of the analyses
+    :param analysis_ids: only these analyses, None for all
+    :return: {analysis id: status json} of the running analyses, their status is in the live progress
+    """
+    analyses = active_analyses().filter(user=user)
+    if analysis_ids is not None:
+        analyses = analyses.filter(id__in=list(analysis_ids))
+    return {str(analysis_id): json.dumps(LiveProgress(analysis_id).load(status)) for analysis_id, status in analyses.values_list("id", "status")}
+
+
+def get_status_snapshot(user):
+    """
+    Reads the running analyses of a user, the db is only asked which of them are still running.
+    An empty or unreachable snapshot is rebuilt from the db, running analyses missing in it (e.g. queued ones or a
+    failed publish_status) are added.
+    Analyses finished by something that didn't publish their status are dropped here.
+
+    :param user: owner of the analyses
+    :return: json object string {analysis id: status}, the status strings are passed through without decoding
+    """
+    key = snapshot_key(user.pk)
+    try:
+        snapshot = {analysis_id.decode(): status.decode() for analysis_id, status in REDIS_CLIENT.hgetall(key).items()}
+    except RedisError as error:
+        logger.error("Status snapshot of %s not readable: %s", user, error)
+        snapshot = None
+    if not snapshot:
+        missing = statuses = load_active_statuses(user)
+    else:
+        running = {str(analysis_id) for analysis_id in active_analyses().filter(user=user).values_list("id", flat=True)}
+        stale = [analysis_id for analysis_id in snapshot if analysis_id not in running]
+        if stale:
+            logger.debug("Dropping finished analyses %s from the status snapshot", stale)
+            REDIS_CLIENT.hdel(key, *stale)
+        statuses = {analysis_id: status for analysis_id, status in snapshot.items() if analysis_id in running}
+        missing_ids = running.difference(snapshot)
+        missing = load_active_statuses(user, missing_ids) if missing_ids else {}
+        statuses.update(missing)
+    if missing and snapshot is not None:
+        try:
+            with REDIS_CLIENT.pipeline() as pipe:
+                pipe.hset(key, mapping=missing)
+                pipe.expire(key, SNAPSHOT_TTL)
+                pipe.execute()
+        except RedisError as error:
+            logger.error("Status snapshot of %s not written: %s", user, error)
+    return "{" + ",".join(f"{json.dumps(analysis_id)}:{status}" for analysis_id, status in statuses.items()) + "}"
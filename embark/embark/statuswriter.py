@@ -0,0 +1,104 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import logging
+import threading
+import time
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class StatusWriter:
+    """
+    class StatusWriter
+    Coalesces the status updates of one analysis: the status is merged in memory and written
+    (db + websocket) at most once per interval. Forced updates (phase change, finish) are written right away,
+    pending updates are written by a trailing timer at the end of the interval.
+    The caller mutates the shared status while holding StatusWriter.lock
+    """
+
+    # process wide counters
+    total_updates = 0
+    total_writes = 0
+    _totals_lock = threading.Lock()
+
+    def __init__(self, write, interval):
+        """
+        :param write: callable persisting and publishing the current status
+        :param interval: minimum time between two writes in seconds, 0 writes every update
+        """
+        self.write = write
+        self.interval = interval
+        self.lock = threading.RLock()
+        self.updates = 0
+        self.writes = 0
+        self._dirty = False
+        self._last_write = None
+        self._timer = None
+
+    @property
+    def saved(self):
+        return self.updates - self.writes
+
+    def update(self, force=False):
+        """
+        Marks the status as changed and writes it if the interval is over
+
+        :param force: write immediately (phase change, finish)
+        """
+        with self.lock:
+            self.updates += 1
+            self._dirty = True
+            now = time.monotonic()
+            if force or self._last_write is None or now - self._last_write >= self.interval:
+                self._write()
+            elif self._timer is None:
+                self._timer = threading.Timer(self._last_write + self.interval - now, self._trailing_write)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """
+        Writes pending changes right away
+        """
+        with self.lock:
+            if self._dirty:
+                self._write()
+
+    def close(self):
+        """
+        Writes pending changes and adds the counters to the process wide totals
+        """
+        self.flush()
+        with StatusWriter._totals_lock:
+            StatusWriter.total_updates += self.updates
+            StatusWriter.total_writes += self.writes
+        logger.info("Status writer: %d updates, %d writes, %d writes saved (process total: %d of %d saved)",
+                    self.updates, self.writes, self.saved, StatusWriter.total_updates - StatusWriter.total_writes, StatusWriter.total_updates)
+
+    def _write(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._dirty = False
+        self._last_write = time.monotonic()
+        self.writes += 1
+        self.write()
+
+    def _trailing_write(self):
+        try:
+            with self.lock:
+                if self._timer is not threading.current_thread():
+                    # superseded by a write in the meantime
+                    return
+                self._timer = None
+                if self._dirty:
+                    self._write()
+        except Exception as error:    # pylint: disable=broad-exception-caught
+            logger.error("Trailing status write failed: %s", error, exc_info=True)
+        finally:
+            # timer threads are short lived, don't leave their db connection behind
+            connections.close_all()
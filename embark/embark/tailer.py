@@ -0,0 +1,152 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import hashlib
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 1048576   # 1MB per read call
+TAIL_CHECK_SIZE = 4096      # consumed bytes read again to recognize the file
+
+
+class LogTailer:
+    """
+    class LogTailer
+    Incremental reader for append-only log files (e.g. emba.log)
+    Remembers the byte offset of the last consumed complete line and only reads newly appended bytes.
+    A trailing partial line stays unconsumed until its newline got written.
+    Every read starts TAIL_CHECK_SIZE bytes before the offset and compares them with the consumed ones, a file
+    written again with the same content (e.g. extracted again from the worker archive, often with the same inode)
+    is continued at the offset. While such a file is shorter than the offset and starts like the consumed one
+    it's waited for. Truncation and different content restart reading from the beginning, restarts counts them.
+    """
+
+    def __init__(self, path, offset=0, inode=None, tail_digest=None):
+        self.path = path
+        # offset of the first byte not yet returned as a complete line
+        self.offset = offset
+        # inode of the file the offset belongs to
+        self.inode = inode
+        # digest of the TAIL_CHECK_SIZE bytes before the offset, None if unknown
+        self.tail_digest = tail_digest
+        # first TAIL_CHECK_SIZE consumed bytes, read again after a resume
+        self.head = b''
+        # restarts from the beginning, lines returned before belong to another file
+        self.restarts = 0
+
+    def read_lines(self) -> list:
+        """
+        Reads all complete lines appended since the last call
+
+        :return: list of new lines (str, without line endings)
+        """
+        data = self._read_new()
+        if not data:
+            return []
+        return data.decode('utf-8', errors='replace').splitlines()
+
+    def read_entries(self) -> list:
+        """
+        Reads all complete lines appended since the last call together with their end offsets
+
+        :return: list of (offset after the line, line without line ending)
+        """
+        data = self._read_new()
+        end = self.offset - len(data)
+        entries = []
+        for raw_line in data.splitlines(keepends=True):
+            end += len(raw_line)
+            entries.append((end, raw_line.decode('utf-8', errors='replace').rstrip('\r\n')))
+        return entries
+
+    def _read_new(self) -> bytes:
+        """
+        Reads the complete lines appended since the last call and advances the offset
+
+        :return: bytes up to and including the last newline
+        """
+        try:
+            with open(self.path, 'rb') as log_file:
+                stat = os.fstat(log_file.fileno())
+                self.inode = stat.st_ino
+                if stat.st_size < self.offset:
+                    if self._written_again(log_file, stat.st_size):
+                        logger.debug("Log file %s is written again, waiting for %d bytes", self.path, self.offset)
+                        return b''
+                    logger.info("Log file %s got truncated, restarting from the beginning", self.path)
+                    self.restart()
+
+                if stat.st_size == self.offset:
+                    return b''
+
+                start = max(0, self.offset - TAIL_CHECK_SIZE)
+                log_file.seek(start)
+                data = self._read_complete(log_file)
+                tail, data = data[:self.offset - start], data[self.offset - start:]
+                if self.tail_digest is not None and self.offset > 0 and self._digest(tail) != self.tail_digest:
+                    logger.info("Log file %s got replaced, restarting from the beginning", self.path)
+                    self.restart()
+                    log_file.seek(0)
+                    tail, data = b'', self._read_complete(log_file)
+
+                if data:
+                    self.offset += len(data)
+                    self.tail_digest = self._digest(data if len(data) >= TAIL_CHECK_SIZE else tail + data)
+                if len(self.head) < min(self.offset, TAIL_CHECK_SIZE):
+                    self.head = os.pread(log_file.fileno(), min(self.offset, TAIL_CHECK_SIZE), 0)
+        except FileNotFoundError:
+            logger.debug("Log file %s does not exist (yet)", self.path)
+            return b''
+        return data
+
+    def _written_again(self, log_file, size) -> bool:
+        """
+        :param log_file: binary file object of the shrunk file
+        :param size: its size
+        :return: True if the file starts with the consumed bytes, so it's likely written again from the beginning
+        """
+        if len(self.head) < min(self.offset, TAIL_CHECK_SIZE):
+            # not known after a resume
+            return False
+        length = min(size, len(self.head))
+        return os.pread(log_file.fileno(), length, 0) == self.head[:length]
+
+    @staticmethod
+    def _digest(data) -> str:
+        """
+        :return: digest of the last TAIL_CHECK_SIZE bytes of data
+        """
+        return hashlib.sha256(data[-TAIL_CHECK_SIZE:]).hexdigest()
+
+    @staticmethod
+    def _read_complete(log_file) -> bytes:
+        """
+        Reads from the current position to EOF and cuts off a trailing partial line
+
+        :param log_file: binary file object positioned at the first unread byte
+        :return: bytes up to and including the last newline
+        """
+        chunks = []
+        while True:
+            chunk = log_file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        data = b''.join(chunks)
+        last_newline = data.rfind(b'\n')
+        return data[:last_newline + 1]
+
+    def restart(self):
+        self.offset = 0
+        self.tail_digest = None
+        self.head = b''
+        self.restarts += 1
+
+    def reset(self):
+        self.offset = 0
+        self.inode = None
+        self.tail_digest = None
+        self.head = b''
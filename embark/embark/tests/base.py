@@ -0,0 +1,57 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import tempfile
+import uuid
+
+from pathlib import Path
+
+from django.test import override_settings
+
+from embark.logwatcher import log_watcher
+from uploader.models import FirmwareAnalysis
+from users.models import User
+
+# emba.log of a complete run
+TEST_LOG = Path(__file__).resolve().parent.parent.parent.parent / "test" / "logreader" / "good-log"
+
+
+class TemporaryRootMixin:
+    """
+    class TemporaryRootMixin
+    Mixin for test cases, the setting root_setting points to a temporary directory (tmp_dir) during each test
+    """
+    root_setting = "EMBA_LOG_ROOT"
+
+    def setUp(self):    # pylint: disable=invalid-name
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()    # pylint: disable=consider-using-with
+        self.settings_override = override_settings(**{self.root_setting: self.tmp_dir.name})
+        self.settings_override.enable()
+
+    def tearDown(self):     # pylint: disable=invalid-name
+        self.settings_override.disable()
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+
+class AnalysisLogMixin(TemporaryRootMixin):
+    """
+    class AnalysisLogMixin
+    Mixin for db test cases, creates an analysis whose logs are in the temporary EMBA_LOG_ROOT.
+    The directory itself isn't created, the emba.log watch is dropped afterwards
+    """
+    # owner of the analysis, None for none
+    username = None
+
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create(username=self.username) if self.username else None
+        self.analysis = FirmwareAnalysis.objects.create(id=uuid.uuid4(), user=user)
+        self.analysis.path_to_logs = f"{self.tmp_dir.name}/{self.analysis.id}/emba_logs"
+        self.analysis.save()
+
+    def tearDown(self):
+        log_watcher.unwatch(f"{self.analysis.path_to_logs}/emba.log")
+        super().tearDown()
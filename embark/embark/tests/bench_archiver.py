@@ -0,0 +1,111 @@
+"""
+Builds a synthetic emba_logs tree and compares the old single threaded zip writer
+with the parallel Archiver.make_zipfile and, if zstandard is installed, Archiver.make_tarzst.
+The tree mixes module logs, csv and html with already compressed files (firmware copies, images).
+
+usage (from the embark directory):
+    DJANGO_SETTINGS_MODULE=embark.settings.dev python3 -m embark.tests.bench_archiver [size in MB] [threads]
+"""
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+
+import django
+
+django.setup()
+
+from uploader import archiver  # noqa: E402 pylint: disable=wrong-import-position
+from uploader.archiver import Archiver  # noqa: E402 pylint: disable=wrong-import-position
+
+MB = 1024 * 1024
+# share of the tree that is already compressed
+COMPRESSED_SHARE = 0.2
+LOG_LINES = [
+    "[*] {n} Testing binary /usr/sbin/httpd{n} for stack canaries: no\n",
+    "[+] Found {n} possible vulnerabilities (CVE-2023-{n:05d}) in busybox 1.{m}.0\n",
+    "    /firmware/squashfs-root/lib/libc.so.{m}: ELF 32-bit MSB shared object, MIPS, version {n}\n",
+    "<tr><td>S{m:02d}_module</td><td>{n}</td><td>finished</td></tr>\n",
+]
+
+
+def make_tree(root, size_mb):
+    """
+    :return: bytes written
+    """
+    rng = random.Random(42)
+    written = 0
+    text_target = size_mb * MB * (1 - COMPRESSED_SHARE)
+    module = 0
+    while written < text_target:
+        module_dir = os.path.join(root, "emba_logs", f"s{module:02d}_module")
+        os.makedirs(module_dir, exist_ok=True)
+        # many small files and a few large ones, like the real logs
+        size = rng.choice([16 << 10, 256 << 10, 4 * MB, 48 * MB])
+        lines = []
+        length = 0
+        while length < size:
+            line = rng.choice(LOG_LINES).format(n=rng.randrange(100000), m=rng.randrange(40))
+            lines.append(line)
+            length += len(line)
+        with open(os.path.join(module_dir, f"log_{written}.txt"), 'w', encoding='utf-8') as log_file:
+            log_file.writelines(lines)
+        written += length
+        module = (module + 1) % 60
+    firmware_dir = os.path.join(root, "emba_logs", "firmware")
+    os.makedirs(firmware_dir, exist_ok=True)
+    number = 0
+    while written < size_mb * MB:
+        suffix = ".png" if number % 4 else ".tar.gz"
+        with open(os.path.join(firmware_dir, f"blob_{number}{suffix}"), 'wb') as blob:
+            blob.write(os.urandom(min(32 * MB, size_mb * MB - written)))
+        written = min(written + 32 * MB, size_mb * MB)
+        number += 1
+    return written
+
+
+def legacy_zipfile(output_filename, source_dir):
+    # Archiver.make_zipfile before the parallel writer
+    relroot = os.path.abspath(os.path.join(source_dir, os.pardir))
+    with zipfile.ZipFile(output_filename, "w", zipfile.ZIP_DEFLATED) as zip_:
+        for root, _dirs, files in os.walk(source_dir):
+            zip_.write(root, os.path.relpath(root, relroot))
+            for file in files:
+                filename = os.path.join(root, file)
+                if os.path.isfile(filename):
+                    zip_.write(filename, os.path.join(os.path.relpath(root, relroot), file))
+    return output_filename
+
+
+def measure(name, function, output, source, size):
+    start = time.perf_counter()
+    function(output, source)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>22} {elapsed:8.1f} s {size / MB / elapsed:8.1f} MB/s {os.path.getsize(output) / MB:9.1f} MB")
+    os.remove(output)
+
+
+def run(size_mb, threads):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        size = make_tree(tmp_dir, size_mb)
+        source = os.path.join(tmp_dir, "emba_logs")
+        print(f"{size / MB:.0f} MB log tree, {threads} threads on {os.cpu_count()} cores")
+        print(f"{'writer':>22} {'time':>10} {'throughput':>13} {'archive':>12}")
+        measure("zip (single thread)", legacy_zipfile, os.path.join(tmp_dir, "legacy.zip"), source, size)
+        measure("zip (parallel)", lambda output, source_dir: Archiver.make_zipfile(output, source_dir, threads),
+                os.path.join(tmp_dir, "parallel.zip"), source, size)
+        if archiver.zstandard is None:
+            print("zstandard not installed, skipping tar.zst")
+        else:
+            measure("tar.zst", lambda output, source_dir: Archiver.make_tarzst(output, source_dir, threads),
+                    os.path.join(tmp_dir, "logs.tar.zst"), source, size)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2048, int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count())
@@ -0,0 +1,136 @@
+# pylint: disable=C0413
+"""
+Builds an emba_run.log with N lines and compares the memory and latency of the array based LineCache
+(memory mapped and plain reads) with the former list based implementation
+(two lists of ints, last 10 lines rescanned on refresh).
+The mapped scan uses numpy if it is installed.
+
+usage (from the embark directory, the logviewer needs the django setup):
+    DJANGO_SETTINGS_MODULE=embark.settings.dev python3 -m embark.tests.bench_linecache [lines ...]
+"""
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import os
+import sys
+import tempfile
+import time
+
+from functools import partial
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'embark.settings.dev')
+
+django.setup()
+
+from embark import logviewer
+from embark.logviewer import LineCache
+
+LINE = b"[*] Wed May 10 11:18:18 CEST 2023 - S20_shell_check: checking binary\n"
+APPEND_LINES = 1000             # lines written between two refreshes
+LEGACY_MAX_LINES = 2000000      # the list based cache needs GBs above this
+
+
+class LegacyLineCache:
+    """
+    list based LineCache before the array rewrite
+    """
+
+    def __init__(self, filepath):
+        self.line_beginnings = [0]
+        self.line_endings = [0]
+        self.filehandle = open(filepath, "rb")  # pylint: disable=consider-using-with
+        self.refresh()
+
+    def refresh(self):
+        refresh_from_line = min(len(self.line_beginnings), 10)
+        refresh_from_byte = self.line_beginnings[-refresh_from_line]
+        self.line_beginnings = self.line_beginnings[:-refresh_from_line]
+        self.line_endings = self.line_endings[:-refresh_from_line]
+        self.filehandle.seek(refresh_from_byte)
+        while True:
+            line_beginning = self.filehandle.tell()
+            line = self.filehandle.readline()
+            line_ending = self.filehandle.tell()
+            if len(line) > 0 and line[-1:] == b'\n':
+                line_ending = line_ending - 1
+            if len(line) > 1 and line[-2:] == b'\r\n':
+                line_ending = line_ending - 1
+            self.line_beginnings.append(line_beginning)
+            self.line_endings.append(line_ending)
+            if len(line) == 0 or line[-1:] != b'\n':
+                break
+
+    def num_lines(self):
+        return len(self.line_beginnings)
+
+    def read_lines(self, first_line, last_line):
+        num_lines = self.num_lines()
+        first_byte = self.line_beginnings[num_lines - last_line - 1]
+        last_byte = self.line_endings[num_lines - first_line - 1]
+        self.filehandle.seek(first_byte)
+        return self.filehandle.read(last_byte - first_byte)
+
+    def memory_usage(self):
+        return sum(sys.getsizeof(offsets) + sum(sys.getsizeof(offset) for offset in offsets)
+                   for offsets in (self.line_beginnings, self.line_endings))
+
+    def close(self):
+        self.filehandle.close()
+
+
+def write_lines(log_file, count):
+    block = LINE * 10000
+    for _block in range(count // 10000):
+        log_file.write(block)
+    log_file.write(LINE * (count % 10000))
+    log_file.flush()
+
+
+def measure(cache_class, log_path, log_file):
+    start = time.perf_counter()
+    cache = cache_class(log_path)
+    build = time.perf_counter() - start
+
+    write_lines(log_file, APPEND_LINES)
+    start = time.perf_counter()
+    cache.refresh()
+    refresh = time.perf_counter() - start
+
+    middle = cache.num_lines() // 2
+    start = time.perf_counter()
+    cache.read_lines(middle, middle + 29)
+    read = time.perf_counter() - start
+
+    memory = cache.memory_usage()
+    cache.close()
+    return build, refresh, read, memory
+
+
+def run(sizes):
+    caches = (
+        ("mmap+np" if logviewer.numpy is not None else "mmap", LineCache),
+        ("read", partial(LineCache, use_mmap=False)),
+        ("list", LegacyLineCache),
+    )
+    print(f"{'lines':>10} {'file MB':>8} {'cache':>8} {'build s':>8} {'MB/s':>7} {'refresh ms':>11} {'read 30 us':>11} {'index MB':>9} {'B/line':>7}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "emba_run.log")
+            with open(log_path, 'wb') as log_file:
+                write_lines(log_file, size)
+                file_mb = size * len(LINE) / 2**20
+                for name, cache_class in caches:
+                    if cache_class is LegacyLineCache and size > LEGACY_MAX_LINES:
+                        print(f"{size:>10} {file_mb:8.0f} {name:>8} {'skipped':>8}")
+                        continue
+                    build, refresh, read, memory = measure(cache_class, log_path, log_file)
+                    print(f"{size:>10} {file_mb:8.0f} {name:>8} {build:8.2f} {file_mb / build:7.0f} {refresh * 1e3:11.2f} {read * 1e6:11.1f} "
+                          f"{memory / 2**20:9.1f} {memory / size:7.1f}")
+
+
+if __name__ == '__main__':
+    # 15.6M lines are about 1 GB
+    run([int(size) for size in sys.argv[1:]] or [1000000, 10000000, 15600000])
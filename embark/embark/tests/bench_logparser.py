@@ -0,0 +1,89 @@
+"""
+Throughput of the single pass line classifier against the former RxPY pipelines of
+LogReader.input_processing, replaying test/logreader/test-run.
+
+usage (from the embark directory):
+    python3 -m embark.tests.bench_logparser [lines] [batch size]
+"""
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import re
+import sys
+import time
+
+from pathlib import Path
+
+from embark.logparser import classify_lines
+
+TEST_FILE = Path(__file__).resolve().parent.parent.parent.parent / "test" / "logreader" / "test-run"
+
+
+def legacy_input_processing(new_lines, on_status, on_phase):
+    """
+    the RxPY pipelines as used by LogReader before, two passes with uncompiled patterns
+    """
+    import rx    # pylint: disable=import-outside-toplevel
+    import rx.operators as ops    # pylint: disable=import-outside-toplevel
+
+    status_pattern = "\\[\\*\\]*"
+    phase_pattern = "\\[\\!\\]*"
+    color_pattern = "\\x1b\\[.{1,5}m"
+
+    source_stream = rx.from_iterable(new_lines)
+    source_stream.pipe(
+        ops.map(lambda s: re.sub(color_pattern, '', s)),
+        ops.filter(lambda s: bool(re.match(status_pattern, s))),
+        ops.map(lambda a: a.split("- ")),
+        ops.map(lambda t: t[1]),
+        ops.map(lambda b: b.split(" ")),
+        ops.filter(lambda c: c[1] == 'finished')
+    ).subscribe(on_status)
+    source_stream.pipe(
+        ops.map(lambda s: re.sub(color_pattern, '', s)),
+        ops.filter(lambda u: bool(re.match(phase_pattern, u))),
+        ops.map(lambda v: v.split(" ", 1)),
+        ops.filter(lambda w: w[1])
+    ).subscribe(on_phase)
+
+
+def measure(name, func, batches, line_cnt):
+    start = time.perf_counter()
+    events = func(batches)
+    duration = time.perf_counter() - start
+    print(f"{name:>12}: {line_cnt / duration:14,.0f} lines/s  ({events} events, {duration:.3f}s)")
+    return events
+
+
+def run_classifier(batches):
+    events = 0
+    for batch in batches:
+        for _event in classify_lines(batch):
+            events += 1
+    return events
+
+
+def run_legacy(batches):
+    events = []
+    for batch in batches:
+        legacy_input_processing(batch, events.append, events.append)
+    return len(events)
+
+
+def run(line_cnt, batch_size):
+    with open(TEST_FILE, 'r', encoding='utf-8') as test_file:
+        template = test_file.read().splitlines()
+    lines = (template * (line_cnt // len(template) + 1))[:line_cnt]
+    batches = [lines[i:i + batch_size] for i in range(0, line_cnt, batch_size)]
+    print(f"{line_cnt} lines from {TEST_FILE.name} in batches of {batch_size}")
+
+    measure("classifier", run_classifier, batches, line_cnt)
+    try:
+        measure("rx", run_legacy, batches, line_cnt)
+    except ImportError:
+        print("rx not installed, skipping the legacy pipelines")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000, int(sys.argv[2]) if len(sys.argv) > 2 else 1)
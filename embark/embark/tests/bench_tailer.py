@@ -0,0 +1,78 @@
+"""
+Replays test/logreader/* into a growing emba.log and measures the cost of one MODIFY event
+for the offset based LogTailer and for the old difflib full-file diff.
+
+usage (from the embark directory):
+    python3 -m embark.tests.bench_tailer [replays]
+"""
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import difflib
+import os
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+from embark.tailer import LogTailer
+
+TEST_DIR = Path(__file__).resolve().parent.parent.parent.parent / "test" / "logreader"
+LEGACY_MAX_LINES = 20000    # difflib gets too slow above this
+
+
+def load_replay_lines():
+    lines = []
+    for test_file in sorted(TEST_DIR.iterdir()):
+        with open(test_file, 'r', encoding='utf-8') as log_file:
+            lines.extend(line if line.endswith('\n') else line + '\n' for line in log_file)
+    return lines
+
+
+def legacy_diff(log_file, copy_file):
+    with open(log_file, 'r', encoding='utf-8') as old_file, open(copy_file, 'r', encoding='utf-8') as new_file:
+        diff = difflib.ndiff(old_file.readlines(), new_file.readlines())
+        return ''.join(x[2:] for x in diff if x.startswith('- '))
+
+
+def run(replays):
+    replay_lines = load_replay_lines()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_path = os.path.join(tmp_dir, "emba.log")
+        copy_path = os.path.join(tmp_dir, "logreader.log")
+        open(copy_path, 'x', encoding='utf-8').close()  # pylint: disable=consider-using-with
+        tailer = LogTailer(log_path)
+
+        print(f"{'lines in log':>14} {'tailer us/event':>16} {'difflib us/event':>17}")
+        total_lines = 0
+        with open(log_path, 'a', encoding='utf-8') as log_file:
+            for replay in range(replays):
+                tail_time = 0.0
+                legacy_time = 0.0
+                for line in replay_lines:
+                    # every written line is one MODIFY event
+                    log_file.write(line)
+                    log_file.flush()
+                    total_lines += 1
+
+                    start = time.perf_counter()
+                    tailer.read_lines()
+                    tail_time += time.perf_counter() - start
+
+                    if total_lines <= LEGACY_MAX_LINES:
+                        start = time.perf_counter()
+                        diff = legacy_diff(log_path, copy_path)
+                        with open(copy_path, 'a', encoding='utf-8') as copy_file:
+                            copy_file.write(diff)
+                        legacy_time += time.perf_counter() - start
+
+                if replay % max(1, replays // 10) == 0 or replay == replays - 1:
+                    tail_us = tail_time / len(replay_lines) * 1e6
+                    legacy_us = f"{legacy_time / len(replay_lines) * 1e6:17.1f}" if total_lines <= LEGACY_MAX_LINES else f"{'-':>17}"
+                    print(f"{total_lines:>14} {tail_us:16.1f} {legacy_us}")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -1,61 +1,260 @@
-# __copyright__ = 'Copyright 2023 Christian Bieg'
-# __author__ = 'Christian Bieg'
-# __license__ = 'MIT'
-#
-# import unittest
-#
-# from embark.logviewer import LineCache
-#
-#
-# class TestLineCache(unittest.TestCase):
-#
-#     def test_default(self):
-#         line_cache = LineCache('./test/logviewer/line_cache_test1.log')
-#
-#         for _ in range(0, 2):
-#             self.assertEqual(12, line_cache.num_lines(), 'Incorrect number of lines.')
-#             self.assertEqual(len(line_cache.line_endings), len(line_cache.line_beginnings), 'The number of line beginnings and line endings do not match.')
-#             self.assertEqual([0, 7, 11, 23, 31, 41, 50, 54, 58, 72, 86, 104], line_cache.line_beginnings, 'The line beginning cache is not valid.')
-#             line_cache.refresh()
-#
-#         self.assertEqual(b'10: ggggggggg\n11: hhhhhhhhhhhhh\n', line_cache.read_lines(0, 2), 'The line cache did not return the correct value.')
-#         self.assertEqual(b'9: ffffffffff\n10: ggggggggg\n11: hhhhhhhhhhhhh', line_cache.read_lines(1, 3), 'The line cache did not return the correct value.')
-#
-#     def test_cr_lf(self):
-#         line_cache = LineCache('./test/logviewer/line_cache_test_cr_lf.log')
-#
-#         for _ in range(0, 2):
-#             self.assertEqual(12, line_cache.num_lines(), 'Incorrect number of lines.')
-#             self.assertEqual(len(line_cache.line_endings), len(line_cache.line_beginnings), 'The number of line beginnings and line endings do not match.')
-#             self.assertEqual([0, 7, 10, 22, 30, 40, 49, 52, 55, 69, 83, 102], line_cache.line_beginnings, 'The line beginning cache is not valid.')
-#             line_cache.refresh()
-#
-#         self.assertEqual(b'10: ggggggggg\n11: hhhhhhhhhhhhh\r\n', line_cache.read_lines(0, 2), 'The line cache did not return the correct value.')
-#         self.assertEqual(b'9: ffffffffff\n10: ggggggggg\n11: hhhhhhhhhhhhh', line_cache.read_lines(1, 3), 'The line cache did not return the correct value.')
-#
-#     def test_no_newline_end(self):
-#         line_cache = LineCache('./test/logviewer/line_cache_test_no_newline.log')
-#
-#         for _ in range(0, 2):
-#             self.assertEqual(11, line_cache.num_lines(), 'Incorrect number of lines.')
-#             self.assertEqual(len(line_cache.line_endings), len(line_cache.line_beginnings), 'The number of line beginnings and line endings do not match.')
-#             self.assertEqual([0, 7, 11, 23, 31, 41, 50, 54, 58, 72, 86], line_cache.line_beginnings, 'The line beginning cache is not valid.')
-#             line_cache.refresh()
-#
-#         self.assertEqual(b'9: ffffffffff\n10: ggggggggg\n11: hhhhhhhhhhhhh', line_cache.read_lines(0, 2), 'The line cache did not return the correct value.')
-#         self.assertEqual(b'8: \n9: ffffffffff\n10: ggggggggg', line_cache.read_lines(1, 3), 'The line cache did not return the correct value.')
-#
-#     def test_empty(self):
-#         line_cache = LineCache('./test/logviewer/line_cache_test_empty.log')
-#
-#         for _ in range(0, 2):
-#             self.assertEqual(1, line_cache.num_lines(), 'Incorrect number of lines.')
-#             self.assertEqual(len(line_cache.line_endings), len(line_cache.line_beginnings), 'The number of line beginnings and line endings do not match.')
-#             self.assertEqual([0], line_cache.line_beginnings, 'The line beginning cache is not valid.')
-#             line_cache.refresh()
-#
-#         self.assertEqual(b'', line_cache.read_lines(0, 0), 'The line cache did not return the correct value.')
-#
-#
-# if __name__ == '__main__':
-#     unittest.main()
+__copyright__ = 'Copyright 2023 Christian Bieg, Copyright 2026 Siemens Energy AG'
+__author__ = 'Christian Bieg, Benedikt Kuehne'
+__license__ = 'MIT'
+
+import gzip
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+from embark import logviewer
+from embark.logviewer import GzipLineCache, LineCache, LogSearch, write_line_index
+from uploader.archiver import Archiver
+
+TEST_DIR = Path(__file__).resolve().parent.parent.parent.parent / "test" / "logviewer"
+
+
+class TestLineCache(unittest.TestCase):
+    use_mmap = True
+
+    def open_cache(self, path):
+        return LineCache(path, use_mmap=self.use_mmap)
+
+    def test_default(self):
+        line_cache = self.open_cache(f'{TEST_DIR}/line_cache_test1.log')
+
+        for _ in range(0, 2):
+            self.assertEqual(12, line_cache.num_lines(), 'Incorrect number of lines.')
+            self.assertEqual([0, 7, 11, 23, 31, 41, 50, 54, 58, 72, 86, 104], line_cache.offsets.tolist(), 'The line beginning cache is not valid.')
+            line_cache.refresh()
+
+        self.assertEqual(b'10: ggggggggg\n11: hhhhhhhhhhhhh\n', line_cache.read_lines(0, 2), 'The line cache did not return the correct value.')
+        self.assertEqual(b'9: ffffffffff\n10: ggggggggg\n11: hhhhhhhhhhhhh', line_cache.read_lines(1, 3), 'The line cache did not return the correct value.')
+        line_cache.close()
+
+    def test_cr_lf(self):
+        line_cache = self.open_cache(f'{TEST_DIR}/line_cache_test_cr_lf.log')
+
+        for _ in range(0, 2):
+            self.assertEqual(12, line_cache.num_lines(), 'Incorrect number of lines.')
+            self.assertEqual([0, 7, 10, 22, 30, 40, 49, 52, 55, 69, 83, 102], line_cache.offsets.tolist(), 'The line beginning cache is not valid.')
+            line_cache.refresh()
+
+        self.assertEqual(b'10: ggggggggg\n11: hhhhhhhhhhhhh\r\n', line_cache.read_lines(0, 2), 'The line cache did not return the correct value.')
+        self.assertEqual(b'9: ffffffffff\n10: ggggggggg\n11: hhhhhhhhhhhhh', line_cache.read_lines(1, 3), 'The line cache did not return the correct value.')
+        line_cache.close()
+
+    def test_no_newline_end(self):
+        line_cache = self.open_cache(f'{TEST_DIR}/line_cache_test_no_newline.log')
+
+        for _ in range(0, 2):
+            self.assertEqual(11, line_cache.num_lines(), 'Incorrect number of lines.')
+            self.assertEqual([0, 7, 11, 23, 31, 41, 50, 54, 58, 72, 86], line_cache.offsets.tolist(), 'The line beginning cache is not valid.')
+            line_cache.refresh()
+
+        self.assertEqual(b'9: ffffffffff\n10: ggggggggg\n11: hhhhhhhhhhhhh', line_cache.read_lines(0, 2), 'The line cache did not return the correct value.')
+        self.assertEqual(b'8: \n9: ffffffffff\n10: ggggggggg', line_cache.read_lines(1, 3), 'The line cache did not return the correct value.')
+        line_cache.close()
+
+    def test_empty(self):
+        line_cache = self.open_cache(f'{TEST_DIR}/line_cache_test_empty.log')
+
+        for _ in range(0, 2):
+            self.assertEqual(1, line_cache.num_lines(), 'Incorrect number of lines.')
+            self.assertEqual([0], line_cache.offsets.tolist(), 'The line beginning cache is not valid.')
+            line_cache.refresh()
+
+        self.assertEqual(b'', line_cache.read_lines(0, 0), 'The line cache did not return the correct value.')
+        line_cache.close()
+
+    def test_growing_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "emba_run.log")
+            with open(log_path, 'wb') as log_file:
+                log_file.write(b'first\nsec')
+                log_file.flush()
+                line_cache = self.open_cache(log_path)
+                self.assertEqual(b'sec', line_cache.read_lines(0, 0))
+
+                # the incomplete last line gets extended
+                log_file.write(b'ond\nthird\n')
+                log_file.flush()
+                line_cache.refresh()
+                self.assertEqual([0, 6, 13, 19], line_cache.offsets.tolist())
+                self.assertEqual(b'first\nsecond\nthird\n', line_cache.read_lines(0, 3))
+
+            # truncated files are indexed again, without a mapping from now on
+            with open(log_path, 'wb') as log_file:
+                log_file.write(b'new\n')
+            line_cache.refresh()
+            self.assertEqual([0, 4], line_cache.offsets.tolist())
+            self.assertEqual(b'new', line_cache.read_lines(1, 1))
+            self.assertIsNone(line_cache.mapping)
+            line_cache.close()
+
+    def test_truncated_before_refresh(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "emba_update.log")
+            with open(log_path, 'wb') as log_file:
+                log_file.write(b'a\n' * 5000)
+            line_cache = self.open_cache(log_path)
+            os.truncate(log_path, 10)
+            # the stale index must not read behind the new end
+            self.assertEqual(b'a\na\n', line_cache.read_lines(4995, 4999)[:4])
+            self.assertIsNone(line_cache.mapping)
+            line_cache.close()
+
+
+class TestLineCacheReadPath(TestLineCache):
+    use_mmap = False
+
+
+class TestLineCacheScan(unittest.TestCase):
+
+    def test_large_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "emba_run.log")
+            with open(log_path, 'wb') as log_file:
+                for number in range(100000):
+                    log_file.write(b'x' * (number % 97) + (b'\r\n' if number % 3 else b'\n'))
+                log_file.write(b'partial')
+            caches = [LineCache(log_path), LineCache(log_path, use_mmap=False)]
+            self.assertEqual(caches[0].offsets, caches[1].offsets)
+            self.assertEqual(100001, caches[0].num_lines())
+            self.assertEqual(caches[1].read_lines(0, 100), caches[0].read_lines(0, 100))
+            self.assertEqual(caches[1].read_lines(50000, 50100), caches[0].read_lines(50000, 50100))
+            for line_cache in caches:
+                line_cache.close()
+
+    @unittest.skipIf(logviewer.numpy is None, "numpy not installed")
+    def test_without_numpy(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "emba_run.log")
+            with open(log_path, 'wb') as log_file:
+                log_file.write(b'some log line\n' * 20000)
+            line_cache = LineCache(log_path)
+            with mock.patch.object(logviewer, 'numpy', None):
+                find_cache = LineCache(log_path)
+            self.assertEqual(line_cache.offsets, find_cache.offsets)
+            line_cache.close()
+            find_cache.close()
+
+
+class TestLineIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()    # pylint: disable=consider-using-with
+        self.log_path = os.path.join(self.tmp_dir.name, "emba_run.log")
+        with open(self.log_path, 'wb') as log_file:
+            for number in range(10000):
+                log_file.write(b'x' * (number % 13) + b'\n')
+            log_file.write(b'[*] finished')
+        self.scanned = LineCache(self.log_path, use_index=False)
+
+    def tearDown(self):
+        self.scanned.close()
+        self.tmp_dir.cleanup()
+
+    def test_roundtrip(self):
+        self.assertTrue(write_line_index(self.log_path))
+        line_cache = LineCache(self.log_path)
+        self.assertIsNotNone(line_cache.index_mapping)
+        self.assertEqual(self.scanned.offsets.tolist(), line_cache.offsets.tolist())
+        self.assertEqual(self.scanned.read_lines(0, 50), line_cache.read_lines(0, 50))
+        self.assertEqual(self.scanned.read_lines(5000, 5100), line_cache.read_lines(5000, 5100))
+        line_cache.refresh()
+        self.assertIsNotNone(line_cache.index_mapping)
+        line_cache.close()
+        # an existing index is kept
+        self.assertTrue(write_line_index(self.log_path))
+
+    def test_appended_after_index(self):
+        write_line_index(self.log_path)
+        line_cache = LineCache(self.log_path)
+        with open(self.log_path, 'ab') as log_file:
+            log_file.write(b' again\nnext\n')
+        line_cache.refresh()
+        self.assertIsNone(line_cache.index_mapping)
+        self.assertEqual(b'[*] finished again\nnext\n', line_cache.read_lines(0, 2))
+        line_cache.close()
+        # the index doesn't match anymore
+        line_cache = LineCache(self.log_path)
+        self.assertIsNone(line_cache.index_mapping)
+        self.assertEqual(10003, line_cache.num_lines())
+        line_cache.close()
+
+    def test_stale_index(self):
+        write_line_index(self.log_path)
+        stat = os.stat(self.log_path)
+        os.utime(self.log_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        line_cache = LineCache(self.log_path)
+        self.assertIsNone(line_cache.index_mapping)
+        self.assertEqual(self.scanned.offsets, line_cache.offsets)
+        line_cache.close()
+
+    def test_broken_index(self):
+        write_line_index(self.log_path)
+        index_path = f"{self.log_path}.idx"
+        os.truncate(index_path, os.path.getsize(index_path) - 8)
+        line_cache = LineCache(self.log_path)
+        self.assertIsNone(line_cache.index_mapping)
+        self.assertEqual(self.scanned.offsets, line_cache.offsets)
+        line_cache.close()
+        os.truncate(index_path, 0)
+        line_cache = LineCache(self.log_path)
+        self.assertEqual(self.scanned.offsets, line_cache.offsets)
+        line_cache.close()
+
+    def test_missing_log(self):
+        self.assertFalse(write_line_index(os.path.join(self.tmp_dir.name, "missing.log")))
+
+
+class TestGzipLineCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()    # pylint: disable=consider-using-with
+        self.log_path = os.path.join(self.tmp_dir.name, "emba_run.log")
+        with open(self.log_path, 'wb') as log_file:
+            for number in range(30000):
+                log_file.write(b'[*] S%02d line %d' % (number % 100, number) + (b'\r\n' if number % 7 else b'\n'))
+            log_file.write(b'[*] finished')
+        self.line_cache = LineCache(self.log_path, use_index=False)
+
+    def tearDown(self):
+        self.line_cache.close()
+        self.tmp_dir.cleanup()
+
+    def archive(self):
+        return GzipLineCache(Archiver.gzip_seekable(self.log_path, f"{self.log_path}.gz", chunk_size=8192))
+
+    def test_windows(self):
+        gzip_cache = self.archive()
+        self.assertEqual(self.line_cache.num_lines(), gzip_cache.num_lines())
+        self.assertEqual(self.line_cache.end, gzip_cache.end)
+        for first_line in (0, 1, 29, 5000, 14999, 29970):
+            self.assertEqual(self.line_cache.read_lines(first_line, first_line + 29), gzip_cache.read_lines(first_line, first_line + 29))
+        self.assertEqual(self.line_cache.offsets[12345], gzip_cache.offsets[12345])
+        self.assertEqual(self.line_cache.offsets[-1], gzip_cache.offsets[-1])
+        gzip_cache.close()
+
+    def test_search(self):
+        gzip_cache = self.archive()
+        results = []
+        LogSearch(gzip_cache, "S42 line").run(results.append)
+        self.assertEqual([number for number in range(30000) if number % 100 == 42],
+                         [line for result in results for line in result["lines"]])
+        gzip_cache.close()
+
+    def test_plain_gzip(self):
+        with open(self.log_path, 'rb') as log_file, gzip.open(f"{self.log_path}.gz", 'wb') as archive_file:
+            archive_file.write(log_file.read())
+        gzip_cache = GzipLineCache(f"{self.log_path}.gz")
+        self.assertEqual(self.line_cache.read_lines(100, 120), gzip_cache.read_lines(100, 120))
+        gzip_cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import os
+
+from django.test import TestCase, override_settings
+
+from embark.liveprogress import REDIS_CLIENT, LiveProgress
+from embark.logreader import LogReader
+from embark.logwatcher import log_watcher
+from embark.tests.base import TEST_LOG, AnalysisLogMixin
+from uploader.models import FirmwareAnalysis
+
+
+@override_settings(STATUS_FLUSH_INTERVAL=60, CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class TestLiveProgress(AnalysisLogMixin, TestCase):
+    username = 'live'
+
+    def setUp(self):
+        super().setUp()
+        self.live = LiveProgress(self.analysis.id)
+
+    def tearDown(self):
+        self.live.clear()
+        super().tearDown()
+
+    def db_status(self):
+        return FirmwareAnalysis.objects.get(id=self.analysis.id).status
+
+    def test_updates(self):
+        self.assertEqual(self.analysis.status, self.live.load(self.analysis.status))
+        self.live.replace({**self.analysis.status, "module_list": ["P02"]})
+        self.live.update({"percentage": 12, "last_module": "S20"}, {"module_list": ["S20"], "phase_list": ["Testing"]})
+        status = self.live.load(self.db_status())
+        self.assertEqual(12, status["percentage"])
+        self.assertEqual(["P02", "S20"], status["module_list"])
+        self.assertEqual(["Testing"], status["phase_list"])
+        # the row isn't touched
+        self.assertEqual(0, self.db_status()["percentage"])
+
+    def test_materialize(self):
+        self.live.replace(self.analysis.status)
+        self.live.update({"percentage": 50}, {"module_list": ["S20"]})
+        self.analysis.finished = True
+        with self.assertNumQueries(1):
+            self.live.materialize(self.analysis, {"finished": True}, ["finished"])
+        status = self.db_status()
+        self.assertEqual((50, ["S20"], True), (status["percentage"], status["module_list"], status["finished"]))
+        self.assertFalse(REDIS_CLIENT.exists(self.live.key))
+
+    def test_materialize_stale_instance(self):
+        stale = FirmwareAnalysis.objects.get(id=self.analysis.id)
+        self.analysis.status["percentage"] = 100
+        self.analysis.save(update_fields=["status"])
+        # without a live state the status written by the reader is kept
+        self.live.materialize(stale, {"work": False}, [])
+        self.assertEqual(100, self.db_status()["percentage"])
+
+    def test_reader(self):
+        os.makedirs(self.analysis.path_to_logs)
+        with open(TEST_LOG, 'r', encoding='utf-8') as log_file:
+            lines = log_file.readlines()
+        log_path = f"{self.analysis.path_to_logs}/emba.log"
+        with open(log_path, 'w', encoding='utf-8') as log_file:
+            log_file.writelines(lines[:len(lines) // 2])
+        reader = LogReader(self.analysis.id)
+        # driven by the test instead of the watcher thread
+        log_watcher.unwatch(log_path)
+        reader.status_writer.flush()
+        live_status = self.live.load(self.db_status())
+        self.assertGreater(live_status["percentage"], 0)
+        self.assertEqual(reader.analysis.status["module_list"], live_status["module_list"])
+        self.assertEqual(0, self.db_status()["percentage"])
+
+        with open(log_path, 'a', encoding='utf-8') as log_file:
+            log_file.writelines(lines[len(lines) // 2:])
+        reader.process_new_lines()
+        self.assertTrue(reader.finish)
+        status = self.db_status()
+        self.assertEqual(100, status["percentage"])
+        self.assertEqual(reader.analysis.status["module_list"], status["module_list"])
+        self.assertFalse(REDIS_CLIENT.exists(self.live.key))
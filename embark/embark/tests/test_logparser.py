@@ -0,0 +1,56 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import unittest
+
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from embark.logparser import (
+    EVENT_FAILED, EVENT_MODULE_FINISHED, EVENT_MODULE_STARTED, EVENT_PHASE, EVENT_TEST_ENDED,
+    LogEvent, classify_line, classify_lines, parse_stamp
+)
+
+TEST_DIR = Path(__file__).resolve().parent.parent.parent.parent / "test" / "logreader"
+
+
+class TestLogParser(unittest.TestCase):
+
+    def test_module_lines(self):
+        self.assertEqual(
+            LogEvent(EVENT_MODULE_FINISHED, "P02_firmware_bin_file_check", "Wed May 10 11:18:26 CEST 2023"),
+            classify_line("[*] Wed May 10 11:18:26 CEST 2023 - P02_firmware_bin_file_check finished")
+        )
+        self.assertEqual(EVENT_MODULE_STARTED, classify_line("[*] Wed May 10 11:18:18 CEST 2023 - P02_firmware_bin_file_check starting\n").kind)
+
+    def test_phase_lines(self):
+        event = classify_line("[!] Testing phase started on Wed May 10 11:20:22 CEST 2023\n")
+        self.assertEqual(LogEvent(EVENT_PHASE, "Testing phase started on Wed May 10 11:20:22 CEST 2023", "Wed May 10 11:20:22 CEST 2023"), event)
+        self.assertEqual(EVENT_TEST_ENDED, classify_line("[!] Test ended on Wed May 10 14:41:32 CEST 2023 and took about 03:23:24 ").kind)
+        self.assertEqual(EVENT_FAILED, classify_line("[!] EMBA failed in docker mode!").kind)
+
+    def test_color_codes(self):
+        event = classify_line("\x1b[0;36m[*]\x1b[0m Wed May 10 11:18:26 CEST 2023 - \x1b[1mS05_firmware_details\x1b[0m finished")
+        self.assertEqual(LogEvent(EVENT_MODULE_FINISHED, "S05_firmware_details", "Wed May 10 11:18:26 CEST 2023"), event)
+
+    def test_uninteresting_lines(self):
+        for line in ("", "    Firmware binary path: /firmware", "[*] Open the web-report with firefox /var/www/index.html", "[+] something"):
+            self.assertIsNone(classify_line(line))
+
+    def test_timestamps(self):
+        self.assertEqual(datetime(2023, 5, 10, 11, 18, 26), parse_stamp("Wed May 10 11:18:26 CEST 2023"))
+        self.assertEqual(datetime(2022, 9, 6, 7, 29, 35), parse_stamp("Tue Sep  6 07:29:35 EDT 2022"))
+        self.assertIsNone(parse_stamp("no date"))
+        self.assertIsNone(LogEvent(EVENT_PHASE, "x").timestamp)
+
+    def test_good_log(self):
+        with open(TEST_DIR / "good-log", 'r', encoding='utf-8') as log_file:
+            events = list(classify_lines(log_file))
+        kinds = Counter(event.kind for event in events)
+        self.assertEqual(53, kinds[EVENT_MODULE_FINISHED])
+        self.assertEqual(5, kinds[EVENT_PHASE])
+        self.assertEqual(1, kinds[EVENT_TEST_ENDED])
+        self.assertEqual(EVENT_TEST_ENDED, events[-1].kind)
+        self.assertTrue(all(event.timestamp for event in events))
@@ -0,0 +1,103 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import os
+
+from django.test import TestCase, override_settings
+
+from embark.logreader import LogReader
+from embark.logwatcher import log_watcher
+from embark.tests.base import TEST_LOG, AnalysisLogMixin
+
+
+@override_settings(STATUS_FLUSH_INTERVAL=60, CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class TestLogReaderCheckpoint(AnalysisLogMixin, TestCase):
+    username = 'checkpoint'
+
+    def setUp(self):
+        super().setUp()
+        os.makedirs(self.analysis.path_to_logs)
+        with open(TEST_LOG, 'r', encoding='utf-8') as log_file:
+            self.lines = log_file.readlines()
+
+    def write_log(self, lines):
+        with open(f"{self.analysis.path_to_logs}/emba.log", 'a', encoding='utf-8') as log_file:
+            log_file.writelines(lines)
+
+    def test_resume_after_restart(self):
+        half = len(self.lines) // 2
+        self.write_log(self.lines[:half])
+        reader = LogReader(self.analysis.id)
+        # the first update is written right away, the rest is pending when the "server" dies
+        self.assertTrue(os.path.isfile(reader.checkpoint_path))
+        reader.status_writer.flush()
+        log_watcher.unwatch(reader.log_path)
+        saved_offset = reader.line_offset
+        self.assertEqual(sum(len(line.encode()) for line in self.lines[:half]), saved_offset)
+
+        self.write_log(self.lines[half:])
+        resumed = LogReader(self.analysis.id)
+        self.assertTrue(resumed.finish)
+
+        self.analysis.refresh_from_db()
+        finished_modules = [line.split(" - ")[1].split()[0] for line in self.lines if line.startswith("[*]") and line.rstrip().endswith("finished")]
+        self.assertEqual(100, self.analysis.status["percentage"])
+        self.assertTrue(self.analysis.status["finished"])
+        self.assertEqual(finished_modules, self.analysis.status["module_list"])
+
+    def test_finished_checkpoint(self):
+        self.write_log(self.lines)
+        reader = LogReader(self.analysis.id)
+        self.assertTrue(reader.finish)
+        resumed = LogReader(self.analysis.id)
+        self.assertTrue(resumed.finish)
+        self.assertEqual(100, resumed.analysis.status["percentage"])
+        self.assertEqual(reader.analysis.status["module_list"], resumed.analysis.status["module_list"])
+
+    def rewrite_log(self, lines):
+        # the worker fetch extracts emba.log again, a new file with the same beginning
+        os.remove(f"{self.analysis.path_to_logs}/emba.log")
+        self.write_log(lines)
+
+    def test_rewritten_log(self):
+        half = len(self.lines) // 2
+        self.write_log(self.lines[:half])
+        reader = LogReader(self.analysis.id)
+        # driven by the test, not by the watcher thread
+        log_watcher.unwatch(reader.log_path)
+        modules = list(reader.analysis.status["module_list"])
+        self.rewrite_log(self.lines[:half])
+        reader.process_new_lines()
+        self.assertEqual(modules, reader.analysis.status["module_list"])
+        self.rewrite_log(self.lines)
+        reader.process_new_lines()
+        self.assertTrue(reader.finish)
+        finished_modules = [line.split(" - ")[1].split()[0] for line in self.lines if line.startswith("[*]") and line.rstrip().endswith("finished")]
+        self.assertEqual(finished_modules, reader.analysis.status["module_list"])
+
+    def test_replaced_log(self):
+        half = len(self.lines) // 2
+        self.write_log(self.lines[:half])
+        reader = LogReader(self.analysis.id)
+        # driven by the test, not by the watcher thread
+        log_watcher.unwatch(reader.log_path)
+        self.assertTrue(reader.analysis.status["module_list"])
+        # a different run, only its first line
+        self.rewrite_log(["[*] Other run\n"] * (half + 1))
+        reader.process_new_lines()
+        self.assertEqual([], reader.analysis.status["module_list"])
+        self.assertEqual(0, reader.analysis.status["percentage"])
+
+    def test_resume_rewritten_log(self):
+        half = len(self.lines) // 2
+        self.write_log(self.lines[:half])
+        reader = LogReader(self.analysis.id)
+        reader.status_writer.flush()
+        log_watcher.unwatch(reader.log_path)
+        self.rewrite_log(self.lines)
+        resumed = LogReader(self.analysis.id)
+        self.assertEqual(0, resumed.tailer.restarts)
+        self.assertTrue(resumed.finish)
+        self.analysis.refresh_from_db()
+        self.assertEqual(100, self.analysis.status["percentage"])
@@ -0,0 +1,153 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import asyncio
+import base64
+
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from embark.logviewer import FOLLOW_HEADER, UpdateLogConsumer, log_registry
+from embark.logwatcher import get_async_log_watcher
+from embark.tests.base import TemporaryRootMixin
+
+VIEWERS = 300
+
+
+class LogViewerTestCase(TemporaryRootMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.log_path = f"{self.tmp_dir.name}/emba_update.log"
+        with open(self.log_path, 'w', encoding='utf-8') as log_file:
+            log_file.write("first line\n")
+
+    @staticmethod
+    def content(message):
+        return base64.b64decode(message["file_view"]["content"])
+
+    async def connect_viewer(self):
+        communicator = WebsocketCommunicator(UpdateLogConsumer.as_asgi(), "/ws/logs/update")
+        connected, _subprotocol = await communicator.connect()
+        self.assertTrue(connected)
+        self.assertEqual(b"first line\n", self.content(await communicator.receive_json_from(timeout=10)))
+        return communicator
+
+
+class TestLogRegistry(LogViewerTestCase):
+
+    async def test_shared_viewers(self):
+        viewers = await asyncio.gather(*(self.connect_viewer() for _viewer in range(VIEWERS)))
+        # one index and one watch for all of them
+        self.assertEqual({self.log_path: VIEWERS}, log_registry.stats())
+        watcher = get_async_log_watcher(settings.LOG_FOLLOW_INTERVAL)
+        self.assertEqual(1, len(watcher._callbacks[self.tmp_dir.name]))   # pylint: disable=protected-access
+
+        with open(self.log_path, 'a', encoding='utf-8') as log_file:
+            log_file.write("second line\n")
+        messages = await asyncio.gather(*(viewer.receive_json_from(timeout=10) for viewer in viewers))
+        for message in messages:
+            self.assertEqual(b"first line\nsecond line\n", self.content(message))
+            self.assertEqual(3, message["file_view"]["num_lines"])
+
+        await asyncio.gather(*(viewer.disconnect() for viewer in viewers[1:]))
+        self.assertEqual({self.log_path: 1}, log_registry.stats())
+        await viewers[0].disconnect()
+        self.assertEqual({}, log_registry.stats())
+        self.assertNotIn(self.tmp_dir.name, watcher._callbacks)   # pylint: disable=protected-access
+
+    async def test_missing_log(self):
+        communicator = WebsocketCommunicator(UpdateLogConsumer.as_asgi(), "/ws/logs/update")
+        with override_settings(EMBA_LOG_ROOT=f"{self.tmp_dir.name}/missing"):
+            await communicator.connect()
+            self.assertIn("error", await communicator.receive_json_from())
+        await communicator.disconnect()
+        self.assertEqual({}, log_registry.stats())
+
+
+@override_settings(LOG_FOLLOW_INTERVAL=0.2)
+class TestLogFollow(LogViewerTestCase):
+
+    async def follow(self, lines=30):
+        communicator = await self.connect_viewer()
+        await communicator.send_json_to({"action": "follow", "lines": lines})
+        return communicator
+
+    @staticmethod
+    async def receive_frame(communicator):
+        frame = await communicator.receive_from(timeout=10)
+        first_line, line_count = FOLLOW_HEADER.unpack_from(frame)
+        return first_line, line_count, frame[FOLLOW_HEADER.size:]
+
+    def append(self, content):
+        with open(self.log_path, 'a', encoding='utf-8') as log_file:
+            log_file.write(content)
+
+    async def test_appended_lines(self):
+        communicator = await self.follow()
+        self.assertEqual((0, 1, b"first line\n"), await self.receive_frame(communicator))
+
+        # the incomplete line is sent once it's finished
+        self.append("second ")
+        self.append("line\n")
+        self.assertEqual((1, 1, b"second line\n"), await self.receive_frame(communicator))
+        await communicator.disconnect()
+
+    async def test_coalesced_burst(self):
+        communicator = await self.follow(lines=0)
+        self.assertEqual((1, 0, b""), await self.receive_frame(communicator))
+        for number in range(200):
+            self.append(f"line {number}\n")
+            await asyncio.sleep(0.001)
+
+        received = b""
+        frames = 0
+        next_line = 1
+        while received.count(b"\n") < 200:
+            first_line, line_count, content = await self.receive_frame(communicator)
+            self.assertEqual(next_line, first_line)
+            self.assertEqual(line_count, content.count(b"\n"))
+            next_line += line_count
+            received += content
+            frames += 1
+        self.assertEqual("".join(f"line {number}\n" for number in range(200)).encode(), received)
+        self.assertLess(frames, 20)
+        self.assertTrue(await communicator.receive_nothing(timeout=0.5))
+        await communicator.disconnect()
+
+    @override_settings(LOG_FOLLOW_MAX_FRAME=30)
+    async def test_frame_limit(self):
+        communicator = await self.follow()
+        await self.receive_frame(communicator)
+        self.append("0123456789\n" * 7)
+        lines = 0
+        while lines < 7:
+            first_line, line_count, content = await self.receive_frame(communicator)
+            self.assertEqual(1 + lines, first_line)
+            self.assertLessEqual(len(content), 30)
+            lines += line_count
+        await communicator.disconnect()
+
+    async def test_rewritten_log(self):
+        communicator = await self.follow()
+        await self.receive_frame(communicator)
+        self.append("second line\n")
+        await self.receive_frame(communicator)
+
+        with open(self.log_path, 'w', encoding='utf-8') as log_file:
+            log_file.write("new\n")
+        # the frame doesn't continue at line 2, the client starts over
+        self.assertEqual((0, 1, b"new\n"), await self.receive_frame(communicator))
+        await communicator.disconnect()
+
+    async def test_change_view_stops_following(self):
+        communicator = await self.follow()
+        await self.receive_frame(communicator)
+        await communicator.send_json_to({"action": "change_view", "file_view": {"offset": 0, "limit": 30}})
+        await communicator.receive_json_from(timeout=10)
+        self.append("second line\n")
+        message = await communicator.receive_json_from(timeout=10)
+        self.assertEqual(b"first line\nsecond line\n", self.content(message))
+        await communicator.disconnect()
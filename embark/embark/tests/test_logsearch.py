@@ -0,0 +1,121 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import os
+import re
+import tempfile
+import unittest
+
+from unittest import mock
+
+from embark import logviewer
+from embark.logviewer import LineCache, LogSearch
+from embark.tests.test_logregistry import LogViewerTestCase
+
+LINES = [
+    "[*] Wed May 10 11:18:18 CEST 2023 - P02_firmware_bin_file_check starting",
+    "[+] firmware is a linux filesystem",
+    "[*] Wed May 10 11:19:02 CEST 2023 - P02_firmware_bin_file_check finished",
+    "[*] Wed May 10 11:19:02 CEST 2023 - S20_shell_check starting",
+    "[+] Found shell issue in /usr/bin/s20_helper",
+    "[*] Wed May 10 11:25:40 CEST 2023 - S20_shell_check finished",
+]
+
+
+class TestLogSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()    # pylint: disable=consider-using-with
+        self.log_path = os.path.join(self.tmp_dir.name, "emba_run.log")
+        with open(self.log_path, 'w', encoding='utf-8') as log_file:
+            log_file.write("\n".join(LINES * 1000) + "\n")
+        self.line_cache = LineCache(self.log_path)
+
+    def tearDown(self):
+        self.line_cache.close()
+        self.tmp_dir.cleanup()
+
+    def search(self, pattern, **kwargs):
+        results = []
+        LogSearch(self.line_cache, pattern, **kwargs).run(results.append)
+        self.assertTrue(results[-1]["done"])
+        return results
+
+    @staticmethod
+    def matches(results):
+        return [line for result in results for line in result["lines"]]
+
+    def test_literal(self):
+        lines = self.matches(self.search("S20_shell_check"))
+        self.assertEqual(sorted([3 + 6 * block for block in range(1000)] + [5 + 6 * block for block in range(1000)]), lines)
+
+    def test_ignore_case(self):
+        self.assertEqual(2000, len(self.matches(self.search("s20_SHELL", ignore_case=True))))
+        self.assertEqual(3000, len(self.matches(self.search("s20_(shell|helper)", regex=True, ignore_case=True))))
+
+    def test_regex(self):
+        lines = self.matches(self.search(r"^\[\+\].*/s\d+_helper$", regex=True))
+        self.assertEqual([4 + 6 * block for block in range(1000)], lines)
+
+    def test_one_match_per_line(self):
+        self.assertEqual(6000, len(self.matches(self.search("e"))))
+
+    def test_chunks(self):
+        # results don't depend on the chunk boundaries
+        with mock.patch.object(logviewer, 'SEARCH_CHUNK_SIZE', 100), mock.patch.object(logviewer, 'SEARCH_REPORT_INTERVAL', 0):
+            results = self.search("finished")
+        self.assertGreater(len(results), 100)
+        self.assertEqual(sorted([2 + 6 * block for block in range(1000)] + [5 + 6 * block for block in range(1000)]), self.matches(results))
+        self.assertEqual(self.line_cache.end, results[-1]["scanned"])
+
+    def test_limit(self):
+        with mock.patch.object(logviewer, 'SEARCH_MAX_MATCHES', 10):
+            results = self.search("check")
+        self.assertEqual(10, len(self.matches(results)))
+        self.assertTrue(results[-1]["truncated"])
+
+    def test_cancel(self):
+        search = LogSearch(self.line_cache, "S20")
+        search.cancel()
+        results = []
+        search.run(results.append)
+        self.assertEqual([], self.matches(results))
+        self.assertTrue(results[-1]["cancelled"])
+        self.assertEqual(0, results[-1]["scanned"])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            LogSearch(self.line_cache, "")
+        with self.assertRaises(re.error):
+            LogSearch(self.line_cache, "S20_(", regex=True)
+        # literals are escaped
+        self.assertEqual([], self.matches(self.search("S20_(")))
+
+
+class TestLogSearchConsumer(LogViewerTestCase):
+
+    async def test_search(self):
+        communicator = await self.connect_viewer()
+        with open(self.log_path, 'a', encoding='utf-8') as log_file:
+            log_file.write("\n".join(LINES) + "\n")
+        # searches the indexed part of the log
+        await communicator.receive_json_from(timeout=10)
+        await communicator.send_json_to({"action": "search", "id": 7, "pattern": "s20_shell", "ignore_case": True})
+        lines = []
+        while True:
+            result = (await communicator.receive_json_from(timeout=10))["search"]
+            self.assertEqual(7, result["id"])
+            lines += result["lines"]
+            if result["done"]:
+                break
+        self.assertEqual([4, 6], lines)
+        self.assertEqual(8, result["num_lines"])
+        self.assertFalse(result["cancelled"])
+
+        await communicator.send_json_to({"action": "search", "id": 8, "pattern": "(", "regex": True})
+        result = (await communicator.receive_json_from(timeout=10))["search"]
+        self.assertEqual(8, result["id"])
+        self.assertTrue(result["done"])
+        self.assertIn("error", result)
+        await communicator.disconnect()
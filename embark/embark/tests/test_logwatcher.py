@@ -0,0 +1,149 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import asyncio
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import unittest
+
+from embark.logwatcher import EVENT_CREATED, EVENT_MODIFIED, LogWatcher, get_async_log_watcher
+
+TIMEOUT = 5
+
+
+class TestLogWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()    # pylint: disable=consider-using-with
+        self.log_dir = os.path.join(self.tmp_dir.name, "emba_logs")
+        self.log_path = os.path.join(self.log_dir, "emba.log")
+        self.watcher = LogWatcher()
+        self.events = queue.Queue()
+
+    def tearDown(self):
+        self.watcher.close()
+        self.tmp_dir.cleanup()
+
+    def write(self, path, content):
+        with open(path, 'a', encoding='utf-8') as log_file:
+            log_file.write(content)
+
+    def next_event(self):
+        return self.events.get(timeout=TIMEOUT)
+
+    def test_create_and_modify(self):
+        os.mkdir(self.log_dir)
+        self.watcher.watch(self.log_path, self.events.put)
+        self.write(self.log_path, "[!] Pre-checking phase started\n")
+        self.assertEqual(EVENT_CREATED, self.next_event())
+        self.write(self.log_path, "[*] P02 finished\n")
+        self.assertEqual(EVENT_MODIFIED, self.next_event())
+
+    def test_missing_directory(self):
+        self.watcher.watch(self.log_path, self.events.put)
+        os.mkdir(self.log_dir)
+        self.assertEqual(EVENT_CREATED, self.next_event())
+        self.write(self.log_path, "[!] Pre-checking phase started\n")
+        self.assertIn(self.next_event(), (EVENT_CREATED, EVENT_MODIFIED))
+
+    def test_missing_parent_directories(self):
+        log_path = os.path.join(self.tmp_dir.name, "analysis", "emba_logs", "emba.log")
+        self.watcher.watch(log_path, self.events.put)
+        os.makedirs(os.path.dirname(log_path))
+        self.write(log_path, "[!] Pre-checking phase started\n")
+        self.assertEqual(EVENT_CREATED, self.next_event())
+
+    def test_recreated_directory(self):
+        os.mkdir(self.log_dir)
+        self.watcher.watch(self.log_path, self.events.put)
+        shutil.rmtree(self.log_dir)
+        os.mkdir(self.log_dir)
+        self.write(self.log_path, "[!] Pre-checking phase started\n")
+        self.assertEqual(EVENT_CREATED, self.next_event())
+
+    def test_other_files_ignored(self):
+        os.mkdir(self.log_dir)
+        self.watcher.watch(self.log_path, self.events.put)
+        self.write(os.path.join(self.log_dir, "emba_error.log"), "error\n")
+        with self.assertRaises(queue.Empty):
+            self.events.get(timeout=0.5)
+
+    def test_multiple_files_one_thread(self):
+        other_dir = os.path.join(self.tmp_dir.name, "other")
+        os.mkdir(self.log_dir)
+        os.mkdir(other_dir)
+        other_events = queue.Queue()
+        self.watcher.watch(self.log_path, self.events.put)
+        self.watcher.watch(os.path.join(other_dir, "emba.log"), other_events.put)
+        self.write(self.log_path, "a\n")
+        self.write(os.path.join(other_dir, "emba.log"), "b\n")
+        self.assertEqual(EVENT_CREATED, self.next_event())
+        self.assertEqual(EVENT_CREATED, other_events.get(timeout=TIMEOUT))
+
+    def test_unwatch(self):
+        os.mkdir(self.log_dir)
+        self.watcher.watch(self.log_path, self.events.put)
+        self.watcher.unwatch(self.log_path)
+        self.write(self.log_path, "[!] Pre-checking phase started\n")
+        with self.assertRaises(queue.Empty):
+            self.events.get(timeout=0.5)
+
+
+class TestAsyncLogWatcher(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()    # pylint: disable=consider-using-with
+        self.log_path = os.path.join(self.tmp_dir.name, "emba_run.log")
+        self.watcher = get_async_log_watcher(0.3)
+        self.events = []
+        self.event_threads = set()
+        self.changed = asyncio.Event()
+
+    async def asyncTearDown(self):
+        self.watcher.close()
+        self.tmp_dir.cleanup()
+
+    def on_event(self, event):
+        self.events.append(event)
+        self.event_threads.add(threading.get_ident())
+        self.changed.set()
+
+    def write(self, content):
+        with open(self.log_path, 'a', encoding='utf-8') as log_file:
+            log_file.write(content)
+
+    async def test_events_in_loop(self):
+        self.assertIs(self.watcher, get_async_log_watcher(0.3))
+        self.watcher.watch(self.log_path, self.on_event)
+        await asyncio.sleep(0)
+        self.write("[!] Pre-checking phase started\n")
+        await asyncio.wait_for(self.changed.wait(), TIMEOUT)
+        self.assertEqual([EVENT_CREATED], self.events)
+        self.assertEqual({threading.get_ident()}, self.event_threads)
+
+    async def test_debounced_burst(self):
+        self.write("")
+        self.watcher.watch(self.log_path, self.on_event)
+        await asyncio.sleep(0)
+        for number in range(50):
+            self.write(f"line {number}\n")
+            await asyncio.sleep(0.004)
+        await asyncio.sleep(0.8)
+        # the first write right away, the rest of the burst together after the interval
+        self.assertIn(len(self.events), (1, 2))
+
+    async def test_stop_when_idle(self):
+        self.watcher.watch(self.log_path, self.on_event)
+        self.watcher.unwatch(self.log_path)
+        await asyncio.sleep(0)
+        self.assertIsNone(self.watcher._inotify)   # pylint: disable=protected-access
+        # starts again with the next file
+        self.watcher.watch(self.log_path, self.on_event)
+        await asyncio.sleep(0)
+        self.write("[!] Pre-checking phase started\n")
+        await asyncio.wait_for(self.changed.wait(), TIMEOUT)
+        self.assertEqual([EVENT_CREATED], self.events)
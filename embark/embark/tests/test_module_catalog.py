@@ -0,0 +1,63 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import os
+
+from django.test import SimpleTestCase, override_settings
+
+from embark.helper import EMBA_MODULES_FALLBACK, count_emba_modules, get_emba_module_catalog, invalidate_emba_module_catalog
+from embark.tests.base import TemporaryRootMixin
+
+
+class TestEmbaModuleCatalog(TemporaryRootMixin, SimpleTestCase):
+    root_setting = "EMBA_ROOT"
+
+    def setUp(self):
+        super().setUp()
+        self.modules_dir = os.path.join(self.tmp_dir.name, "modules")
+        os.mkdir(self.modules_dir)
+        for module in ("P02_firmware_bin_file_check.sh", "S05_firmware_details.sh", "S10_binaries_basic_check.sh", "F50_base_aggregator.sh"):
+            self.add_module(module)
+        invalidate_emba_module_catalog()
+
+    def tearDown(self):
+        invalidate_emba_module_catalog()
+        super().tearDown()
+
+    def add_module(self, name, mtime=None):
+        with open(os.path.join(self.modules_dir, name), 'w', encoding='utf-8'):
+            pass
+        if mtime:
+            os.utime(self.modules_dir, (mtime, mtime))
+
+    def test_catalog_counts(self):
+        catalog = get_emba_module_catalog()
+        self.assertEqual((2, 1, 0, 0, 1, 0), catalog.counts)
+        self.assertIn(('p02', 'P02_firmware_bin_file_check'), catalog.modules['P_Modules'])
+        with self.assertRaises(TypeError):
+            catalog.modules['P_Modules'] = ()
+
+    def test_cached_without_check(self):
+        catalog = get_emba_module_catalog()
+        self.add_module("S20_shell_check.sh", mtime=catalog.mtime + 10)
+        self.assertIs(catalog, get_emba_module_catalog())
+
+    def test_mtime_invalidation(self):
+        catalog = get_emba_module_catalog()
+        self.assertIs(catalog, get_emba_module_catalog(check=True))
+        self.add_module("S20_shell_check.sh", mtime=catalog.mtime + 10)
+        self.assertEqual(3, get_emba_module_catalog(check=True).counts[0])
+        self.assertEqual(3, get_emba_module_catalog().counts[0])
+
+    def test_invalidate(self):
+        catalog = get_emba_module_catalog()
+        invalidate_emba_module_catalog()
+        self.assertIsNot(catalog, get_emba_module_catalog())
+
+    def test_fallback(self):
+        with override_settings(EMBA_ROOT=os.path.join(self.tmp_dir.name, "missing")):
+            invalidate_emba_module_catalog()
+            catalog = get_emba_module_catalog()
+        self.assertIsNone(catalog.mtime)
+        self.assertEqual(count_emba_modules(EMBA_MODULES_FALLBACK), catalog.counts)
@@ -0,0 +1,93 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import uuid
+
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase, TestCase
+
+from embark.progress import ProgressEstimator, load_duration_table, record_module_durations
+from uploader.models import FirmwareAnalysis, ModuleDurationStat, ModuleTiming
+
+START = datetime(2023, 5, 10, 11, 18, 18)
+
+
+class TestProgressEstimator(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # one long S-module dominates the runtime
+        self.estimator = ProgressEstimator({
+            "P02_firmware_bin_file_check": (10.0, 1.0),
+            "S10_binaries_basic_check": (10.0, 1.0),
+            "S20_shell_check": (970.0, 1.0),
+            "F50_base_aggregator": (10.0, 1.0),
+            "Q02_openai_question": (500.0, 1.0),
+        })
+
+    def run_module(self, module, start, seconds):
+        self.estimator.module_started(module, START + timedelta(seconds=start))
+        return self.estimator.module_finished(module, START + timedelta(seconds=start + seconds))
+
+    def test_no_history(self):
+        self.assertIsNone(ProgressEstimator({}).estimate())
+
+    def test_weighted(self):
+        self.run_module("P02_firmware_bin_file_check", 0, 10)
+        self.estimator.phase_changed(1)
+        self.run_module("S10_binaries_basic_check", 10, 10)
+        percentage, eta = self.estimator.estimate()
+        # 20 of 1000 seconds are done, not 2 of 4 modules
+        self.assertAlmostEqual(2.0, percentage)
+        self.assertEqual(980, eta)
+
+    def test_running_module(self):
+        self.run_module("P02_firmware_bin_file_check", 0, 10)
+        self.estimator.phase_changed(1)
+        self.estimator.module_started("S20_shell_check", START + timedelta(seconds=10))
+        self.estimator.observe(START + timedelta(seconds=490))
+        percentage, _eta = self.estimator.estimate()
+        self.assertAlmostEqual(49.0, percentage)
+        # overdue modules don't push the progress past their share
+        self.estimator.observe(START + timedelta(seconds=5000))
+        percentage, _eta = self.estimator.estimate()
+        self.assertLess(percentage, 99.0)
+
+    def test_skipped_modules(self):
+        self.run_module("P02_firmware_bin_file_check", 0, 10)
+        # the reporting phase starts without S-modules, they don't count as remaining anymore
+        self.estimator.phase_changed(3)
+        percentage, _eta = self.estimator.estimate()
+        self.assertAlmostEqual(50.0, percentage)
+
+    def test_module_duration(self):
+        started, duration = self.run_module("S10_binaries_basic_check", 5, 42)
+        self.assertEqual(START + timedelta(seconds=5), started)
+        self.assertEqual(42.0, duration)
+        self.assertEqual((None, None), self.estimator.module_finished("S20_shell_check", START))
+
+    def test_state_roundtrip(self):
+        self.run_module("P02_firmware_bin_file_check", 0, 10)
+        self.estimator.module_started("S20_shell_check", START + timedelta(seconds=10))
+        restored = ProgressEstimator(self.estimator.durations)
+        restored.load_dict(self.estimator.to_dict())
+        self.assertEqual(self.estimator.estimate(), restored.estimate())
+
+
+class TestModuleDurations(TestCase):
+
+    def add_analysis(self, durations):
+        analysis = FirmwareAnalysis.objects.create(id=uuid.uuid4())
+        for module, duration in durations.items():
+            ModuleTiming.objects.create(analysis=analysis, module=module, duration=duration)
+        record_module_durations(analysis.id)
+
+    def test_history(self):
+        self.add_analysis({"P02_firmware_bin_file_check": 10, "S20_shell_check": 100})
+        self.add_analysis({"P02_firmware_bin_file_check": 20})
+        self.assertEqual(2, ModuleDurationStat.objects.get(module="P02_firmware_bin_file_check").runs)
+        table = load_duration_table()
+        self.assertEqual((15.0, 1.0), table["P02_firmware_bin_file_check"])
+        self.assertEqual((100.0, 0.5), table["S20_shell_check"])
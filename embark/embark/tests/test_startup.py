@@ -0,0 +1,34 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import importlib
+import sys
+
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from embark import startup
+from uploader.boundedexecutor import BoundedExecutor
+
+
+class TestStartup(SimpleTestCase):
+
+    def test_entry_points(self):
+        for module in ("embark.wsgi", "embark.asgi", "embark.asgi_dev"):
+            with self.subTest(module=module), mock.patch('embark.startup.reconcile_analyses') as reconcile:
+                sys.modules.pop(module, None)
+                importlib.import_module(module)
+                reconcile.assert_called_once_with()
+            sys.modules.pop(module, None)
+
+    def test_once_per_process(self):
+        self.addCleanup(startup._reconciled.clear)    # pylint: disable=protected-access
+        startup._reconciled.clear()    # pylint: disable=protected-access
+        with mock.patch.object(BoundedExecutor, 'reattach_running_analyses') as reattach, \
+                mock.patch.object(BoundedExecutor, 'dispatch_in_thread') as dispatch:
+            startup.reconcile_analyses()
+            startup.reconcile_analyses()
+        reattach.assert_called_once_with()
+        dispatch.assert_called_once_with()
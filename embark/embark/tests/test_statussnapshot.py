@@ -0,0 +1,98 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import json
+import uuid
+
+from channels.testing import WebsocketCommunicator
+from django.test import TestCase, override_settings
+
+from embark.consumers import ProgressConsumer
+from embark.statussnapshot import REDIS_CLIENT, get_status_snapshot, publish_status, snapshot_key
+from uploader.models import FirmwareAnalysis
+from users.models import User
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class TestStatusSnapshot(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username='snapshot')
+        REDIS_CLIENT.delete(snapshot_key(self.user.pk))
+        self.running = self.add_analysis()
+        self.finished = self.add_analysis(finished=True)
+        self.failed = self.add_analysis(failed=True)
+
+    def tearDown(self):
+        REDIS_CLIENT.delete(snapshot_key(self.user.pk))
+        super().tearDown()
+
+    def add_analysis(self, **kwargs):
+        analysis = FirmwareAnalysis.objects.create(id=uuid.uuid4(), user=self.user, **kwargs)
+        analysis.status["analysis"] = str(analysis.id)
+        analysis.save()
+        return analysis
+
+    def snapshot(self):
+        return json.loads(get_status_snapshot(self.user))
+
+    def test_rebuilt_from_db(self):
+        # finished and failed analyses are left out
+        self.assertEqual({str(self.running.id): self.running.status}, self.snapshot())
+        self.assertEqual([str(self.running.id).encode()], REDIS_CLIENT.hkeys(snapshot_key(self.user.pk)))
+
+    def test_published_status(self):
+        self.snapshot()
+        self.running.status["percentage"] = 42
+        publish_status(self.running)
+        with self.assertNumQueries(1):
+            self.assertEqual(42, self.snapshot()[str(self.running.id)]["percentage"])
+
+        # the last delta removes it
+        self.running.status["finished"] = True
+        self.running.save()
+        publish_status(self.running)
+        self.assertEqual({}, self.snapshot())
+
+    def test_finished_elsewhere(self):
+        self.snapshot()
+        FirmwareAnalysis.objects.filter(id=self.running.id).update(finished=True)
+        self.assertEqual({}, self.snapshot())
+        self.assertFalse(REDIS_CLIENT.exists(snapshot_key(self.user.pk)))
+
+    def test_missing_added(self):
+        self.snapshot()
+        # queued, its status was never published
+        queued = self.add_analysis()
+        self.assertEqual({str(self.running.id), str(queued.id)}, set(self.snapshot()))
+        self.assertEqual(2, REDIS_CLIENT.hlen(snapshot_key(self.user.pk)))
+        with self.assertNumQueries(1):
+            self.assertEqual(queued.status, self.snapshot()[str(queued.id)])
+
+    async def test_reload(self):
+        first = WebsocketCommunicator(ProgressConsumer.as_asgi(), "/ws/progress/")
+        first.scope["user"] = self.user
+        second = WebsocketCommunicator(ProgressConsumer.as_asgi(), "/ws/progress/")
+        second.scope["user"] = self.user
+        await first.connect()
+        await second.connect()
+
+        await first.send_to(text_data="Reload")
+        message = await first.receive_json_from(timeout=10)
+        self.assertEqual([str(self.running.id)], list(message))
+        # the snapshot doesn't go to the other sockets of the user
+        self.assertTrue(await second.receive_nothing())
+        await first.disconnect()
+        await second.disconnect()
+
+    def test_finished_on_dashboard(self):
+        self.user.is_superuser = True
+        self.user.save()
+        self.client.force_login(self.user)
+        response = self.client.get('/dashboard/service/')
+        # finished analyses are rendered with the page, the snapshot doesn't have them
+        self.assertEqual([{'analysis': str(self.finished.id), 'firmware_name': 'File unknown'}], response.context['finished'])
+        self.assertContains(response, f'id="Container_{self.finished.id}"')
+        self.assertNotContains(response, f'id="Container_{self.failed.id}"')
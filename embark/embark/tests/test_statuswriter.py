@@ -0,0 +1,65 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from embark.statuswriter import StatusWriter
+
+
+class TestStatusWriter(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.written = threading.Event()
+        self.write_cnt = 0
+
+    def write(self):
+        self.write_cnt += 1
+        self.written.set()
+
+    def test_first_update_written(self):
+        writer = StatusWriter(self.write, interval=60)
+        writer.update()
+        self.assertEqual(1, self.write_cnt)
+
+    def test_updates_coalesced(self):
+        writer = StatusWriter(self.write, interval=60)
+        for _update in range(50):
+            writer.update()
+        self.assertEqual(1, self.write_cnt)
+        self.assertEqual(50, writer.updates)
+        self.assertEqual(49, writer.saved)
+        writer.close()
+        self.assertEqual(2, self.write_cnt)
+        self.assertEqual(48, writer.saved)
+
+    def test_forced_update(self):
+        writer = StatusWriter(self.write, interval=60)
+        writer.update()
+        writer.update()
+        writer.update(force=True)
+        self.assertEqual(2, self.write_cnt)
+        writer.close()
+        self.assertEqual(2, self.write_cnt)
+
+    def test_trailing_write(self):
+        writer = StatusWriter(self.write, interval=0.2)
+        writer.update()
+        self.written.clear()
+        start = time.monotonic()
+        writer.update()
+        writer.update()
+        self.assertTrue(self.written.wait(timeout=5))
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        self.assertEqual(2, self.write_cnt)
+        self.assertEqual(1, writer.saved)
+
+    def test_no_interval(self):
+        writer = StatusWriter(self.write, interval=0)
+        for _update in range(5):
+            writer.update()
+        self.assertEqual(5, self.write_cnt)
@@ -0,0 +1,116 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import os
+import tempfile
+import unittest
+
+from embark.tailer import LogTailer
+
+
+class TestLogTailer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()    # pylint: disable=consider-using-with
+        self.log_path = os.path.join(self.tmp_dir.name, "emba.log")
+        self.tailer = LogTailer(self.log_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, content, mode='a'):
+        with open(self.log_path, mode, encoding='utf-8') as log_file:
+            log_file.write(content)
+
+    def test_missing_file(self):
+        self.assertEqual([], self.tailer.read_lines())
+
+    def test_only_new_lines(self):
+        self.write("[!] Pre-checking phase started\n[*] P02 starting\n")
+        self.assertEqual(["[!] Pre-checking phase started", "[*] P02 starting"], self.tailer.read_lines())
+        self.assertEqual([], self.tailer.read_lines())
+        self.write("[*] P02 finished\n")
+        self.assertEqual(["[*] P02 finished"], self.tailer.read_lines())
+        self.assertEqual(os.path.getsize(self.log_path), self.tailer.offset)
+
+    def test_partial_line(self):
+        self.write("[*] P02 fin")
+        self.assertEqual([], self.tailer.read_lines())
+        self.assertEqual(0, self.tailer.offset)
+        self.write("ished\n[*] P55")
+        self.assertEqual(["[*] P02 finished"], self.tailer.read_lines())
+        self.write(" starting\n")
+        self.assertEqual(["[*] P55 starting"], self.tailer.read_lines())
+
+    def test_truncation(self):
+        self.write("line 1\nline 2\n")
+        self.assertEqual(["line 1", "line 2"], self.tailer.read_lines())
+        self.write("new 1\n", mode='w')
+        self.assertEqual(["new 1"], self.tailer.read_lines())
+
+    def test_rotation(self):
+        self.write("line 1\nline 2\n")
+        self.assertEqual(["line 1", "line 2"], self.tailer.read_lines())
+        os.rename(self.log_path, f"{self.log_path}.1")
+        self.write("rotated 1\nrotated 2\nrotated 3\n", mode='w')
+        self.assertEqual(["rotated 1", "rotated 2", "rotated 3"], self.tailer.read_lines())
+
+    def rewrite(self, content):
+        # like 7z x -y: the old file is deleted, the new one written from the beginning
+        os.remove(self.log_path)
+        self.write(content, mode='w')
+
+    def test_rewrite_same_content(self):
+        self.write("line 1\nline 2\n")
+        self.assertEqual(["line 1", "line 2"], self.tailer.read_lines())
+        self.rewrite("line 1\nli")
+        # not yet as long as the consumed part
+        self.assertEqual([], self.tailer.read_lines())
+        self.rewrite("line 1\nline 2\nline 3\n")
+        self.assertEqual(["line 3"], self.tailer.read_lines())
+        self.assertEqual(0, self.tailer.restarts)
+
+    def test_rewrite_other_content(self):
+        self.write("line 1\nline 2\n")
+        self.tailer.read_lines()
+        self.rewrite("other 1\nother 2\nother 3\n")
+        self.assertEqual(["other 1", "other 2", "other 3"], self.tailer.read_lines())
+        self.assertEqual(1, self.tailer.restarts)
+
+    def test_rewrite_long_log(self):
+        lines = [f"[*] line {number}\n" for number in range(2000)]
+        self.write("".join(lines[:1000]))
+        self.assertEqual(1000, len(self.tailer.read_lines()))
+        self.rewrite("".join(lines))
+        self.assertEqual([line.rstrip() for line in lines[1000:]], self.tailer.read_lines())
+        # a change before the compared tail isn't noticed, one inside is
+        self.rewrite("".join(lines[:1999]) + "[*] changed\n[*] line 2000\n")
+        self.assertEqual(2001, len(self.tailer.read_lines()))
+        self.assertEqual(1, self.tailer.restarts)
+
+    def test_resume_from_offset(self):
+        self.write("line 1\nline 2\n")
+        self.tailer.read_lines()
+        resumed = LogTailer(self.log_path, offset=self.tailer.offset, inode=self.tailer.inode)
+        self.write("line 3\n")
+        self.assertEqual(["line 3"], resumed.read_lines())
+
+    def test_resume_replaced(self):
+        self.write("line 1\nline 2\n")
+        self.tailer.read_lines()
+        resumed = LogTailer(self.log_path, offset=self.tailer.offset, inode=self.tailer.inode,
+                            tail_digest=self.tailer.tail_digest)
+        self.rewrite("line 1\nline 2\nline 3\n")
+        self.assertEqual(["line 3"], resumed.read_lines())
+
+    def test_entries_with_offsets(self):
+        self.write("[!] Pre-checking phase started\r\n[*] P02 starting\n[*] P02 fin")
+        self.assertEqual([(32, "[!] Pre-checking phase started"), (49, "[*] P02 starting")], self.tailer.read_entries())
+        self.write("ished\n")
+        self.assertEqual([(66, "[*] P02 finished")], self.tailer.read_entries())
+        self.assertEqual(66, self.tailer.offset)
+
+
+if __name__ == '__main__':
+    unittest.main()
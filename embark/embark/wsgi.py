@@ -17,3 +17,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'embark.settings.deploy')
 
 application = get_wsgi_application()
+
+from embark.startup import reconcile_analyses  # pylint: disable=wrong-import-position
+
+reconcile_analyses()
@@ -8,7 +8,7 @@ from django.test import TestCase
 from django.test import Client
 
 from users.models import User
-from uploader.models import FirmwareAnalysis, LogZipFile
+from uploader.models import FirmwareAnalysis, LogZipFile, ModuleTiming
 
 
 class TestReporter(TestCase):
@@ -126,3 +126,50 @@ class TestReporter(TestCase):
             '/status_report/invalid_uuid',
         )
         self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
+class TestModuleTimings(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create(username='timer', is_superuser=True)
+        self.client.force_login(self.superuser)
+        self.analysis1 = FirmwareAnalysis.objects.create(user=self.superuser)
+        self.analysis2 = FirmwareAnalysis.objects.create(user=self.superuser)
+        ModuleTiming.objects.bulk_create([
+            ModuleTiming(analysis=self.analysis1, module='S20_shell_check', phase='Testing', duration=300),
+            ModuleTiming(analysis=self.analysis1, module='P02_firmware_bin_file_check', phase='Pre-checking', duration=10),
+            ModuleTiming(analysis=self.analysis2, module='S20_shell_check', phase='Testing', duration=500),
+        ])
+
+    def test_module_timings(self):
+        response = self.client.get('/get_module_timings/')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.json()
+        self.assertEqual(2, data['analyses'])
+        self.assertEqual(810, data['total_seconds'])
+        top = data['modules'][0]
+        self.assertEqual('S20_shell_check', top['module'])
+        self.assertEqual(2, top['runs'])
+        self.assertEqual(400, top['mean'])
+        self.assertAlmostEqual(800 / 810, top['share'])
+        self.assertEqual(1, len(self.client.get('/get_module_timings/?limit=1').json()['modules']))
+
+    def test_module_timeline(self):
+        response = self.client.get(f'/get_module_timeline/{self.analysis1.id}/')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual({'S20_shell_check', 'P02_firmware_bin_file_check'}, {entry['module'] for entry in response.json()['timeline']})
+
+
+class TestResourceUsage(TestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create(username='sampler', is_superuser=True)
+        self.client.force_login(self.superuser)
+        self.analysis = FirmwareAnalysis.objects.create(user=self.superuser, resource_usage={
+            'interval': 15, 'columns': ['seconds', 'cpu_percent'], 'series': [[15, 180]], 'totals': {'cpu_seconds': 27.0}})
+
+    def test_resource_usage(self):
+        response = self.client.get(f'/get_resource_usage/{self.analysis.id}/')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(27.0, response.json()['totals']['cpu_seconds'])
+        self.assertEqual([[15, 180]], response.json()['series'])
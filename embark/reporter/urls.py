@@ -17,6 +17,9 @@ urlpatterns = [
     path('get_load/', views.get_load, name='embark-get-load'),
     path('get_individual_report/<uuid:analysis_id>/', views.get_individual_report, name='embark-get-individual-report'),
     path('get_accumulated_reports/', views.get_accumulated_reports, name='embark-get-accumulated-reports'),
+    path('get_module_timings/', views.get_module_timings, name='embark-get-module-timings'),
+    path('get_module_timeline/<uuid:analysis_id>/', views.get_module_timeline, name='embark-get-module-timeline'),
+    path('get_resource_usage/<uuid:analysis_id>/', views.get_resource_usage, name='embark-get-resource-usage'),
     path('download_zipped/<uuid:analysis_id>/', views.download_zipped, name='embark-download'),
     path('status_report/<uuid:analysis_id>', views.status_report, name='embark-status-report'),
 ]
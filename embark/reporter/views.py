@@ -17,6 +17,7 @@ import codecs
 from uuid import UUID
 
 from django.conf import settings
+from django.db.models import Avg, Count, Max, Sum
 from django.forms import model_to_dict
 from django.shortcuts import redirect, render
 from django.contrib import messages
@@ -26,14 +27,16 @@ from django.contrib.auth.decorators import login_required, permission_required
 from django.views.decorators.http import require_http_methods
 from django.urls import reverse
 from embark.helper import cleanup_charfield, user_is_auth
+from embark.liveprogress import LiveProgress
 from uploader.boundedexecutor import BoundedExecutor
 
-from uploader.models import FirmwareAnalysis, ResourceTimestamp
+from uploader.models import AnalysisQueueEntry, FirmwareAnalysis, ModuleTiming, ResourceTimestamp
 from dashboard.models import Result
 
 from users.decorators import require_api_key
 
 BLOCKSIZE = 1048576     # for codec change
+MODULE_TIMINGS_LIMIT = 25   # default number of modules in the timing report
 
 
 logger = logging.getLogger(__name__)
@@ -307,6 +310,71 @@ def get_accumulated_reports(request):
     return JsonResponse(data=data, status=HTTPStatus.OK)
 
 
+@permission_required("users.reporter_permission", login_url='/')
+@require_http_methods(["GET"])
+@login_required(login_url='/' + settings.LOGIN_URL)
+def get_module_timings(request):
+    """
+    Sends the EMBA modules that dominate the wall time over all analyses
+    Args:
+        request: optional GET parameter limit (number of modules)
+    Returns:
+        data = {
+            'analyses': int,
+            'total_seconds': float,
+            'modules': [{'module': str, 'phase': str, 'runs': int, 'total': float, 'mean': float, 'max': float, 'share': float}, ...]
+        }
+    """
+    try:
+        limit = max(int(request.GET.get('limit', MODULE_TIMINGS_LIMIT)), 1)
+    except ValueError:
+        return JsonResponse(data={'error': 'Bad request'}, status=HTTPStatus.BAD_REQUEST)
+    overall = ModuleTiming.objects.aggregate(total=Sum('duration'), analyses=Count('analysis', distinct=True))
+    total_seconds = overall['total'] or 0.0
+    modules = ModuleTiming.objects.values('module').annotate(
+        runs=Count('id'), total=Sum('duration'), mean=Avg('duration'), max=Max('duration'), phase=Max('phase')
+    ).order_by('-total')[:limit]
+    data = {
+        'analyses': overall['analyses'],
+        'total_seconds': total_seconds,
+        'modules': [dict(module_, share=module_['total'] / total_seconds if total_seconds else 0.0) for module_ in modules],
+    }
+    return JsonResponse(data=data, status=HTTPStatus.OK)
+
+
+@permission_required("users.reporter_permission", login_url='/')
+@require_http_methods(["GET"])
+@login_required(login_url='/' + settings.LOGIN_URL)
+def get_module_timeline(request, analysis_id):
+    """
+    Sends the module timeline (module, phase, start, end, duration) of one analysis
+    """
+    try:
+        analysis = FirmwareAnalysis.objects.get(id=analysis_id)
+    except FirmwareAnalysis.DoesNotExist:
+        return JsonResponse(data={'error': 'Not Found'}, status=HTTPStatus.NOT_FOUND)
+    if not user_is_auth(request.user, analysis.user):
+        return JsonResponse(data={'error': 'Forbidden'}, status=HTTPStatus.FORBIDDEN)
+    timeline = list(analysis.module_timings.order_by('started').values('module', 'phase', 'started', 'finished', 'duration'))
+    return JsonResponse(data={'analysis': str(analysis.id), 'timeline': timeline}, status=HTTPStatus.OK)
+
+
+@permission_required("users.reporter_permission", login_url='/')
+@require_http_methods(["GET"])
+@login_required(login_url='/' + settings.LOGIN_URL)
+def get_resource_usage(request, analysis_id):
+    """
+    Sends the sampled resource usage (totals and time series) of the EMBA processes of one analysis
+    """
+    try:
+        analysis = FirmwareAnalysis.objects.get(id=analysis_id)
+    except FirmwareAnalysis.DoesNotExist:
+        return JsonResponse(data={'error': 'Not Found'}, status=HTTPStatus.NOT_FOUND)
+    if not user_is_auth(request.user, analysis.user):
+        return JsonResponse(data={'error': 'Forbidden'}, status=HTTPStatus.FORBIDDEN)
+    return JsonResponse(data={'analysis': str(analysis.id), **analysis.resource_usage}, status=HTTPStatus.OK)
+
+
 @permission_required("users.reporter_permission", login_url='/')
 @require_http_methods(["GET"])
 @login_required(login_url='/' + settings.LOGIN_URL)
@@ -326,9 +394,12 @@ def download_zipped(request, analysis_id):
         # look for LogZipFile
         if firmware.zip_file:
             logger.debug("searching for file here: %s", firmware.zip_file.file)
+            # zip or tar.zst, see LOG_ARCHIVE_FORMAT
+            extension = ".tar.zst" if firmware.zip_file.file.path.endswith(".tar.zst") else ".zip"
+            content_type = "application/zstd" if extension == ".tar.zst" else "application/zip"
             with open(firmware.zip_file.file.path, 'rb') as requested_log_dir:
-                response = HttpResponse(requested_log_dir.read(), content_type="application/zip")
-                response['Content-Disposition'] = 'inline; filename=' + str(firmware.id) + '.zip'
+                response = HttpResponse(requested_log_dir.read(), content_type=content_type)
+                response['Content-Disposition'] = 'inline; filename=' + str(firmware.id) + extension
                 return response
         logger.error("FirmwareAnalysis with ID: %s does exist, but doesn't have a valid zip in its directory", analysis_id)
         messages.error(request, "Logs couldn't be downloaded")
@@ -427,12 +498,21 @@ def status_report(request, analysis_id):
                 }
                 response_status = HTTPStatus.OK
 
+        # Waiting for a free slot
+        elif (position := AnalysisQueueEntry.position(analysis.id)) is not None:
+            response_data = {
+                "status": "queued",
+                "message": f"Analysis is waiting for a free slot at position {position}.",
+                "position": position,
+            }
+            response_status = HTTPStatus.ACCEPTED
+
         # Running
         elif not analysis.finished:
             response_data = {
                 "status": "running",
                 "message": f"Analysis has been running since {analysis.start_date}.",
-                "completion": f"{analysis.status.get('percentage', 0)}% finished",
+                "completion": f"{LiveProgress(analysis.id).load(analysis.status).get('percentage', 0)}% finished",
             }
             response_status = HTTPStatus.ACCEPTED
 
@@ -217,4 +217,83 @@ get_individual_report().then(function (returnData) {
         let name = row.insertCell(1);
         name.innerHTML = value;
     }
-});
\ No newline at end of file
+});
+
+/**
+ * Gets the sampled cpu, memory, I/O and log growth of the EMBA processes
+ * @returns Promise of the resource usage of the analysis
+ */
+function get_resource_usage() {
+    "use strict";
+    let url = window.location.origin + "/get_resource_usage/" + report_id + "/";
+    return $.getJSON(url);
+}
+
+/**
+ * Plots cpu and memory over the run and lists the totals
+ */
+get_resource_usage().then(function (returnData) {
+    "use strict";
+    if (!returnData.series || returnData.series.length === 0) {
+        return;
+    }
+    let column = function (name) {
+        let index = returnData.columns.indexOf(name);
+        return returnData.series.map(function (point) { return point[index]; });
+    };
+    let resourceChart = new Chart(document.getElementById('resourceUsageChart').getContext('2d'), {
+        type: 'line',
+        data: {
+            labels: column('seconds').map(function (seconds) { return (seconds / 60).toFixed(0); }),
+            datasets: [{
+                label: 'CPU (%)',
+                data: column('cpu_percent'),
+                borderColor: 'rgb(255, 99, 99)',
+                yAxisID: 'cpu'
+            }, {
+                label: 'Memory (MB)',
+                data: column('rss_mb'),
+                borderColor: 'rgb(54, 162, 235)',
+                yAxisID: 'memory'
+            }]
+        },
+        options: {
+            responsive: true,
+            plugins: {
+                title: {
+                    display: true,
+                    text: 'EMBA resource usage (minutes)',
+                    position: 'top',
+                    font: {
+                        size: 24
+                    }
+                }
+            },
+            scales: {
+                cpu: {
+                    type: 'linear',
+                    position: 'left'
+                },
+                memory: {
+                    type: 'linear',
+                    position: 'right'
+                }
+            }
+        }
+    });
+
+    let totals = {
+        "CPU time (min)": (returnData.totals.cpu_seconds / 60).toFixed(1),
+        "Peak memory (MB)": returnData.totals.peak_rss_mb,
+        "Disk read (MB)": returnData.totals.read_mb,
+        "Disk written (MB)": returnData.totals.write_mb,
+        "Logs (MB)": returnData.totals.log_mb,
+        "Peak processes": returnData.totals.peak_processes,
+    };
+    const table = document.getElementById("resource_body");
+    for (const [key, value] of Object.entries(totals)) {
+        let row = table.insertRow();
+        row.insertCell(0).textContent = key;
+        row.insertCell(1).textContent = value;
+    }
+});
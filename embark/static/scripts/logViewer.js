@@ -26,6 +26,16 @@ window.addEventListener(
 
     var logArea = document.getElementById("logArea");
 
+    // follow mode (view at the end of the log): the server pushes appended lines as binary frames
+    var following = false;
+    var followLines = [];
+    var nextLine = 0;
+    var decoder = new TextDecoder();
+
+    // server side search, results are line numbers counted from the beginning of the log
+    var search = { id: 0, lines: [], current: -1, numLines: 0 };
+    var searchStatus = document.getElementById("logSearchStatus");
+
     function onError(evt) {
       console.log("error", evt);
     }
@@ -34,18 +44,91 @@ window.addEventListener(
     var socket = new WebSocket(
       wsStart + location.hostname + wsPort + "/ws/logs/" + analysis_id
     );
+    socket.binaryType = "arraybuffer";
+
+    function showContent(fileContent) {
+      fileContent = fileContent + "\u00a0"; // The nbsp is required in order to preserve trailing newlines
+
+      var ansi_up = new AnsiUp();
+      var coloredFileContent = ansi_up.ansi_to_html(fileContent);
+      logArea.innerHTML = coloredFileContent;
+    }
+
+    function startFollow() {
+      following = true;
+      followLines = [];
+      nextLine = 0;
+      socket.send(
+        JSON.stringify({ action: "follow", lines: window.file_view.limit })
+      );
+    }
+
+    function onFrame(data) {
+      // header: first line number and number of lines (uint32, big endian), then the lines
+      var header = new DataView(data, 0, 8);
+      var firstLine = header.getUint32(0);
+      var lineCount = header.getUint32(4);
+      if (firstLine !== nextLine) {
+        // first frame or rewritten log
+        followLines = [];
+      }
+      var lines = decoder.decode(new Uint8Array(data, 8)).split("\n");
+      lines.pop();
+      followLines = followLines.concat(lines).slice(-window.file_view.limit);
+      nextLine = firstLine + lineCount;
+      window.file_view.num_lines = nextLine + 1;
+      showContent(followLines.join("\n"));
+    }
+
+    function showSearchStatus(result) {
+      if (!searchStatus) {
+        return;
+      }
+      var status = (search.current + 1) + "/" + search.lines.length + (result.truncated ? "+" : "") + " matches";
+      if (result.error) {
+        status = result.error;
+      } else if (!result.done) {
+        status += " (" + Math.floor(result.scanned * 100 / Math.max(result.size, 1)) + "%)";
+      } else if (result.cancelled) {
+        status += " (cancelled)";
+      }
+      searchStatus.textContent = status;
+    }
+
+    function onSearchResult(result) {
+      if (result.id !== search.id) {
+        // results of a replaced search
+        return;
+      }
+      if (result.lines) {
+        search.lines = search.lines.concat(result.lines);
+        search.numLines = result.num_lines;
+      }
+      if (search.current === -1 && search.lines.length > 0) {
+        window.LogControls.next_match(1);
+      }
+      showSearchStatus(result);
+    }
 
     function onMessage(evt) {
+      if (evt.data instanceof ArrayBuffer) {
+        if (following) {
+          onFrame(evt.data);
+        }
+        return;
+      }
       var message = JSON.parse(evt.data);
 
       if (message.file_view) {
         var fileContent = Base64.decode(message.file_view.content); // We cannot use atob because of unicode (see https://stackoverflow.com/questions/30106476/using-javascripts-atob-to-decode-base64-doesnt-properly-decode-utf-8-strings)
-        fileContent = fileContent + "\u00a0"; // The nbsp is required in order to preserve trailing newlines
-
-        var ansi_up = new AnsiUp();
-        var coloredFileContent = ansi_up.ansi_to_html(fileContent);
-        logArea.innerHTML = coloredFileContent;
+        showContent(fileContent);
         window.file_view = message.file_view;
+        if (window.file_view.offset === 0 && !following) {
+          startFollow();
+        }
+      }
+      if (message.search) {
+        onSearchResult(message.search);
       }
     }
 
@@ -58,6 +141,7 @@ window.addEventListener(
     };
 
     function requestUpdate() {
+      following = false;
       var requestView = Object.assign({}, window.file_view);
       requestView.content = "";
       socket.send(
@@ -84,9 +168,39 @@ window.addEventListener(
         }
         requestUpdate();
       },
+      search: function () {
+        var pattern = document.getElementById("logSearch").value;
+        search = { id: search.id + 1, lines: [], current: -1, numLines: 0 };
+        socket.send(
+          JSON.stringify({
+            action: "search",
+            id: search.id,
+            pattern: pattern,
+            regex: document.getElementById("logSearchRegex").checked,
+            ignore_case: document.getElementById("logSearchCase").checked,
+          })
+        );
+        searchStatus.textContent = "searching...";
+      },
+      cancel_search: function () {
+        socket.send(JSON.stringify({ action: "cancel_search" }));
+      },
+      next_match: function (step) {
+        if (search.lines.length === 0) {
+          return;
+        }
+        search.current = (search.current + step + search.lines.length) % search.lines.length;
+        // the view offset counts from the end of the log, the match goes to the middle of the view
+        var offset = search.numLines - 1 - search.lines[search.current] - Math.floor(window.file_view.limit / 2);
+        window.LogControls.set_offset(Math.max(offset, 0));
+        showSearchStatus({ done: true });
+      },
     };
 
     function checkKey(e) {
+      if (e.target.tagName === "INPUT") {
+        return;
+      }
       if (e.shiftKey) {
         if (e.keyCode == "38") {
           // Arrow Up
@@ -0,0 +1,72 @@
+// jshint unused:false
+// ^ this should only be added AFTER successfull check (disables waring for global functions)
+
+/**
+ * Get the modules with the most wall time over all analyses
+ * @returns Promise of the module timing report
+ */
+function get_module_timings() {
+    "use strict";
+    let url = window.location.origin + "/get_module_timings/";
+    return $.getJSON(url);
+}
+
+/**
+ * Fill the table with the module timing report
+ * @param {*} modules list of module timings
+ */
+function fill_module_table(modules) {
+    "use strict";
+    var $body = $("#moduleTimingsTable tbody");
+    $body.empty();
+    for (var i = 0; i < modules.length; i++) {
+        var $row = $('<tr></tr>');
+        $row.append($('<td></td>').text(modules[i].module));
+        $row.append($('<td></td>').text(modules[i].phase));
+        $row.append($('<td></td>').text(modules[i].runs));
+        $row.append($('<td></td>').text((modules[i].mean / 60).toFixed(1)));
+        $row.append($('<td></td>').text((modules[i].max / 60).toFixed(1)));
+        $row.append($('<td></td>').text((modules[i].total / 3600).toFixed(2)));
+        $row.append($('<td></td>').text((modules[i].share * 100).toFixed(1) + '%'));
+        $body.append($row);
+    }
+}
+
+get_module_timings().then(function (returnData) {
+    "use strict";
+    document.getElementById("timedAnalyses").textContent = returnData.analyses;
+    document.getElementById("totalModuleHours").textContent = (returnData.total_seconds / 3600).toFixed(1);
+    fill_module_table(returnData.modules);
+
+    let timingChart = new Chart(document.getElementById('moduleTimingsChart').getContext('2d'), {
+        type: 'bar',
+        data: {
+            labels: returnData.modules.map(function (module) { return module.module; }),
+            datasets: [{
+                label: 'Total runtime (h)',
+                data: returnData.modules.map(function (module) { return module.total / 3600; }),
+                backgroundColor: 'rgba(54, 162, 235, 0.6)',
+                borderColor: 'rgba(54, 162, 235, 1)',
+                borderWidth: 1
+            }]
+        },
+        options: {
+            indexAxis: 'y',
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                title: {
+                    display: true,
+                    text: 'EMBA modules by wall time',
+                    position: 'top',
+                    font: {
+                        size: 24
+                    }
+                },
+                legend: {
+                    display: false
+                }
+            }
+        }
+    });
+});
@@ -5,12 +5,19 @@
  * Update the Progress bar with the percentange of progress made in Analysing the Firmware
  * @param {*} percent Percentage Completed
  * @param {*} cur_ID Current Id of the Container
+ * @param {*} eta Estimated remaining seconds (null if unknown)
  */
- function makeProgress(percent, cur_ID) {
+ function makeProgress(percent, cur_ID, eta) {
     "use strict";
     var rounded = Math.round(percent);
     var id = "#pBar_" + cur_ID;
-    $(id).attr('aria-valuenow', rounded).css('width', rounded + '%').text(rounded + '%');
+    var text = rounded + '%';
+    if (eta !== undefined && eta !== null && rounded < 100) {
+        var hours = Math.floor(eta / 3600);
+        var minutes = Math.ceil((eta % 3600) / 60);
+        text += ' (~' + (hours > 0 ? hours + 'h ' : '') + minutes + 'min left)';
+    }
+    $(id).attr('aria-valuenow', rounded).css('width', rounded + '%').text(text);
 }
 
 /**
@@ -210,7 +217,7 @@ socket.onmessage = function (event) {
                     livelog_module(data[analysis_].module_list, data[analysis_].analysis);
                     livelog_phase(data[analysis_].phase_list, data[analysis_].analysis);
                     // set percentage and other metadata
-                    makeProgress(data[analysis_].percentage, data[analysis_].analysis);
+                    makeProgress(data[analysis_].percentage, data[analysis_].analysis, data[analysis_].eta);
                 }
             } else if (data[analysis_].finished == true ){
                 newContainer.remove();
@@ -220,7 +227,7 @@ socket.onmessage = function (event) {
                 livelog_module(data[analysis_].module_list, data[analysis_].analysis);
                 livelog_phase(data[analysis_].phase_list, data[analysis_].analysis);
                 // set percentage and other metadata
-                makeProgress(data[analysis_].percentage, data[analysis_].analysis);
+                makeProgress(data[analysis_].percentage, data[analysis_].analysis, data[analysis_].eta);
             }
             if (data[analysis_].work == true){
                 set_container_to_work(data[analysis_]);
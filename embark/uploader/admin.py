@@ -4,10 +4,12 @@ __license__ = 'MIT'
 
 from django.contrib import admin
 
-from uploader.models import FirmwareAnalysis, FirmwareFile, Device, Label, Vendor
+from uploader.models import FirmwareAnalysis, FirmwareFile, Device, Label, Vendor, ModuleDurationStat, AnalysisQueueEntry
 
 admin.site.register(FirmwareAnalysis)
 admin.site.register(Device)
 admin.site.register(FirmwareFile)   # TODO write bulk download action
 admin.site.register(Label)
 admin.site.register(Vendor)
+admin.site.register(ModuleDurationStat)
+admin.site.register(AnalysisQueueEntry)
@@ -0,0 +1,202 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import json
+import logging
+import os
+import time
+
+from dataclasses import asdict, dataclass
+
+import psutil
+from django.conf import settings
+from redis import Redis
+from redis.exceptions import RedisError
+
+from embark.statussnapshot import active_analyses
+
+logger = logging.getLogger(__name__)
+
+REDIS_CLIENT = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+
+DECISION_KEY = "ADMISSION_DECISIONS"
+
+ADMIT = "admit"
+QUEUE = "queue"    # lacks resources right now (running analyses, host load), waits and is decided again
+DEFER = "defer"    # can never fit on this host (static limit), refused
+
+MB = 1024 * 1024
+
+
+@dataclass
+class AnalysisCost:
+    """
+    Resources an analysis holds while it runs, disk grows with the firmware (extraction, logs)
+    """
+    cores: int
+    memory_mb: int
+    disk_mb: int
+
+
+# cores, memory and disk per firmware MB of an analysis profile
+COST_PROFILES = {
+    "sbom": (1, 1024, 3),
+    "default": (2, 2048, 10),
+    "emulation": (4, 6144, 20),
+}
+# logs and reports of any analysis
+DISK_BASE_MB = 1024
+
+
+def analysis_profile(analysis):
+    if analysis.sbom_only_test:
+        return "sbom"
+    if analysis.user_emulation_test or analysis.system_emulation_test:
+        return "emulation"
+    return "default"
+
+
+def firmware_size_mb(analysis):
+    try:
+        return analysis.firmware.file.size / MB if analysis.firmware else 0
+    except (OSError, ValueError):
+        # file is gone, counts with the base disk cost only
+        return 0
+
+
+def analysis_cost(analysis):
+    """
+    :param analysis: FirmwareAnalysis with its expert flags
+    :return: AnalysisCost estimated from the profile and the firmware size
+    """
+    cores, memory_mb, disk_factor = COST_PROFILES[analysis_profile(analysis)]
+    return AnalysisCost(cores, memory_mb, int(DISK_BASE_MB + firmware_size_mb(analysis) * disk_factor))
+
+
+def disk_mb(path):
+    """
+    :return: (MB available to unprivileged users, MB size) of the filesystem of path (or its closest existing parent)
+    """
+    while not os.path.exists(path) and os.path.dirname(path) != path:
+        path = os.path.dirname(path)
+    stat = os.statvfs(path)
+    return stat.f_bavail * stat.f_frsize // MB, stat.f_blocks * stat.f_frsize // MB
+
+
+def host_resources():
+    """
+    :return: live cores, memory and disk of the host, disk is the scarcer of the log root and the active firmware dir
+    """
+    memory = psutil.virtual_memory()
+    disks = [disk_mb(settings.EMBA_LOG_ROOT), disk_mb(settings.ACTIVE_FW)]
+    return {
+        "cores": psutil.cpu_count() or 1,
+        "memory_total_mb": memory.total // MB,
+        "memory_available_mb": memory.available // MB,
+        "disk_free_mb": min(free for free, _total in disks),
+        "disk_total_mb": min(total for _free, total in disks),
+    }
+
+
+def slot_count(resources):
+    """
+    Number of default analyses the host carries, capped by ANALYSIS_HOST_SLOTS
+
+    :param resources: host_resources()
+    """
+    cores, memory_mb, _disk = COST_PROFILES["default"]
+    by_cores = resources["cores"] // cores
+    by_memory = (resources["memory_total_mb"] - settings.ADMISSION_MEMORY_RESERVE_MB) // memory_mb
+    return max(1, min(settings.ANALYSIS_HOST_SLOTS, by_cores, by_memory))
+
+
+def running_costs(exclude=None):
+    """
+    :param exclude: id of the analysis being decided on
+    :return: costs of the local analyses that run, queued ones and those on workers don't hold resources here
+    """
+    running = active_analyses().filter(running_on_worker=False, queue_entry__isnull=True).select_related("firmware")
+    if exclude is not None:
+        running = running.exclude(id=exclude)
+    return [analysis_cost(analysis) for analysis in running]
+
+
+def record(decision):
+    """
+    Keeps the last ADMISSION_DECISION_LOG decisions for tuning
+    """
+    logger.info("Admission %s for %s: %s", decision["verdict"], decision["analysis"], decision["reason"])
+    try:
+        with REDIS_CLIENT.pipeline() as pipe:
+            pipe.lpush(DECISION_KEY, json.dumps(decision))
+            pipe.ltrim(DECISION_KEY, 0, settings.ADMISSION_DECISION_LOG - 1)
+            pipe.execute()
+    except RedisError as error:
+        logger.error("Admission decision not recorded: %s", error)
+
+
+def recent_decisions(analysis_id=None):
+    """
+    :param analysis_id: only the decisions of this analysis
+    :return: recorded decisions, newest first
+    """
+    try:
+        decisions = [json.loads(entry) for entry in REDIS_CLIENT.lrange(DECISION_KEY, 0, -1)]
+    except RedisError as error:
+        logger.error("Admission decisions not readable: %s", error)
+        return []
+    if analysis_id is not None:
+        decisions = [decision for decision in decisions if decision["analysis"] == str(analysis_id)]
+    return decisions
+
+
+def decide(analysis):
+    """
+    Admits an analysis if its cost fits into the live headroom of the host and into what the running analyses left over.
+    Without running analyses it runs alone, only its disk has to be free. Missing resources queue it, they depend on
+    the running analyses and the momentary load. It's only deferred if its disk cost exceeds the filesystem itself
+
+    :param analysis: FirmwareAnalysis to be started locally
+    :return: decision dict, also recorded for recent_decisions
+    """
+    cost = analysis_cost(analysis)
+    resources = host_resources()
+    slots = slot_count(resources)
+    running = running_costs(exclude=analysis.id)
+    held = AnalysisCost(*(sum(getattr(item, field) for item in running) for field in ("cores", "memory_mb", "disk_mb")))
+    # running analyses haven't used all of their reservation yet, the smaller headroom counts
+    memory_headroom = min(resources["memory_available_mb"],
+                          resources["memory_total_mb"] - held.memory_mb) - settings.ADMISSION_MEMORY_RESERVE_MB
+    disk_headroom = resources["disk_free_mb"] - held.disk_mb - settings.ADMISSION_DISK_RESERVE_MB
+
+    shortages = []
+    if cost.disk_mb > resources["disk_total_mb"] - settings.ADMISSION_DISK_RESERVE_MB:
+        shortages.append(f"needs {cost.disk_mb} MB disk, the filesystem has {resources['disk_total_mb']} MB")
+        verdict = DEFER
+    else:
+        if running:
+            # an analysis alone on the host gets what there is, the checks only apply next to others
+            if len(running) >= slots:
+                shortages.append(f"{len(running)}/{slots} slots taken")
+            if cost.cores > resources["cores"] - held.cores:
+                shortages.append(f"needs {cost.cores} cores, {resources['cores'] - held.cores} free")
+            if cost.memory_mb > memory_headroom:
+                shortages.append(f"needs {cost.memory_mb} MB memory, {memory_headroom} MB free")
+        if cost.disk_mb > disk_headroom:
+            shortages.append(f"needs {cost.disk_mb} MB disk, {disk_headroom} MB free")
+        verdict = QUEUE if shortages else ADMIT
+    decision = {
+        "analysis": str(analysis.id),
+        "time": time.time(),
+        "verdict": verdict,
+        "reason": ", ".join(shortages) or "fits",
+        "profile": analysis_profile(analysis),
+        "cost": asdict(cost),
+        "held": asdict(held),
+        "running": len(running),
+        "slots": slots,
+        "resources": resources,
+    }
+    record(decision)
+    return decision
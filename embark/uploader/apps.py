@@ -8,3 +8,6 @@ from django.apps import AppConfig
 class UploaderConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'uploader'
+
+    def ready(self):
+        from uploader import checks  # noqa: F401 pylint: disable=import-outside-toplevel,unused-import
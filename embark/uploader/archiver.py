@@ -6,13 +6,46 @@ import builtins
 import gzip
 import logging
 import os
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import re
 import shutil
+import struct
+import tarfile
 import zipfile
+import zlib
+
+from django.conf import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
+# parallel zip writer: files are read and deflated in chunks by a thread pool (zlib releases the GIL),
+# every chunk is primed with the 32k before it and ends on a sync flush, so the chunks concatenate to one deflate stream
+ARCHIVE_CHUNK_SIZE = 4 << 20
+DEFLATE_WINDOW = 32 << 10
+DEFLATE_LEVEL = 6
+# already compressed, stored as they are
+STORED_SUFFIXES = ('.gz', '.tgz', '.zip', '.xz', '.bz2', '.zst', '.7z', '.png', '.jpg', '.jpeg', '.gif', '.svgz', '.woff', '.woff2')
+
+# seekable gzip: independent gzip members of about GZIP_CHUNK_SIZE uncompressed bytes, each ending on a line break,
+# a valid gzip file for every other tool. The sidecar index (<archive>.idx) locates the members.
+GZIP_CHUNK_SIZE = 1 << 20
+GZIP_INDEX_SUFFIX = ".idx"
+GZIP_INDEX_MAGIC = b"EMBAGZX1"
+# magic, uncompressed size, archive size, number of members
+GZIP_INDEX_HEADER = struct.Struct("<8sQQQ")
+# compressed offset, uncompressed offset, number of the first line
+GZIP_INDEX_ENTRY = struct.Struct("<QQQ")
+# decompressed members kept per open file
+GZIP_CACHED_CHUNKS = 8
+
 
 class Archiver:
     """
@@ -67,19 +100,89 @@ class Archiver:
         # with tarfile
 
     @staticmethod
-    def make_zipfile(output_filename, source_dir):
+    def archive_entries(source_dir):
+        """
+        walks a directory for archiving, the top directory is part of the names
+
+            :param source_dir: directory to archive
+            :return: generator of (path, arcname, is_dir), directories before their files
+        """
         relroot = os.path.abspath(os.path.join(source_dir, os.pardir))
-        with zipfile.ZipFile(output_filename, "w", zipfile.ZIP_DEFLATED) as zip_:
-            for root, _dirs, files in os.walk(source_dir):
-                # add directory (needed for empty dirs)
-                zip_.write(root, os.path.relpath(root, relroot))
-                for file in files:
-                    filename = os.path.join(root, file)
-                    if os.path.isfile(filename):  # regular files only
-                        arcname = os.path.join(os.path.relpath(root, relroot), file)
-                        zip_.write(filename, arcname)
+        for root, _dirs, files in os.walk(source_dir):
+            # add directory (needed for empty dirs)
+            yield root, os.path.relpath(root, relroot), True
+            for file in files:
+                filename = os.path.join(root, file)
+                if os.path.isfile(filename):  # regular files only
+                    yield filename, os.path.join(os.path.relpath(root, relroot), file), False
+
+    @staticmethod
+    def make_zipfile(output_filename, source_dir, workers=None):
+        """
+        zips a directory, the files are compressed by a thread pool and written in order
+
+            :param output_filename: zip file to create
+            :param source_dir: directory to archive
+            :param workers: compressing threads, default LOG_ARCHIVE_WORKERS
+
+            :return: output_filename
+        """
+        workers = workers or settings.LOG_ARCHIVE_WORKERS
+        with zipfile.ZipFile(output_filename, "w", zipfile.ZIP_DEFLATED) as zip_, ThreadPoolExecutor(workers, thread_name_prefix="zip") as pool:
+            writer = ZipChunkWriter(zip_)
+            # bounded, at most this many chunks are in memory
+            pending = deque()
+            for path, arcname, is_dir in Archiver.archive_entries(source_dir):
+                if is_dir:
+                    pending.append((None, path, arcname))
+                    continue
+                zinfo = zipfile.ZipInfo.from_file(path, arcname)
+                zinfo.compress_type = zipfile.ZIP_STORED if path.lower().endswith(STORED_SUFFIXES) else zipfile.ZIP_DEFLATED
+                for offset in range(0, max(zinfo.file_size, 1), ARCHIVE_CHUNK_SIZE):
+                    last = offset + ARCHIVE_CHUNK_SIZE >= zinfo.file_size
+                    pending.append((zinfo, offset, pool.submit(read_chunk, path, offset, zinfo.compress_type, last)))
+                    while len(pending) > 2 * workers:
+                        writer.write(*pending.popleft())
+            while pending:
+                writer.write(*pending.popleft())
         return output_filename
 
+    @staticmethod
+    def make_tarzst(output_filename, source_dir, workers=None):
+        """
+        tar.zst of a directory, zstd compresses with its own threads
+
+            :param output_filename: archive to create
+            :param source_dir: directory to archive
+            :param workers: compressing threads, default LOG_ARCHIVE_WORKERS
+
+            :return: output_filename
+        """
+        if zstandard is None:
+            raise ValueError("tar.zst archives need the zstandard package")
+        compressor = zstandard.ZstdCompressor(level=3, threads=workers or settings.LOG_ARCHIVE_WORKERS)
+        with open(output_filename, 'wb') as archive_file, compressor.stream_writer(archive_file) as stream:
+            with tarfile.open(fileobj=stream, mode='w|') as tar:
+                for path, arcname, _dir in Archiver.archive_entries(source_dir):
+                    tar.add(path, arcname, recursive=False)
+        return output_filename
+
+    @staticmethod
+    def make_log_archive(base_name, source_dir):
+        """
+        archives a log directory in LOG_ARCHIVE_FORMAT, zip if tar.zst isn't available
+
+            :param base_name: archive path without extension
+            :param source_dir: directory to archive
+
+            :return: path of the archive
+        """
+        if settings.LOG_ARCHIVE_FORMAT == "tar.zst":
+            if zstandard is not None:
+                return Archiver.make_tarzst(f"{base_name}.tar.zst", source_dir)
+            logger.warning("zstandard is not installed, archiving %s as zip", source_dir)
+        return Archiver.make_zipfile(f"{base_name}.zip", source_dir)
+
     @staticmethod
     def unpack(file_location, extract_dir=None):
         """
@@ -167,21 +270,252 @@ class Archiver:
             logger.error("Error copping firmware to active dir: %s", error)
         return None
 
-    @classmethod
-    def archive_file(file: str, number: int = 1):
+    @staticmethod
+    def archive_file(file: str, number: int = None):
         """
-        archive log file by compressing it with gzip
+        archive log file by compressing it with seekable gzip
 
             :param file: log file to be archived
-            :param number: archive number (used for naming)
+            :param number: archive number (used for naming), the next free number if None
 
             :return: path of archived file on success, None otherwise
         """
         try:
-            archived_file = f"{file}.gz.{number}"
-            with open(file, 'rb') as f_in, gzip.open(archived_file, 'wb') as f_out:
-                shutil.copyfileobj(f_in, f_out)
-            return archived_file
+            if number is None:
+                number = 1
+                while os.path.exists(f"{file}.gz.{number}"):
+                    number += 1
+            return Archiver.gzip_seekable(file, f"{file}.gz.{number}")
         except builtins.Exception as error:
             logger.error("Error archiving log file %s: %s", file, error)
-        return None
\ No newline at end of file
+        return None
+
+    @staticmethod
+    def gzip_seekable(src, dst, chunk_size=GZIP_CHUNK_SIZE):
+        """
+        compresses a log into independent gzip members of whole lines and writes their index next to it
+
+            :param src: log file
+            :param dst: gzip file to create
+            :param chunk_size: uncompressed bytes per member (longer lines make longer members)
+
+            :return: dst
+        """
+        entries = []
+        uncompressed = 0
+        lines = 0
+        with open(src, 'rb') as f_in, open(dst, 'wb') as f_out:
+            rest = b""
+            while True:
+                data = f_in.read(chunk_size)
+                chunk = rest + data
+                if not chunk:
+                    break
+                rest = b""
+                if data:
+                    cut = chunk.rfind(b"\n")
+                    if cut == -1:
+                        # a line longer than the chunk, continue reading
+                        rest = chunk
+                        continue
+                    chunk, rest = chunk[:cut + 1], chunk[cut + 1:]
+                entries.append((f_out.tell(), uncompressed, lines))
+                f_out.write(gzip.compress(chunk, compresslevel=6, mtime=0))
+                uncompressed += len(chunk)
+                lines += chunk.count(b"\n")
+            archive_size = f_out.tell()
+        with open(f"{dst}{GZIP_INDEX_SUFFIX}", 'wb') as index_file:
+            index_file.write(GZIP_INDEX_HEADER.pack(GZIP_INDEX_MAGIC, uncompressed, archive_size, len(entries)))
+            for entry in entries:
+                index_file.write(GZIP_INDEX_ENTRY.pack(*entry))
+        logger.info("Compressed %s to %s in %d members", src, dst, len(entries))
+        return dst
+
+
+def read_chunk(path, offset, compress_type, last):
+    """
+    reads and compresses a chunk of a file (thread pool of Archiver.make_zipfile)
+
+        :param path: file
+        :param offset: start of the chunk
+        :param compress_type: zipfile.ZIP_DEFLATED or zipfile.ZIP_STORED
+        :param last: the chunk ends the file, the deflate stream gets finished
+
+        :return: (raw data, data to write)
+    """
+    with open(path, 'rb') as file_:
+        start = max(offset - DEFLATE_WINDOW, 0)
+        file_.seek(start)
+        window = file_.read(offset - start)
+        data = file_.read(ARCHIVE_CHUNK_SIZE)
+    if compress_type == zipfile.ZIP_STORED:
+        return data, data
+    compressor = zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -15, zdict=window) if window else zlib.compressobj(DEFLATE_LEVEL, zlib.DEFLATED, -15)
+    return data, compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class ZipChunkWriter:
+    """
+    class ZipChunkWriter
+    Writes the compressed chunks of Archiver.make_zipfile into the zip in order.
+    The local header is written first and rewritten with crc and sizes after the last chunk,
+    the same way zipfile does for seekable files. The central directory is left to ZipFile.close
+    """
+
+    def __init__(self, zip_):
+        self.zip_ = zip_
+        self.zinfo = None
+        self.zip64 = False
+        self.crc = 0
+
+    def write(self, zinfo, offset, chunk):
+        """
+        :param zinfo: ZipInfo of the file, None for a directory
+        :param offset: offset of the chunk in the file, path for a directory
+        :param chunk: future of read_chunk, arcname for a directory
+        """
+        if zinfo is None:
+            self.zip_.write(offset, chunk)
+            return
+        data, compressed = chunk.result()
+        zip_file = self.zip_.fp
+        if offset == 0:
+            self.zinfo = zinfo
+            zinfo.header_offset = zip_file.tell()
+            zinfo.compress_size = 0
+            zinfo.CRC = 0
+            self.crc = 0
+            self.zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+            zip_file.write(zinfo.FileHeader(self.zip64))
+        self.crc = zlib.crc32(data, self.crc)
+        zinfo.compress_size += len(compressed)
+        zip_file.write(compressed)
+        if offset + ARCHIVE_CHUNK_SIZE >= zinfo.file_size:
+            self.close_entry()
+
+    def close_entry(self):
+        zinfo = self.zinfo
+        zinfo.CRC = self.crc
+        if not self.zip64 and zinfo.compress_size > zipfile.ZIP64_LIMIT:
+            raise zipfile.LargeZipFile(f"{zinfo.filename} grew beyond the zip64 limit")
+        zip_file = self.zip_.fp
+        end = zip_file.tell()
+        zip_file.seek(zinfo.header_offset)
+        zip_file.write(zinfo.FileHeader(self.zip64))
+        zip_file.seek(end)
+        # pylint: disable=protected-access
+        self.zip_._didModify = True
+        self.zip_.filelist.append(zinfo)
+        self.zip_.NameToInfo[zinfo.filename] = zinfo
+        self.zip_.start_dir = end
+
+
+def load_gzip_index(path):
+    """
+    reads the sidecar index of a seekable gzip file
+
+        :param path: gzip file
+        :return: (uncompressed size, [(compressed offset, uncompressed offset, first line)]) or None if missing or stale
+    """
+    try:
+        with open(f"{path}{GZIP_INDEX_SUFFIX}", 'rb') as index_file:
+            data = index_file.read()
+    except OSError:
+        return None
+    if len(data) < GZIP_INDEX_HEADER.size:
+        return None
+    magic, size, archive_size, count = GZIP_INDEX_HEADER.unpack_from(data)
+    if magic != GZIP_INDEX_MAGIC or archive_size != os.path.getsize(path) or len(data) != GZIP_INDEX_HEADER.size + count * GZIP_INDEX_ENTRY.size:
+        logger.debug("Ignoring stale gzip index of %s", path)
+        return None
+    return size, list(GZIP_INDEX_ENTRY.iter_unpack(data[GZIP_INDEX_HEADER.size:]))
+
+
+class SeekableGzipFile:
+    """
+    class SeekableGzipFile
+    Read only, seekable file object of the uncompressed content of a gzip file.
+    With an index (Archiver.gzip_seekable) only the members covering a read get decompressed,
+    the last GZIP_CACHED_CHUNKS of them are kept.
+    Other gzip files are decompressed as a whole on open.
+    """
+
+    def __init__(self, path):
+        self.name = path
+        self.position = 0
+        self._cache = OrderedDict()
+        # pylint: disable-next=consider-using-with
+        self._file = open(path, 'rb')
+        index = load_gzip_index(path)
+        if index is None:
+            # one chunk for the whole file
+            content = gzip.decompress(self._file.read())
+            self.size = len(content)
+            self._entries = [(0, 0, 0)]
+            self._cache[0] = content
+            self.lines = content.count(b"\n")
+        else:
+            self.size, self._entries = index
+            self.lines = None
+        self._compressed_end = os.fstat(self._file.fileno()).st_size
+        self._starts = [entry[1] for entry in self._entries]
+        self.first_lines = [entry[2] for entry in self._entries]
+        if self.lines is None:
+            # the line count of the last member isn't part of the index
+            self.lines = self.first_lines[-1] + self.chunk(len(self._entries) - 1).count(b"\n") if self._entries else 0
+
+    def chunk(self, number):
+        """
+        :param number: index of the member
+        :return: uncompressed content of the member
+        """
+        content = self._cache.get(number)
+        if content is not None:
+            self._cache.move_to_end(number)
+            return content
+        start = self._entries[number][0]
+        stop = self._entries[number + 1][0] if number + 1 < len(self._entries) else self._compressed_end
+        self._file.seek(start)
+        content = zlib.decompress(self._file.read(stop - start), wbits=31)
+        self._cache[number] = content
+        if len(self._cache) > GZIP_CACHED_CHUNKS:
+            self._cache.popitem(last=False)
+        return content
+
+    def chunk_start(self, number):
+        return self._starts[number]
+
+    def seek(self, position, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            position += self.position
+        elif whence == os.SEEK_END:
+            position += self.size
+        self.position = max(position, 0)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def read(self, size=-1):
+        stop = self.size if size is None or size < 0 else min(self.position + size, self.size)
+        parts = []
+        while self.position < stop:
+            number = bisect_right(self._starts, self.position) - 1
+            content = self.chunk(number)
+            offset = self.position - self._starts[number]
+            part = content[offset:offset + stop - self.position]
+            if not part:
+                break
+            parts.append(part)
+            self.position += len(part)
+        return b"".join(parts)
+
+    def close(self):
+        self._cache.clear()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        self.close()
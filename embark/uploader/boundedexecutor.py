@@ -1,4 +1,4 @@
-# pylint: disable=R1732, C0201, E1129, W1509
+# pylint: disable=R1732, C0201, E1129, W1509, R0904
 __copyright__ = 'Copyright 2021-2026 Siemens Energy AG, Copyright 2021-2025 The AMOS Projects'
 __author__ = 'Benedikt Kuehne, m-1-k-3, ClProsser, Luka Dekanozishvili'
 __license__ = 'MIT'
@@ -7,54 +7,158 @@ import builtins
 import logging
 import os
 import shutil
+import threading
+import time
 from subprocess import Popen, PIPE
 import zipfile
 
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from threading import BoundedSemaphore
+import psutil
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 
 from django.dispatch import receiver
 from django.utils import timezone
 from django.conf import settings
-from django.db import close_old_connections
-from django.core.mail import send_mail
+from django.db import close_old_connections, transaction
 from django.template.loader import render_to_string
+from redis.exceptions import RedisError
 
-from uploader import finish_execution
+from uploader import admission, finish_execution
 from uploader.archiver import Archiver
-from uploader.models import FirmwareAnalysis
+from uploader.leases import SlotLeases
+from uploader.models import AnalysisQueueEntry, FirmwareAnalysis
+from uploader.procsampler import ProcessTreeSampler
+from uploader.runstate import AnalysisClaim, emba_process_alive
 from uploader.settings import get_emba_base_cmd
-from embark.helper import get_size, zip_check
+from embark.liveprogress import LiveProgress
+from embark.logreader import LogReader
+from embark.logviewer import write_line_index
+from embark.statussnapshot import publish_status
+from embark.helper import get_size, invalidate_emba_module_catalog, zip_check
 from porter.models import LogZipFile
 from porter.importer import result_read_in
 from users.models import User
+from users.tasks import queue_mail
 
 logger = logging.getLogger(__name__)
 
-# maximum concurrent running workers
-MAX_WORKERS = 4
-# maximum queue bound
-MAX_QUEUE = MAX_WORKERS
-
-# assign the threadpool max_worker_threads
-executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
-# create semaphore to track queue state
-semaphore = BoundedSemaphore(MAX_QUEUE)
+# job classes, sized by settings.EXECUTOR_POOLS
+ANALYSIS_POOL = "analysis"          # EMBA runs and waiters of reattached runs
+ARCHIVE_POOL = "archive"            # log zipping and imports
+MAINTENANCE_POOL = "maintenance"    # EMBA checks, updates and kills
 
 
 class BoundedException(Exception):
     pass
 
 
+class ExecutorPool:   # pylint: disable=too-many-instance-attributes
+    """
+    class ExecutorPool
+    Thread pool of one job class: at most workers jobs run, queue more wait, everything beyond is rejected
+    Keeps its own counters, see stats
+    """
+
+    def __init__(self, name, workers, queue=0):
+        """
+        :param name: job class
+        :param workers: number of threads
+        :param queue: jobs waiting in memory for a thread
+        """
+        self.name = name
+        self.workers = workers
+        self.limit = workers + queue
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"executor-{name}")
+        # running plus queued jobs
+        self.semaphore = BoundedSemaphore(self.limit)
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.pending = 0
+        self.busy_seconds = 0.0
+
+    def submit(self, function_cmd, *args, **kwargs):
+        """
+        same as concurrent.futures.Executor#submit, but bounded
+
+        :return: future on success, None if the pool is full
+        """
+        if not self.semaphore.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+            logger.info("Executor pool %s full", self.name)
+            return None
+        try:
+            future = self.executor.submit(self._run, function_cmd, *args, **kwargs)
+        except builtins.Exception as exce:
+            logger.error("Executor task could not be submitted to %s", self.name)
+            self.semaphore.release()
+            raise exce
+        with self.lock:
+            self.submitted += 1
+            self.pending += 1
+        future.add_done_callback(self._done)
+        return future
+
+    def _run(self, function_cmd, *args, **kwargs):
+        start = time.monotonic()
+        try:
+            return function_cmd(*args, **kwargs)
+        finally:
+            with self.lock:
+                self.busy_seconds += time.monotonic() - start
+
+    def _done(self, future):
+        with self.lock:
+            self.pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+        self.semaphore.release()
+
+    def stats(self):
+        """
+        :return: limits and counters of the pool
+        """
+        with self.lock:
+            return {
+                "workers": self.workers,
+                "limit": self.limit,
+                "pending": self.pending,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "failed": self.failed,
+                "busy_seconds": round(self.busy_seconds, 3),
+            }
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait)
+
+
+pools = {name: ExecutorPool(name, **config) for name, config in settings.EXECUTOR_POOLS.items()}
+# host wide limit for the analysis pools of all web processes
+analysis_leases = SlotLeases("ANALYSIS_SLOTS", settings.ANALYSIS_HOST_SLOTS, settings.ANALYSIS_SLOT_TTL,
+                             on_reclaim=lambda: BoundedExecutor.dispatch_in_thread())    # pylint: disable=unnecessary-lambda
+
+
 class BoundedExecutor:
     """
     class BoundedExecutor
     This class is a wrapper of ExecuterThreadPool to enable a limited queue
-    Used to handle concurrent emba analysis as well as emba.log analyzer
+    Used to handle concurrent emba analysis (emba.log readers are driven by embark.logwatcher)
+    Local analyses that don't get a slot wait in the AnalysisQueueEntry table
     """
+    # queued analyses the admission control held back are decided again by this timer
+    retry_timer = None
+    retry_lock = threading.Lock()
 
     @classmethod
     def run_emba_cmd(cls, cmd, analysis_id=None, active_analyzer_dir=None):
@@ -72,30 +176,94 @@ class BoundedExecutor:
 
         # get return code to evaluate: 0 = success, 1 = failure,
         # see emba for further information
-        exit_fail = False
+        return_code = None
+        # held until the analysis is finalized, a restarted server only takes over analyses nobody holds
+        with AnalysisClaim(analysis_id):
+            try:
+
+                analysis = FirmwareAnalysis.objects.get(id=analysis_id)
+
+                # The os.setsid() is passed in the argument preexec_fn so it's run after the fork() and before  exec() to run the shell.
+                # attached but synchronous
+                with open(f"{settings.EMBA_LOG_ROOT}/{analysis_id}/emba_run.log", "w+", encoding="utf-8") as file:
+                    proc = Popen(cmd, stdin=PIPE, stdout=file, stderr=file, shell=True, start_new_session=True)   # nosec
+                    # Add proc to FirmwareAnalysis-Object
+                    analysis.pid = proc.pid
+                    analysis.save(update_fields=["pid"])
+                    logger.debug("subprocess got pid %s", proc.pid)
+                    # write into pid file
+                    with open(f"{settings.EMBA_LOG_ROOT}/{analysis_id}/emba_run.pid", "w+", encoding="utf-8") as pid_file:
+                        pid_file.write(str(proc.pid))
+                    sampler = ProcessTreeSampler(proc.pid, f"{settings.EMBA_LOG_ROOT}/{analysis_id}/emba_logs").start()
+                    # wait for completion
+                    proc.communicate()
+                    return_code = proc.wait()
+                    cls.store_resource_usage(analysis_id, sampler)
+            except builtins.Exception as exce:
+                logger.error("run_emba_cmd error: %s", exce)
+
+            cls.finalize_emba_run(cmd, analysis_id, active_analyzer_dir, return_code)
+
+    @classmethod
+    def wait_for_emba(cls, claim, pid, active_analyzer_dir=None):
+        """
+        waits for an EMBA process started by a previous server instance and finalizes the analysis afterwards
+
+        :param claim: acquired AnalysisClaim of the analysis
+        :param pid: pid of the running EMBA process, None if it already terminated
+        :param active_analyzer_dir: active analyzer dir for deletion afterwards
+        """
+        if pid:
+            logger.info("Waiting for EMBA process %s of analysis %s", pid, claim.analysis_id)
+            # the series of the previous server instance is lost, the totals cover the rest of the run
+            sampler = ProcessTreeSampler(pid, f"{settings.EMBA_LOG_ROOT}/{claim.analysis_id}/emba_logs").start()
+            try:
+                psutil.Process(pid).wait()
+            except psutil.NoSuchProcess:
+                pass
+            except builtins.Exception as exce:
+                logger.error("wait_for_emba error: %s", exce)
+            close_old_connections()
+            cls.store_resource_usage(claim.analysis_id, sampler)
+        # not our child, the exit code is gone. finalize_emba_run checks the logs instead
         try:
+            close_old_connections()
+            cls.finalize_emba_run(f"reattached pid {pid}", claim.analysis_id, active_analyzer_dir, return_code=0)
+        finally:
+            claim.release()
 
+    @classmethod
+    def store_resource_usage(cls, analysis_id, sampler):
+        """
+        Stops the sampler of a terminated run and saves the usage on the analysis
+        """
+        try:
+            usage = sampler.stop()
+            FirmwareAnalysis.objects.filter(id=analysis_id).update(resource_usage=usage)
+            logger.info("Resources of analysis %s: %s", analysis_id, usage["totals"])
+        except builtins.Exception as exce:
+            logger.error("Resource usage of %s not stored: %s", analysis_id, exce)
+
+    @classmethod
+    def finalize_emba_run(cls, cmd, analysis_id, active_analyzer_dir=None, return_code=0):
+        """
+        evaluates a terminated EMBA run: imports the results, updates the db entry and sends the emails
+
+        :param cmd: shell command of the run (logging only)
+        :param analysis_id: primary key for firmware entry db identification
+        :param active_analyzer_dir: active analyzer dir for deletion afterwards
+        :param return_code: exit code of EMBA, None if it couldn't be started
+
+        :return:
+        """
+        exit_fail = False
+        analysis = None
+        try:
             analysis = FirmwareAnalysis.objects.get(id=analysis_id)
-            return_code = 0
-
-            # The os.setsid() is passed in the argument preexec_fn so it's run after the fork() and before  exec() to run the shell.
-            # attached but synchronous
-            with open(f"{settings.EMBA_LOG_ROOT}/{analysis_id}/emba_run.log", "w+", encoding="utf-8") as file:
-                proc = Popen(cmd, stdin=PIPE, stdout=file, stderr=file, shell=True, start_new_session=True)   # nosec
-                # Add proc to FirmwareAnalysis-Object
-                analysis.pid = proc.pid
-                analysis.save(update_fields=["pid"])
-                logger.debug("subprocess got pid %s", proc.pid)
-                # write into pid file
-                with open(f"{settings.EMBA_LOG_ROOT}/{analysis_id}/emba_run.pid", "w+", encoding="utf-8") as pid_file:
-                    pid_file.write(str(proc.pid))
-                # wait for completion
-                proc.communicate()
-                return_code = proc.wait()
 
             # success
             logger.info("Success: %s", cmd)
-            logger.info("EMBA returned: %d", return_code)
+            logger.info("EMBA returned: %s", return_code)
             if return_code != 0:
                 raise BoundedException("EMBA has non zero exit-code")
 
@@ -120,7 +288,7 @@ class BoundedExecutor:
                 logger.error("Please check this manually and create a bug report!!")
 
             # take care of cleanup
-            if active_analyzer_dir:
+            if active_analyzer_dir and os.path.isdir(active_analyzer_dir):
                 shutil.rmtree(active_analyzer_dir)
 
         except builtins.Exception as exce:
@@ -128,9 +296,10 @@ class BoundedExecutor:
             logger.error("EMBA run was probably not successful!")
             logger.error("run_emba_cmd error: %s", exce)
             exit_fail = True
-            logger.debug("sending email to admin")
-            admin_email = User.objects.get(name="admin").email
-            send_mail(subject="Failed EMBA run", message=f"analysis {analysis_id} failed @{timezone.now()}", from_email='system@' + settings.DOMAIN, recipient_list=[admin_email])
+            logger.debug("queueing email to admin")
+            # a burst of failures ends up in one digest
+            queue_mail("Failed EMBA run", f"analysis {analysis_id} failed @{timezone.now()}",
+                       User.objects.filter(username="admin").values_list("email", flat=True), digest_key="run_failed")
 
         # finalize db entry
         if analysis:
@@ -139,7 +308,12 @@ class BoundedExecutor:
             analysis.duration = str(analysis.scan_time)
             analysis.finished = True
             analysis.failed = exit_fail
-            analysis.save(update_fields=["end_date", "scan_time", "duration", "finished", "failed"])
+            # the reader materialized the status at the end of the log, otherwise the live progress is written now
+            LiveProgress(analysis.id).materialize(analysis, {}, ["end_date", "scan_time", "duration", "finished", "failed"])
+            publish_status(analysis)
+
+        # the log doesn't change anymore, later log viewers map the index instead of scanning it
+        write_line_index(f"{settings.EMBA_LOG_ROOT}/{analysis_id}/emba_run.log")
 
         if settings.EMAIL_ACTIVE is True:
             logger.debug("SEnding email with result")
@@ -158,7 +332,8 @@ class BoundedExecutor:
                     'domain': domain,
                     'analysis_id': analysis_id
                 })
-            send_mail(mail_subject, message, 'system@' + settings.DOMAIN, [user.email])
+            # sent by the outbox dispatcher, a slow mail server doesn't hold the analysis slot
+            queue_mail(mail_subject, message, [user.email])
 
         logger.info("Successful cleaned up: %s", cmd)
 
@@ -189,54 +364,251 @@ class BoundedExecutor:
     @classmethod
     def submit_kill(cls, uuid):
         # submit command to executor threadpool
-        emba_fut = BoundedExecutor.submit(cls.kill_emba_cmd, uuid)
+        emba_fut = BoundedExecutor.submit(cls.kill_emba_cmd, uuid, pool=MAINTENANCE_POOL)
         analysis = FirmwareAnalysis.objects.get(id=uuid)
-        analysis.status['finished'] = True
         analysis.failed = True
         analysis.finished = True
-        analysis.save(update_fields=["status", "finished", "failed"])
+        LiveProgress(analysis.id).materialize(analysis, {'finished': True}, ["finished", "failed"])
+        publish_status(analysis)
         return emba_fut
 
     @classmethod
-    def submit(cls, function_cmd, *args, **kwargs):
+    def submit(cls, function_cmd, *args, pool=ANALYSIS_POOL, **kwargs):
         """
         same as concurrent.futures.Executor#submit, but with queue
 
         params: see concurrent.futures.Executor#submit
+        :param pool: job class, the pools are separate so bookkeeping jobs don't block analyses
 
         return: future on success, None on full queue
         """
 
-        logger.info("submit fn: %s", function_cmd)
-        logger.info("submit cls: %s", cls)
+        logger.info("submit fn: %s to %s", function_cmd, pool)
 
-        # check if semaphore can be acquired, if not queue is full
-        queue_not_full = semaphore.acquire(blocking=False)
-        if not queue_not_full:
-            logger.error("Executor queue full")
+        if pool != ANALYSIS_POOL:
+            return pools[pool].submit(function_cmd, *args, **kwargs)
+        # analyses need a host wide slot besides the thread of this process
+        lease = analysis_leases.acquire()
+        if lease is None:
+            logger.info("All %d analysis slots of the host are taken", analysis_leases.limit)
             return None
+        future = pools[pool].submit(function_cmd, *args, **kwargs)
+        if future is None:
+            analysis_leases.release(lease)
+            return None
+        future.add_done_callback(partial(cls.release_slot, lease))
+        return future
+
+    @classmethod
+    def stats(cls):
+        """
+        :return: {job class: limits and counters}
+        """
+        stats = {name: pool.stats() for name, pool in pools.items()}
         try:
-            future = executor.submit(function_cmd, *args, **kwargs)
+            stats[ANALYSIS_POOL]["host_slots"] = f"{analysis_leases.in_use()}/{analysis_leases.limit}"
+        except RedisError as error:
+            logger.error("Host analysis slots unknown: %s", error)
+        return stats
+
+    @classmethod
+    def release_slot(cls, lease, _future):
+        """
+        Done callback of the analysis futures, the free slot goes to the longest waiting analysis
+        The waiting analysis might belong to another web process, the queue is shared
+        """
+        analysis_leases.release(lease)
+        cls.dispatch_in_thread()
+
+    @classmethod
+    def dispatch_in_thread(cls):
+        """
+        dispatch_waiting for callbacks and the lease heartbeat, outside of a request
+        """
+        try:
+            if AnalysisQueueEntry.objects.exists():
+                cls.dispatch_waiting()
         except builtins.Exception as exce:
-            logger.error("Executor task could not be submitted")
-            semaphore.release()
-            raise exce
-        future.add_done_callback(lambda x: semaphore.release())
-        return future
+            logger.error("Dispatching waiting analyses failed: %s", exce)
+        finally:
+            close_old_connections()
+
+    @classmethod
+    def submit_analysis(cls, emba_cmd, analysis_id, active_analyzer_dir):
+        """
+        Starts a local analysis or queues it until a slot is free, analyses that wait already go first
+
+        :param emba_cmd: shell command to be executed
+        :param analysis_id: primary key for firmware entry db identification
+        :param active_analyzer_dir: active analyzer dir for deletion afterwards
+
+        :return: future if it got started, AnalysisQueueEntry if it waits, None if the host lacks the resources
+        """
+        analysis = FirmwareAnalysis.objects.select_related("firmware").get(id=analysis_id)
+        decision = admission.decide(analysis)
+        if decision["verdict"] == admission.DEFER:
+            cls.refuse(analysis, active_analyzer_dir)
+            return None
+        if decision["verdict"] == admission.ADMIT and not AnalysisQueueEntry.objects.exists():
+            emba_fut = cls.submit(cls.run_emba_cmd, emba_cmd, analysis_id, active_analyzer_dir)
+            if emba_fut:
+                LogReader(analysis_id)
+                return emba_fut
+        entry = AnalysisQueueEntry.objects.create(analysis_id=analysis_id, emba_cmd=emba_cmd, active_analyzer_dir=active_analyzer_dir)
+        logger.info("Executor full, analysis %s waits at position %s", analysis_id, AnalysisQueueEntry.position(analysis_id))
+        # a slot might have been released while the entry was written
+        cls.dispatch_waiting()
+        return entry
+
+    @classmethod
+    def dispatch_waiting(cls):
+        """
+        Starts waiting analyses in queue order while there are free slots
+        Called when a slot is released and at startup, the queue is in the db and survives restarts.
+        The head entry is locked while it's decided on and only deleted once its run got submitted,
+        concurrent dispatchers (threads or processes) skip it. If anything fails the entry stays in place
+        """
+        while True:
+            with transaction.atomic():
+                entry = AnalysisQueueEntry.objects.select_for_update(skip_locked=True).select_related("analysis").first()
+                if entry is None:
+                    return
+                decision = admission.decide(entry.analysis)
+                if decision["verdict"] == admission.DEFER:
+                    # would block the queue for good
+                    entry.delete()
+                    cls.refuse(entry.analysis, entry.active_analyzer_dir)
+                    continue
+                if decision["verdict"] == admission.QUEUE:
+                    # the host load might be the reason, nothing else triggers a dispatch then
+                    cls.retry_dispatch()
+                    return
+                try:
+                    emba_fut = cls.submit(cls.run_emba_cmd, entry.emba_cmd, entry.analysis_id, entry.active_analyzer_dir)
+                except builtins.Exception as exce:
+                    # executor shut down, the next start dispatches it
+                    logger.error("Queued analysis %s not submitted: %s", entry.analysis_id, exce)
+                    return
+                if not emba_fut:
+                    # no slot, it keeps its place
+                    return
+                entry.delete()
+            logger.info("Started queued analysis %s", entry.analysis_id)
+            LogReader(entry.analysis_id)
+
+    @classmethod
+    def retry_dispatch(cls):
+        """
+        Dispatches again after ADMISSION_RETRY_INTERVAL seconds, one pending retry per process
+        """
+        with cls.retry_lock:
+            if cls.retry_timer is not None and cls.retry_timer.is_alive():
+                return
+            cls.retry_timer = threading.Timer(settings.ADMISSION_RETRY_INTERVAL, cls.dispatch_in_thread)
+            cls.retry_timer.daemon = True
+            cls.retry_timer.start()
+
+    @classmethod
+    def cancel_waiting(cls, analysis_id):
+        """
+        Removes an analysis from the queue and marks it failed
+
+        :return: True if it was waiting
+        """
+        if not AnalysisQueueEntry.objects.filter(analysis_id=analysis_id).delete()[0]:
+            return False
+        cls.mark_failed(FirmwareAnalysis.objects.get(id=analysis_id))
+        return True
+
+    @classmethod
+    def refuse(cls, analysis, active_analyzer_dir):
+        """
+        Drops an analysis the admission control deferred, the decision log has the reason
+        """
+        logger.warning("Analysis %s refused, it never fits on the host", analysis.id)
+        shutil.rmtree(active_analyzer_dir, ignore_errors=True)
+        cls.mark_failed(analysis)
+
+    @classmethod
+    def mark_failed(cls, analysis):
+        analysis.failed = True
+        analysis.finished = True
+        LiveProgress(analysis.id).materialize(analysis, {'finished': True}, ["finished", "failed"])
+        publish_status(analysis)
 
     @classmethod
     def shutdown(cls, wait=True):
         """See concurrent.futures.Executor#shutdown"""
-        logger.info("shutting down Boundedexecutor")
-        executor.shutdown(wait)
-        # set all running analysis to failed
-        running_analysis_list = FirmwareAnalysis.objects.filter(finished=False).exclude(failed=True)
+        logger.info("shutting down Boundedexecutor: %s", cls.stats())
+        for pool in pools.values():
+            pool.shutdown(wait)
+        analysis_leases.stop()
+        # set all running analysis to failed, except local EMBA runs that keep running without us
+        # waiting analyses stay queued for the next start
+        running_analysis_list = FirmwareAnalysis.objects.filter(finished=False, queue_entry__isnull=True).exclude(failed=True)
         for analysis_ in running_analysis_list:
+            if not analysis_.running_on_worker and emba_process_alive(analysis_):
+                logger.info("EMBA of %s is still running, the next server start reattaches to it", analysis_.id)
+                continue
             analysis_.failed = True
             analysis_.finished = True
             analysis_.save(update_fields=["finished", "failed"])
         logger.info("Shutdown successful")
 
+    @classmethod
+    def reattach_running_analyses(cls):
+        """
+        Startup reconciliation for local analyses a previous server instance didn't finalize
+        Running EMBA processes get a LogReader (resuming from its checkpoint) and a waiter for the finalization,
+        terminated ones are finalized right away. Analyses claimed by a living process are left alone.
+        """
+        try:
+            unfinished_analyses = FirmwareAnalysis.objects.filter(finished=False, failed=False, running_on_worker=False, pid__isnull=False).exclude(status__work=True)
+            for analysis_ in unfinished_analyses:
+                claim = AnalysisClaim(analysis_.id)
+                if not claim.acquire():
+                    continue
+                pid = analysis_.pid if emba_process_alive(analysis_) else None
+                if pid:
+                    logger.info("Reattaching to EMBA process %s of analysis %s", pid, analysis_.id)
+                else:
+                    logger.info("EMBA of analysis %s terminated while nobody was watching", analysis_.id)
+                # catches up with the log from the last checkpoint
+                LogReader(analysis_.id)
+                active_analyzer_dir = f"{settings.ACTIVE_FW}/{analysis_.id}/"
+                cls.submit_reattached(claim, pid, active_analyzer_dir)
+        except builtins.Exception as exce:
+            logger.error("Reattaching running analyses failed: %s", exce)
+
+    @classmethod
+    def submit_reattached(cls, claim, pid, active_analyzer_dir):
+        """
+        Starts wait_for_emba for a reattached analysis. Its EMBA process runs already, so it takes a host wide slot
+        even if all are taken and the other analyses wait until it's done.
+        A full pool of this process gets an own thread, that one holds the slot as well
+
+        :return: future or thread of the waiter
+        """
+        lease = analysis_leases.acquire(force=True)
+        waiter = pools[ANALYSIS_POOL].submit(cls.wait_for_emba, claim, pid, active_analyzer_dir)
+        if waiter is not None:
+            waiter.add_done_callback(partial(cls.release_slot, lease))
+            return waiter
+        logger.info("Executor pool %s full, waiting for analysis %s in an own thread", ANALYSIS_POOL, claim.analysis_id)
+        waiter = threading.Thread(target=cls.run_leased, args=(lease, cls.wait_for_emba, claim, pid, active_analyzer_dir), daemon=True)
+        waiter.start()
+        return waiter
+
+    @classmethod
+    def run_leased(cls, lease, function_cmd, *args):
+        """
+        Runs function_cmd and gives its host wide slot back afterwards, like release_slot does for the futures
+        """
+        try:
+            function_cmd(*args)
+        finally:
+            cls.release_slot(lease, None)
+
     @classmethod
     def csv_read(cls, analysis_id, _path, _cmd):
         """
@@ -252,42 +624,26 @@ class BoundedExecutor:
         """
         logger.debug("Zipping ID: %s", analysis_id)
         analysis = FirmwareAnalysis.objects.get(id=analysis_id)
-        analysis.finished = False
-        analysis.status['finished'] = False
-        analysis.status['work'] = True
-        analysis.status['last_update'] = str(timezone.now())
-        analysis.status['last_phase'] = "Started zipping"
-        analysis.save()
+        # the row is written once at the end, the dashboards get the working state from the live progress
+        live = LiveProgress(analysis_id)
+        working = {'finished': False, 'work': True, 'last_update': str(timezone.now()), 'last_phase': "Started zipping"}
+        live.update(working)
+        analysis.status = live.load(analysis.status)
 
-        room_group_name = f"services_{analysis.user}"
-        channel_layer = get_channel_layer()
         # send ws message
-        async_to_sync(channel_layer.group_send)(
-            room_group_name, {
-                "type": 'send.message',
-                "message": {str(analysis.id): analysis.status}
-            }
-        )
+        publish_status(analysis)
         try:
-            archive = Archiver.make_zipfile(f"{settings.MEDIA_ROOT}/log_zip/{analysis_id}.zip", analysis.path_to_logs)
+            archive = Archiver.make_log_archive(f"{settings.MEDIA_ROOT}/log_zip/{analysis_id}", analysis.path_to_logs)
 
             # create a LogZipFile obj
             analysis.zip_file = LogZipFile.objects.create(file=archive, user=analysis.user)
         except builtins.Exception as exce:
             logger.error("Zipping failed: %s", exce)
         analysis.finished = True
-        analysis.status['finished'] = True
-        analysis.status['work'] = False
-        analysis.status['last_update'] = str(timezone.now())
-        analysis.status['last_phase'] = "Finished Zipping"
-        analysis.save()
+        done = {'finished': True, 'work': False, 'last_update': str(timezone.now()), 'last_phase': "Finished Zipping"}
+        live.materialize(analysis, done, ["finished", "zip_file"])
         # send ws message
-        async_to_sync(channel_layer.group_send)(
-            room_group_name, {
-                "type": 'send.message',
-                "message": {str(analysis.id): analysis.status}
-            }
-        )
+        publish_status(analysis)
 
     @classmethod
     def unzip_log(cls, analysis_id, file_loc):
@@ -407,6 +763,8 @@ class BoundedExecutor:
                     logger.info("Git pull Successful: %s", cmd)
                     if return_code != 0:
                         raise BoundedException("Git has non zero exit-code")
+                    # modules might have been added or removed
+                    invalidate_emba_module_catalog()
                 except (BaseException, BoundedException) as exce:
                     logger.error("emba update error: %s", exce)
         # src
@@ -466,31 +824,31 @@ class BoundedExecutor:
     @classmethod
     def submit_zip(cls, uuid):
         # submit zip req to executor threadpool
-        emba_fut = BoundedExecutor.submit(cls.zip_log, uuid)
+        emba_fut = BoundedExecutor.submit(cls.zip_log, uuid, pool=ARCHIVE_POOL)
         return emba_fut
 
     @classmethod
     def submit_unzip(cls, uuid, file_loc):
         # submit zip req to executor threadpool
-        emba_fut = BoundedExecutor.submit(cls.unzip_log, uuid, file_loc)
+        emba_fut = BoundedExecutor.submit(cls.unzip_log, uuid, file_loc, pool=ARCHIVE_POOL)
         return emba_fut
 
     @classmethod
     def submit_emba_check(cls, option):
         # submit dep check to executor threadpool
-        emba_fut = BoundedExecutor.submit(cls.emba_check, option)
+        emba_fut = BoundedExecutor.submit(cls.emba_check, option, pool=MAINTENANCE_POOL)
         return emba_fut
 
     @classmethod
     def submit_emba_update(cls, option):
         # submit update to executor threadpool
-        emba_fut = BoundedExecutor.submit(cls.emba_update, option)
+        emba_fut = BoundedExecutor.submit(cls.emba_update, option, pool=MAINTENANCE_POOL)
         return emba_fut
 
     @classmethod
     def submit_emba_upgrade(cls, option):
         # submit upgrade to executor threadpool
-        emba_fut = BoundedExecutor.submit(cls.emba_upgrade, option)
+        emba_fut = BoundedExecutor.submit(cls.emba_upgrade, option, pool=MAINTENANCE_POOL)
         return emba_fut
 
     @staticmethod
@@ -0,0 +1,23 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+LOG_ARCHIVE_FORMATS = ("zip", "tar.zst")
+
+
+@register(Tags.compatibility)
+def check_log_archive_format(app_configs, **kwargs):    # pylint: disable=unused-argument
+    """
+    LOG_ARCHIVE_FORMAT has to be known and tar.zst needs the zstandard package
+    """
+    from uploader.archiver import zstandard  # pylint: disable=import-outside-toplevel
+    if settings.LOG_ARCHIVE_FORMAT not in LOG_ARCHIVE_FORMATS:
+        return [Error(f"LOG_ARCHIVE_FORMAT {settings.LOG_ARCHIVE_FORMAT!r} is not supported",
+                      hint=f"Use one of {', '.join(LOG_ARCHIVE_FORMATS)}", id="uploader.E001")]
+    if settings.LOG_ARCHIVE_FORMAT == "tar.zst" and zstandard is None:
+        return [Error("LOG_ARCHIVE_FORMAT tar.zst needs the zstandard package",
+                      hint="pip install zstandard or use LOG_ARCHIVE_FORMAT=zip", id="uploader.E002")]
+    return []
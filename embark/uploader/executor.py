@@ -25,7 +25,7 @@ def submit_firmware(firmware_analysis: FirmwareAnalysis, firmware_file: Firmware
     params firmware_analysis: firmware model with flags and metadata
     params firmware_file: firmware file model to be analyzed
 
-    return: emba process future on success, None on failure
+    return: True or the emba process future if it got started, its AnalysisQueueEntry if it waits for a slot, None on failure
     """
     active_analyzer_dir = f"{settings.ACTIVE_FW}/{firmware_analysis.id}/"
     logger.info("submitting firmware %s to emba", active_analyzer_dir)
@@ -51,11 +51,10 @@ def submit_firmware(firmware_analysis: FirmwareAnalysis, firmware_file: Firmware
     if workers_enabled():
         orchestrator = get_orchestrator()
         orchestrator.queue_task(OrchestratorTask(firmware_analysis.id, emba_cmd, firmware_file.file.path, image_file_location))
-        BoundedExecutor.submit(LogReader, firmware_analysis.id)
+        # the reader registers with the shared log watcher and doesn't need an executor slot
+        LogReader(firmware_analysis.id)
 
         return True
     else:
-        emba_fut = BoundedExecutor.submit(BoundedExecutor.run_emba_cmd, emba_cmd, firmware_analysis.id, active_analyzer_dir)
-        BoundedExecutor.submit(LogReader, firmware_analysis.id)
-
-        return bool(emba_fut)
+        # waits in the queue if all slots are busy
+        return BoundedExecutor.submit_analysis(emba_cmd, firmware_analysis.id, active_analyzer_dir)
@@ -0,0 +1,166 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import logging
+import os
+import threading
+import uuid
+
+from django.conf import settings
+from redis import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+REDIS_CLIENT = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+
+# the redis clock is the only clock, processes don't have to agree on the time
+# KEYS[1] zset lease -> expiry, ARGV: limit, ttl, lease, 1 to ignore the limit
+ACQUIRE_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if ARGV[4] ~= '1' and redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+return 1
+"""
+# ARGV: ttl, leases to extend; returns the leases that are gone
+RENEW_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local lost = {}
+for i = 2, #ARGV do
+    local expiry = redis.call('ZSCORE', KEYS[1], ARGV[i])
+    if expiry and tonumber(expiry) > now then
+        redis.call('ZADD', KEYS[1], now + tonumber(ARGV[1]), ARGV[i])
+    else
+        redis.call('ZREM', KEYS[1], ARGV[i])
+        table.insert(lost, ARGV[i])
+    end
+end
+return lost
+"""
+# expired leases of crashed holders, returns how many were freed
+RECLAIM_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+return redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+"""
+
+
+class SlotLeases:    # pylint: disable=too-many-instance-attributes
+    """
+    class SlotLeases
+    Host wide semaphore in redis shared by all web processes: a slot is a lease in a sorted set scored with its expiry.
+    The holding process extends its leases every ttl/3, leases of crashed processes expire and are taken over.
+    If redis is unreachable the slots can't be acquired, the analyses wait in the db queue
+    """
+
+    def __init__(self, name, limit, ttl, on_reclaim=None):
+        """
+        :param name: redis key of the sorted set
+        :param limit: number of slots
+        :param ttl: seconds a lease lives without heartbeat
+        :param on_reclaim: called from the heartbeat thread when expired leases were freed
+        """
+        self.key = name
+        self.limit = limit
+        self.ttl = ttl
+        self.on_reclaim = on_reclaim
+        self.prefix = f"{os.uname().nodename}:{os.getpid()}:"
+        self.held = set()
+        # leases taken over the limit, they are never given up
+        self.forced = set()
+        self.lock = threading.Lock()
+        self.heartbeat = None
+        self.stopped = threading.Event()
+        self.acquire_script = REDIS_CLIENT.register_script(ACQUIRE_SCRIPT)
+        self.renew_script = REDIS_CLIENT.register_script(RENEW_SCRIPT)
+        self.reclaim_script = REDIS_CLIENT.register_script(RECLAIM_SCRIPT)
+
+    def acquire(self, force=False):
+        """
+        :param force: take a slot even if all are taken, for jobs that run already (e.g. reattached analyses).
+            Without redis the lease is only held locally and the heartbeat writes it once redis is back
+        :return: lease token or None if all slots are taken
+        """
+        self._start_heartbeat()
+        lease = f"{self.prefix}{uuid.uuid4().hex}"
+        try:
+            if not self.acquire_script(keys=[self.key], args=[self.limit, self.ttl, lease, int(force)]):
+                return None
+        except RedisError as error:
+            logger.error("Slot lease %s not acquired: %s", self.key, error)
+            if not force:
+                return None
+        with self.lock:
+            self.held.add(lease)
+            if force:
+                self.forced.add(lease)
+        return lease
+
+    def release(self, lease):
+        """
+        :param lease: token of acquire
+        """
+        with self.lock:
+            self.held.discard(lease)
+            self.forced.discard(lease)
+        try:
+            REDIS_CLIENT.zrem(self.key, lease)
+        except RedisError as error:
+            # expires on its own
+            logger.error("Slot lease %s not released: %s", lease, error)
+
+    def in_use(self):
+        """
+        :return: number of live leases of all processes
+        """
+        seconds, microseconds = REDIS_CLIENT.time()
+        return REDIS_CLIENT.zcount(self.key, f"({seconds + microseconds / 1e6}", "+inf")
+
+    def renew(self):
+        """
+        Extends the leases of this process, called by the heartbeat
+
+        :return: leases that expired before they were extended
+        """
+        with self.lock:
+            held = list(self.held)
+            forced = set(self.forced)
+        if not held:
+            return []
+        lost = [lease.decode() for lease in self.renew_script(keys=[self.key], args=[self.ttl, *held])]
+        for lease in lost:
+            # the job keeps running, take a slot again if there is one
+            if not self.acquire_script(keys=[self.key], args=[self.limit, self.ttl, lease, int(lease in forced)]):
+                logger.warning("Slot lease %s expired before the heartbeat and all slots are taken", lease)
+        return lost
+
+    def reclaim(self):
+        """
+        :return: number of expired leases that got freed
+        """
+        return self.reclaim_script(keys=[self.key], args=[])
+
+    def _start_heartbeat(self):
+        with self.lock:
+            if self.heartbeat is None:
+                self.heartbeat = threading.Thread(target=self._beat, name=f"lease-heartbeat-{self.key}", daemon=True)
+                self.heartbeat.start()
+
+    def _beat(self):
+        while not self.stopped.wait(self.ttl / 3):
+            try:
+                self.renew()
+                if self.reclaim() and self.on_reclaim is not None:
+                    logger.info("Expired slot leases of %s reclaimed", self.key)
+                    self.on_reclaim()
+            except Exception as error:     # pylint: disable=broad-except
+                logger.error("Slot lease heartbeat of %s failed: %s", self.key, error)
+
+    def stop(self):
+        self.stopped.set()
@@ -20,6 +20,7 @@ from django.utils import timezone
 
 from porter.models import LogZipFile
 from users.models import User as Userclass
+from uploader.archiver import Archiver
 from uploader.settings import get_emba_root, get_emba_base_cmd
 from settings.helper import workers_enabled
 
@@ -37,7 +38,7 @@ def scan_modules_default_value():
 
 def jsonfield_default_value():
     """
-    keys: percentage, analysis, firmwarename, last_update, last_module, module_list, last_phase, phase_list
+    keys: percentage, analysis, firmwarename, last_update, last_module, module_list, last_phase, phase_list, finished, work, eta
     """
     return {
         "percentage": 0,
@@ -49,7 +50,8 @@ def jsonfield_default_value():
         'last_phase': "",
         'phase_list': [],
         'finished': False,
-        'work': False
+        'work': False,
+        'eta': None
     }
 
 
@@ -319,6 +321,8 @@ class FirmwareAnalysis(models.Model):
     # embark meta data
     path_to_logs = models.FilePathField(path=settings.EMBA_LOG_ROOT, editable=True, allow_folders=True, max_length=255)
     log_size = models.PositiveBigIntegerField(default=0, blank=True)
+    # cpu, memory, I/O and log growth of the EMBA processes, see uploader.procsampler
+    resource_usage = models.JSONField(default=dict, blank=True)
     start_date = models.DateTimeField(default=timezone.now, blank=True)
     end_date = models.DateTimeField(default=None, null=True)
     scan_time = models.DurationField(default=None, null=True)
@@ -400,6 +404,12 @@ class FirmwareAnalysis(models.Model):
         cleans up the firmwareanalysis log_dir up to a point where it's minimal
         """
         logger.info("Archiving %s", self.id)
+        # compressed, but still browsable in the log viewer (GzipLineCache)
+        run_log = f"{Path(self.path_to_logs).parent}/emba_run.log"
+        if os.path.isfile(run_log):
+            Archiver.gzip_seekable(run_log, f"{run_log}.gz")
+            os.remove(run_log)
+            Path(f"{run_log}.idx").unlink(missing_ok=True)
         needed_content_list = ["html_report", "SBOM", "csv_logs", "emba_error.log", "emba.log", "firmware_entropy.png", "json_logs", "pixd.png"]
         log_path = f"{self.path_to_logs}/emba_logs/"
         for _content in os.listdir(log_path):
@@ -475,6 +485,86 @@ def delete_analysis_pre_delete(sender, instance, **kwargs):
         logger.error("Error durring delete of: %s - %s", str(sender), _error)
 
 
+class ModuleTiming(models.Model):
+    """
+    class ModuleTiming
+    Runtime of one EMBA module inside an analysis, taken from the timestamps in emba.log
+    """
+    MAX_LENGTH = 127
+
+    analysis = models.ForeignKey(FirmwareAnalysis, on_delete=models.CASCADE, related_name='module_timings')
+    module = models.CharField(max_length=MAX_LENGTH, db_index=True)
+    phase = models.CharField(max_length=MAX_LENGTH, blank=True, default="")
+    started = models.DateTimeField(null=True, blank=True)
+    finished = models.DateTimeField(null=True, blank=True)
+    duration = models.FloatField(default=0.0, help_text='seconds')
+
+    class Meta:
+        app_label = 'uploader'
+        constraints = [
+            models.UniqueConstraint(fields=['analysis', 'module'], name='unique_module_timing')
+        ]
+
+    def __str__(self):
+        return f"{self.module}({self.analysis_id}): {self.duration}s"
+
+
+class ModuleDurationStat(models.Model):
+    """
+    class ModuleDurationStat
+    Aggregated runtime of an EMBA module over all finished analyses, used for progress and ETA
+    """
+    MAX_LENGTH = 127
+
+    module = models.CharField(max_length=MAX_LENGTH, unique=True)
+    runs = models.PositiveIntegerField(default=0)
+    total_seconds = models.FloatField(default=0.0)
+    last_seconds = models.FloatField(default=0.0)
+    last_update = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        app_label = 'uploader'
+
+    @property
+    def mean_seconds(self):
+        return self.total_seconds / self.runs if self.runs else 0.0
+
+    def __str__(self):
+        return f"{self.module}: {self.runs} runs, {self.mean_seconds:.1f}s mean"
+
+
+class AnalysisQueueEntry(models.Model):
+    """
+    class AnalysisQueueEntry
+    Local analysis waiting for a free BoundedExecutor slot, started in id order.
+    Firmware and log dir are prepared already, the entry only keeps what run_emba_cmd needs
+    """
+    MAX_LENGTH = 255
+
+    analysis = models.OneToOneField(FirmwareAnalysis, on_delete=models.CASCADE, related_name='queue_entry')
+    emba_cmd = models.TextField()
+    active_analyzer_dir = models.CharField(max_length=MAX_LENGTH)
+    queued = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        app_label = 'uploader'
+        ordering = ['id']
+
+    @classmethod
+    def position(cls, analysis_id):
+        """
+        :param analysis_id: id of the FirmwareAnalysis
+        :return: 1 for the next analysis to start, None if it doesn't wait
+        """
+        entry_id = cls.objects.filter(analysis_id=analysis_id).values_list("id", flat=True).first()
+        if entry_id is None:
+            return None
+        return cls.objects.filter(id__lte=entry_id).count()
+
+    def __str__(self):
+        return f"{self.analysis_id} queued {self.queued}"
+
+
 class ResourceTimestamp(models.Model):
     """
     class ResourceTimestamp
@@ -0,0 +1,260 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import logging
+import os
+import subprocess
+import threading
+import time
+
+import psutil
+from django.conf import settings
+
+from embark.helper import get_size
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# one point of FirmwareAnalysis.resource_usage["series"]
+SERIES_COLUMNS = ["seconds", "cpu_percent", "rss_mb", "read_mb", "write_mb", "processes", "log_mb"]
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+# cgroup v2 dir of a container with the systemd and the cgroupfs driver of docker
+CGROUP_PATTERNS = ["system.slice/docker-{}.scope", "docker/{}"]
+
+
+def container_ids(mount_source):
+    """
+    :param mount_source: host path mounted into the container, EMBA mounts its log dir
+    :return: ids of the running containers with mount_source mounted, None if docker can't be asked
+    """
+    try:
+        running = subprocess.run(["sudo", "-n", "docker", "ps", "-q", "--no-trunc"], capture_output=True, text=True,
+                                 check=True, timeout=30).stdout.split()    # nosec
+        if not running:
+            return []
+        inspected = subprocess.run(["sudo", "-n", "docker", "inspect", "--format", "{{.Id}}{{range .Mounts}} {{.Source}}{{end}}",
+                                    *running], capture_output=True, text=True, check=True, timeout=30).stdout    # nosec
+    except (OSError, subprocess.SubprocessError) as error:
+        logger.info("No container accounting, docker not available: %s", error)
+        return None
+    source = os.path.realpath(mount_source)
+    return [fields[0] for fields in (line.split() for line in inspected.splitlines()) if source in fields[1:]]
+
+
+def container_cgroup(container_id):
+    """
+    :return: cgroup v2 dir of the container, None without cgroup v2 or once the container is gone
+    """
+    for pattern in CGROUP_PATTERNS:
+        path = os.path.join(CGROUP_ROOT, pattern.format(container_id))
+        if os.path.isfile(os.path.join(path, "cpu.stat")):
+            return path
+    return None
+
+
+def read_cgroup(path):
+    """
+    :param path: cgroup v2 dir
+    :return: [cpu seconds, read bytes, write bytes], memory bytes, peak memory bytes and processes of the cgroup
+    """
+    def read_value(name, default=0):
+        try:
+            with open(os.path.join(path, name), 'r', encoding='utf-8') as value_file:
+                return int(value_file.read().strip())
+        except (FileNotFoundError, ValueError):
+            # memory.peak needs linux 5.19, pids only with the pids controller
+            return default
+
+    with open(os.path.join(path, "cpu.stat"), 'r', encoding='utf-8') as cpu_file:
+        cpu_usec = dict(line.split() for line in cpu_file if line.strip())["usage_usec"]
+    io_bytes = {"rbytes": 0, "wbytes": 0}
+    with open(os.path.join(path, "io.stat"), 'r', encoding='utf-8') as io_file:
+        for line in io_file:
+            # "<major>:<minor> rbytes=... wbytes=... rios=... wios=..." per device
+            for field in line.split()[1:]:
+                key, _sep, value = field.partition("=")
+                if key in io_bytes:
+                    io_bytes[key] += int(value)
+    memory = read_value("memory.current")
+    return ([int(cpu_usec) / 1e6, io_bytes["rbytes"], io_bytes["wbytes"]], memory,
+            read_value("memory.peak", memory), read_value("pids.current"))
+
+
+class ProcessTreeSampler:    # pylint: disable=too-many-instance-attributes
+    """
+    class ProcessTreeSampler
+    Samples the processes of an EMBA run: the run is started with start_new_session, so every process
+    of its session belongs to the analysis, also the ones reparented to init.
+    The processes of the EMBA container run outside of the session (below the container runtime), the container
+    is found by its mount of the log dir and sampled from its cgroup v2 counters.
+    CPU seconds and I/O of processes and containers that exited between two samples are kept from their last sample.
+    The series is halved whenever it grows beyond max_points, so long runs stay compact
+    """
+
+    def __init__(self, root_pid, log_dir=None, interval=None, max_points=None):
+        """
+        :param root_pid: pid of the session leader (the EMBA shell)
+        :param log_dir: emba_logs dir of the analysis, its size is sampled as well
+        :param interval: seconds between two samples, default RESOURCE_SAMPLE_INTERVAL
+        :param max_points: max length of the series, default RESOURCE_SAMPLE_POINTS
+        """
+        self.session = root_pid
+        self.log_dir = log_dir
+        self.interval = interval or settings.RESOURCE_SAMPLE_INTERVAL
+        self.max_points = max_points or settings.RESOURCE_SAMPLE_POINTS
+        # (pid, create time) -> [cpu seconds, read bytes, write bytes] of the last sample
+        self.processes = {}
+        # container id -> cgroup dir, None while there's none
+        self.containers = {}
+        # cleared once docker can't be asked
+        self.find_containers = log_dir is not None
+        self.exited = [0.0, 0, 0]
+        self.series = []
+        self.step = 1
+        self.samples = 0
+        self.peak_rss = 0
+        self.peak_processes = 0
+        self.log_bytes = 0
+        self.started = time.time()
+        self.last = (self.started, 0.0)
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def members(self):
+        """
+        :return: processes of the session
+        """
+        for proc in psutil.process_iter():
+            try:
+                if os.getsid(proc.pid) == self.session:
+                    yield proc
+            except OSError:
+                continue
+
+    def container_cgroups(self):
+        """
+        :return: (container id, cgroup dir) of the running containers of the analysis
+        """
+        if self.find_containers and not any(self.containers.values()):
+            ids = container_ids(self.log_dir)
+            if ids is None:
+                self.find_containers = False
+            for container_id in ids or []:
+                self.containers.setdefault(container_id, None)
+        for container_id in self.containers:
+            self.containers[container_id] = container_cgroup(container_id)
+        return [(container_id, path) for container_id, path in self.containers.items() if path]
+
+    def sample(self, point=False):    # pylint: disable=too-many-locals
+        """
+        :param point: add a point to the series even if downsampling would skip this sample
+        """
+        now = time.time()
+        seen = {}
+        rss = 0
+        peak_excess = 0
+        processes = 0
+        for container_id, path in self.container_cgroups():
+            try:
+                counters, memory, peak, pids = read_cgroup(path)
+            except (OSError, KeyError, ValueError):
+                # removed during the read
+                continue
+            seen[("container", container_id)] = counters
+            rss += memory
+            # the kernel keeps the peak between two samples
+            peak_excess += peak - memory
+            processes += pids
+        for proc in self.members():
+            try:
+                with proc.oneshot():
+                    times = proc.cpu_times()
+                    counters = [times.user + times.system, 0, 0]
+                    try:
+                        io_counters = proc.io_counters()
+                        counters[1:] = [io_counters.read_bytes, io_counters.write_bytes]
+                    except psutil.AccessDenied:
+                        # /proc/<pid>/io of processes started with sudo
+                        pass
+                    rss += proc.memory_info().rss
+                    seen[(proc.pid, proc.create_time())] = counters
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        for key, counters in self.processes.items():
+            if key not in seen:
+                self.exited = [total + value for total, value in zip(self.exited, counters)]
+        self.processes = seen
+        cpu, read, write = self.totals_counters()
+        processes += sum(1 for key in seen if key[0] != "container")
+        self.peak_rss = max(self.peak_rss, rss + peak_excess)
+        self.peak_processes = max(self.peak_processes, processes)
+
+        self.samples += 1
+        if self.samples % self.step and not point:
+            return
+        cpu_percent = (cpu - self.last[1]) / max(now - self.last[0], 1e-6) * 100
+        self.last = (now, cpu)
+        if self.log_dir:
+            try:
+                self.log_bytes = get_size(self.log_dir)
+            except OSError:
+                # files got removed during the walk, the next sample counts again
+                pass
+        self.series.append([int(now - self.started), round(cpu_percent), round(rss / MB), round(read / MB),
+                            round(write / MB), processes, round(self.log_bytes / MB)])
+        if len(self.series) > self.max_points:
+            self.series = self.series[::2]
+            self.step *= 2
+
+    def totals_counters(self):
+        """
+        :return: [cpu seconds, read bytes, write bytes] of all processes so far
+        """
+        return [sum(values) for values in zip(self.exited, *self.processes.values())]
+
+    def usage(self):
+        """
+        :return: compact series and totals for FirmwareAnalysis.resource_usage
+        """
+        cpu, read, write = self.totals_counters()
+        return {
+            "interval": self.interval * self.step,
+            "columns": SERIES_COLUMNS,
+            "series": self.series,
+            "totals": {
+                "wall_seconds": round(time.time() - self.started),
+                "cpu_seconds": round(cpu, 1),
+                "peak_rss_mb": round(self.peak_rss / MB),
+                "read_mb": round(read / MB),
+                "write_mb": round(write / MB),
+                "log_mb": round(self.log_bytes / MB),
+                "peak_processes": self.peak_processes,
+            },
+        }
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as error:     # pylint: disable=broad-except
+                logger.error("Sampling session %s failed: %s", self.session, error)
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name=f"proc-sampler-{self.session}", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops sampling, the last sample books the processes that ended since the previous one
+
+        :return: usage()
+        """
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.sample(point=True)
+        return self.usage()
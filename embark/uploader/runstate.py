@@ -0,0 +1,86 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import fcntl
+import logging
+import os
+
+import psutil
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisClaim:
+    """
+    class AnalysisClaim
+    Per analysis ownership across processes (flock on EMBA_LOG_ROOT/<id>/emba_run.lock).
+    The process holding the claim waits for EMBA, runs the LogReader and finalizes the analysis.
+    The kernel drops the lock together with the process, so a restarted server can take over.
+    """
+
+    def __init__(self, analysis_id):
+        self.analysis_id = analysis_id
+        self.path = f"{settings.EMBA_LOG_ROOT}/{analysis_id}/emba_run.lock"
+        self._file = None
+
+    def acquire(self) -> bool:
+        """
+        :return: True if the claim is ours now, False if another process holds it
+        """
+        if self._file is not None:
+            return True
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lock_file = open(self.path, 'a+', encoding='utf-8')    # pylint: disable=consider-using-with
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *_exc):
+        self.release()
+
+
+def read_pid_file(analysis_id):
+    """
+    :return: pid written to EMBA_LOG_ROOT/<id>/emba_run.pid or None
+    """
+    try:
+        with open(f"{settings.EMBA_LOG_ROOT}/{analysis_id}/emba_run.pid", 'r', encoding='utf-8') as pid_file:
+            return int(pid_file.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def emba_process_alive(analysis) -> bool:
+    """
+    checks if the EMBA process of a local analysis is still running
+    the pid has to match the db and the pid file and the process has to belong to the analysis (pid reuse)
+
+    :param analysis: FirmwareAnalysis
+    :return: True if EMBA is still running
+    """
+    if not analysis.pid or analysis.pid != read_pid_file(analysis.id):
+        return False
+    try:
+        process = psutil.Process(analysis.pid)
+        if process.status() == psutil.STATUS_ZOMBIE:
+            return False
+        return str(analysis.id) in " ".join(process.cmdline())
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
@@ -0,0 +1,107 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import tempfile
+import time
+import uuid
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from uploader import admission
+from uploader.boundedexecutor import BoundedExecutor
+from uploader.models import AnalysisQueueEntry, FirmwareAnalysis
+
+HOST = {"cores": 8, "memory_total_mb": 16384, "memory_available_mb": 12288, "disk_free_mb": 50000,
+        "disk_total_mb": 100000}
+
+
+@override_settings(ANALYSIS_HOST_SLOTS=4, ADMISSION_MEMORY_RESERVE_MB=2048, ADMISSION_DISK_RESERVE_MB=4000,
+                   CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class TestAdmission(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        admission.REDIS_CLIENT.delete(admission.DECISION_KEY)
+        self.resources = dict(HOST)
+        patcher = mock.patch('uploader.admission.host_resources', side_effect=lambda: dict(self.resources))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        admission.REDIS_CLIENT.delete(admission.DECISION_KEY)
+        super().tearDown()
+
+    def test_admit(self):
+        analysis = FirmwareAnalysis.objects.create(id=uuid.uuid4(), running_on_worker=False)
+        decision = admission.decide(analysis)
+        self.assertEqual(admission.ADMIT, decision["verdict"])
+        self.assertEqual(4, decision["slots"])
+        self.assertEqual([decision], admission.recent_decisions(analysis.id))
+
+    def test_queue_behind_running(self):
+        for _running in range(3):
+            FirmwareAnalysis.objects.create(id=uuid.uuid4(), running_on_worker=False, user_emulation_test=True)
+        analysis = FirmwareAnalysis.objects.create(id=uuid.uuid4(), running_on_worker=False)
+        # 3 emulations hold 12 of 8 cores
+        decision = admission.decide(analysis)
+        self.assertEqual(admission.QUEUE, decision["verdict"])
+        self.assertIn("cores", decision["reason"])
+
+    def test_queue_low_memory(self):
+        FirmwareAnalysis.objects.create(id=uuid.uuid4(), running_on_worker=False)
+        self.resources["memory_available_mb"] = 3000
+        analysis = FirmwareAnalysis.objects.create(id=uuid.uuid4(), running_on_worker=False)
+        decision = admission.decide(analysis)
+        self.assertEqual(admission.QUEUE, decision["verdict"])
+        self.assertIn("memory", decision["reason"])
+
+    def test_queue_low_disk(self):
+        # full disk of an idle host might be cleaned up
+        self.resources["disk_free_mb"] = 4500
+        analysis = FirmwareAnalysis.objects.create(id=uuid.uuid4(), running_on_worker=False)
+        self.assertEqual(admission.QUEUE, admission.decide(analysis)["verdict"])
+
+    def test_small_host_alone(self):
+        for total, available, emulation in ((4096, 3300, False), (8192, 6800, True)):
+            with self.subTest(total=total):
+                self.resources.update(cores=2, memory_total_mb=total, memory_available_mb=available)
+                analysis = FirmwareAnalysis.objects.create(id=uuid.uuid4(), running_on_worker=False,
+                                                           user_emulation_test=emulation)
+                self.assertEqual(admission.ADMIT, admission.decide(analysis)["verdict"])
+                analysis.delete()
+
+    def test_defer(self):
+        self.resources["disk_total_mb"] = 4500
+        analysis = FirmwareAnalysis.objects.create(id=uuid.uuid4(), running_on_worker=False)
+        decision = admission.decide(analysis)
+        self.assertEqual(admission.DEFER, decision["verdict"])
+        self.assertIn("filesystem", decision["reason"])
+
+    def test_slot_count(self):
+        # a single core host still runs one analysis
+        self.assertEqual(1, admission.slot_count({**HOST, "cores": 1}))
+        self.assertEqual(2, admission.slot_count({**HOST, "memory_total_mb": 6144}))
+
+    def test_submit_refused(self):
+        self.resources["disk_total_mb"] = 4500
+        analysis = FirmwareAnalysis.objects.create(id=uuid.uuid4(), running_on_worker=False)
+        with tempfile.TemporaryDirectory() as active_dir:
+            self.assertIsNone(BoundedExecutor.submit_analysis("emba", analysis.id, f"{active_dir}/fw/"))
+        analysis.refresh_from_db()
+        self.assertTrue(analysis.failed and analysis.finished)
+        self.assertFalse(AnalysisQueueEntry.objects.exists())
+
+    @override_settings(ADMISSION_RETRY_INTERVAL=0.1)
+    def test_queue_retried(self):
+        FirmwareAnalysis.objects.create(id=uuid.uuid4(), running_on_worker=False)
+        self.resources["memory_available_mb"] = 3000
+        analysis = FirmwareAnalysis.objects.create(id=uuid.uuid4(), running_on_worker=False)
+        with mock.patch.object(BoundedExecutor, 'dispatch_in_thread') as dispatch:
+            entry = BoundedExecutor.submit_analysis("emba", analysis.id, "/tmp/fw/")
+            self.assertIsInstance(entry, AnalysisQueueEntry)
+            time.sleep(0.5)
+        dispatch.assert_called_once()
+        self.assertTrue(AnalysisQueueEntry.objects.filter(analysis=analysis).exists())
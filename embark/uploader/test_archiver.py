@@ -0,0 +1,145 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import gzip
+import os
+import tarfile
+import tempfile
+import zipfile
+import zlib
+
+from unittest import mock, skipIf
+
+from django.test import SimpleTestCase, override_settings
+
+from uploader import archiver
+from uploader.archiver import Archiver, SeekableGzipFile, load_gzip_index
+from uploader.checks import check_log_archive_format
+
+
+class TestSeekableGzip(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()    # pylint: disable=consider-using-with
+        self.log_path = os.path.join(self.tmp_dir.name, "worker.log")
+        self.content = b"".join(b"%d: " % number + b"x" * (number % 50) + b"\n" for number in range(20000)) + b"no line break"
+        with open(self.log_path, 'wb') as log_file:
+            log_file.write(self.content)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def test_members(self):
+        archive = Archiver.gzip_seekable(self.log_path, f"{self.log_path}.gz", chunk_size=4096)
+        # still a normal gzip file
+        with gzip.open(archive, 'rb') as archive_file:
+            self.assertEqual(self.content, archive_file.read())
+        size, entries = load_gzip_index(archive)
+        self.assertEqual(len(self.content), size)
+        self.assertGreater(len(entries), 100)
+        for _compressed, uncompressed, first_line in entries:
+            # members start at line beginnings
+            self.assertTrue(uncompressed == 0 or self.content[uncompressed - 1:uncompressed] == b"\n")
+            self.assertEqual(self.content.count(b"\n", 0, uncompressed), first_line)
+
+    def test_random_access(self):
+        archive = Archiver.gzip_seekable(self.log_path, f"{self.log_path}.gz", chunk_size=4096)
+        with SeekableGzipFile(archive) as gzip_file:
+            self.assertEqual(len(self.content), gzip_file.size)
+            self.assertEqual(20000, gzip_file.lines)
+            for start, length in ((0, 10), (4090, 20), (300000, 100000), (len(self.content) - 5, 100)):
+                gzip_file.seek(start)
+                self.assertEqual(self.content[start:start + length], gzip_file.read(length))
+            # only the members of the last reads got decompressed
+            self.assertLessEqual(len(gzip_file._cache), archiver.GZIP_CACHED_CHUNKS)   # pylint: disable=protected-access
+
+    def test_long_line(self):
+        with open(self.log_path, 'wb') as log_file:
+            log_file.write(b"a" * 10000 + b"\n" + b"b" * 5000 + b"\n")
+        archive = Archiver.gzip_seekable(self.log_path, f"{self.log_path}.gz", chunk_size=4096)
+        _size, entries = load_gzip_index(archive)
+        self.assertEqual([0, 10001], [entry[1] for entry in entries])
+
+    def test_plain_gzip(self):
+        with gzip.open(f"{self.log_path}.gz", 'wb') as archive_file:
+            archive_file.write(self.content)
+        self.assertIsNone(load_gzip_index(f"{self.log_path}.gz"))
+        with SeekableGzipFile(f"{self.log_path}.gz") as gzip_file:
+            self.assertEqual(20000, gzip_file.lines)
+            gzip_file.seek(1000)
+            self.assertEqual(self.content[1000:2000], gzip_file.read(1000))
+
+    def test_archive_file(self):
+        first = Archiver.archive_file(self.log_path)
+        second = Archiver.archive_file(self.log_path)
+        self.assertEqual(f"{self.log_path}.gz.1", first)
+        self.assertEqual(f"{self.log_path}.gz.2", second)
+        self.assertIsNotNone(load_gzip_index(second))
+        self.assertIsNone(Archiver.archive_file(os.path.join(self.tmp_dir.name, "missing.log")))
+
+
+class TestParallelZip(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()    # pylint: disable=consider-using-with
+        self.source = os.path.join(self.tmp_dir.name, "emba_logs")
+        os.makedirs(os.path.join(self.source, "html-report", "style"))
+        os.makedirs(os.path.join(self.source, "empty"))
+        self.files = {
+            "emba.log": b"".join(b"[*] %d module line\n" % number for number in range(400000)),
+            "html-report/style/firmware_entropy.png": os.urandom(300000),
+            "empty.txt": b"",
+        }
+        for name, content in self.files.items():
+            with open(os.path.join(self.source, name), 'wb') as file_:
+                file_.write(content)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def test_zip(self):
+        # chunks of a few KB, so the log spans many of them
+        with mock.patch.object(archiver, 'ARCHIVE_CHUNK_SIZE', 65536):
+            archive = Archiver.make_zipfile(os.path.join(self.tmp_dir.name, "logs.zip"), self.source, workers=3)
+        with zipfile.ZipFile(archive) as zip_:
+            self.assertIsNone(zip_.testzip())
+            for name, content in self.files.items():
+                self.assertEqual(content, zip_.read(f"emba_logs/{name}"))
+            self.assertIn("emba_logs/empty/", zip_.namelist())
+            log_info = zip_.getinfo("emba_logs/emba.log")
+            self.assertEqual(zipfile.ZIP_DEFLATED, log_info.compress_type)
+            # primed chunks compress about as well as one stream
+            self.assertLess(log_info.compress_size, len(zlib.compress(self.files["emba.log"], 6)) * 1.05)
+            self.assertEqual(zipfile.ZIP_STORED, zip_.getinfo("emba_logs/html-report/style/firmware_entropy.png").compress_type)
+        # the porter unpacks it with the zipfile module as well
+        Archiver.unpack(archive, os.path.join(self.tmp_dir.name, "unpacked"))
+        with open(os.path.join(self.tmp_dir.name, "unpacked", "emba_logs", "emba.log"), 'rb') as log_file:
+            self.assertEqual(self.files["emba.log"], log_file.read())
+
+    @skipIf(archiver.zstandard is None, "zstandard is not installed")
+    def test_tarzst(self):
+        archive = Archiver.make_tarzst(os.path.join(self.tmp_dir.name, "logs.tar.zst"), self.source, workers=2)
+        with open(archive, 'rb') as archive_file, archiver.zstandard.ZstdDecompressor().stream_reader(archive_file) as stream:
+            with tarfile.open(fileobj=stream, mode='r|') as tar:
+                contents = {member.name: tar.extractfile(member).read() for member in tar if member.isfile()}
+        self.assertEqual({f"emba_logs/{name}": content for name, content in self.files.items()}, contents)
+
+    @override_settings(LOG_ARCHIVE_FORMAT="tar.zst")
+    def test_format_fallback(self):
+        with mock.patch.object(archiver, 'zstandard', None):
+            archive = Archiver.make_log_archive(os.path.join(self.tmp_dir.name, "logs"), self.source)
+        self.assertTrue(archive.endswith(".zip"))
+
+    def test_format_check(self):
+        with mock.patch.object(archiver, 'zstandard', None):
+            with override_settings(LOG_ARCHIVE_FORMAT="tar.zst"):
+                self.assertEqual(["uploader.E002"], [error.id for error in check_log_archive_format(None)])
+            with override_settings(LOG_ARCHIVE_FORMAT="zip"):
+                self.assertEqual([], check_log_archive_format(None))
+        with override_settings(LOG_ARCHIVE_FORMAT="tar.gz"):
+            self.assertEqual(["uploader.E001"], [error.id for error in check_log_archive_format(None)])
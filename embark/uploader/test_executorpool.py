@@ -0,0 +1,54 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import threading
+
+from django.test import SimpleTestCase
+
+from uploader.boundedexecutor import ARCHIVE_POOL, MAINTENANCE_POOL, BoundedExecutor, ExecutorPool, pools
+
+
+def failing_job():
+    raise ValueError("job failed")
+
+
+class TestExecutorPool(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def blocking_job(self):
+        self.release.wait(timeout=10)
+        return True
+
+    def test_limits(self):
+        pool = ExecutorPool("test", workers=1, queue=1)
+        futures = [pool.submit(self.blocking_job) for _job in range(2)]
+        self.assertNotIn(None, futures)
+        self.assertIsNone(pool.submit(self.blocking_job))
+        self.assertEqual((2, 1), (pool.stats()["pending"], pool.stats()["rejected"]))
+
+        self.release.set()
+        for future in futures:
+            self.assertTrue(future.result(timeout=10))
+        pool.submit(failing_job).exception(timeout=10)
+        pool.shutdown()
+        stats = pool.stats()
+        self.assertEqual((0, 2, 1, 3), (stats["pending"], stats["completed"], stats["failed"], stats["submitted"]))
+
+    def test_separate_pools(self):
+        archive = pools[ARCHIVE_POOL]
+        for _slot in range(archive.limit):
+            archive.semaphore.acquire()     # pylint: disable=consider-using-with
+        try:
+            self.assertIsNone(BoundedExecutor.submit(self.blocking_job, pool=ARCHIVE_POOL))
+            # a full archive pool doesn't hold back other job classes
+            self.release.set()
+            self.assertTrue(BoundedExecutor.submit(self.blocking_job, pool=MAINTENANCE_POOL).result(timeout=10))
+        finally:
+            for _slot in range(archive.limit):
+                archive.semaphore.release()
+        self.assertIn(ARCHIVE_POOL, BoundedExecutor.stats())
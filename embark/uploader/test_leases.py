@@ -0,0 +1,76 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from uploader.leases import REDIS_CLIENT, SlotLeases
+
+TEST_KEY = "TEST_SLOTS"
+
+
+class TestSlotLeases(SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        REDIS_CLIENT.delete(TEST_KEY)
+        self.reclaimed = threading.Event()
+        # two web processes sharing the slots
+        self.first = SlotLeases(TEST_KEY, 2, 3, on_reclaim=self.reclaimed.set)
+        self.second = SlotLeases(TEST_KEY, 2, 3)
+
+    def tearDown(self):
+        self.first.stop()
+        self.second.stop()
+        REDIS_CLIENT.delete(TEST_KEY)
+        super().tearDown()
+
+    def test_limit(self):
+        lease = self.first.acquire()
+        self.assertIsNotNone(self.second.acquire())
+        self.assertIsNone(self.second.acquire())
+        self.assertIsNone(self.first.acquire())
+        self.assertEqual(2, self.first.in_use())
+        self.first.release(lease)
+        self.assertIsNotNone(self.second.acquire())
+
+    def test_forced(self):
+        self.first.acquire()
+        self.second.acquire()
+        lease = self.first.acquire(force=True)
+        self.assertIsNotNone(lease)
+        self.assertEqual(3, self.second.in_use())
+        # lost over the limit, the heartbeat takes it again anyway
+        REDIS_CLIENT.zadd(TEST_KEY, {lease: 0})
+        self.assertEqual([lease], self.first.renew())
+        self.assertEqual(3, self.second.in_use())
+        self.first.release(lease)
+        self.assertIsNone(self.second.acquire())
+
+    def test_heartbeat(self):
+        lease = self.first.acquire()
+        time.sleep(4)
+        # extended by the heartbeat, still taken
+        self.assertEqual(1, self.second.in_use())
+        self.assertEqual([], self.first.renew())
+        self.first.release(lease)
+
+    def test_reclaim(self):
+        # a crashed process doesn't renew
+        self.second.stop()
+        self.second.acquire()
+        self.first.acquire()
+        self.assertTrue(self.reclaimed.wait(timeout=10))
+        self.assertEqual(1, self.first.in_use())
+        self.assertIsNotNone(self.first.acquire())
+
+    def test_renew_lost(self):
+        self.first.stop()
+        lease = self.first.acquire()
+        REDIS_CLIENT.zadd(TEST_KEY, {lease: 0})
+        # taken again while a slot is free
+        self.assertEqual([lease], self.first.renew())
+        self.assertEqual(1, self.second.in_use())
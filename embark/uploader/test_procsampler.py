@@ -0,0 +1,84 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import os
+import tempfile
+import time
+
+from subprocess import Popen
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from uploader import procsampler
+from uploader.procsampler import SERIES_COLUMNS, ProcessTreeSampler
+
+
+class TestProcessTreeSampler(SimpleTestCase):
+
+    def test_session(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            # a busy child that exits between two samples and a sleeping one
+            with Popen(f"sleep 1 & i=0; while [ $i -lt 200000 ]; do i=$((i+1)); done; head -c 2097152 /dev/zero > {log_dir}/emba.log; wait",
+                       shell=True, start_new_session=True) as proc:    # nosec
+                sampler = ProcessTreeSampler(proc.pid, log_dir, interval=60)
+                time.sleep(0.3)
+                sampler.sample()
+                self.assertGreaterEqual(sampler.peak_processes, 2)
+                proc.wait()
+            usage = sampler.stop()
+        self.assertEqual(SERIES_COLUMNS, usage["columns"])
+        self.assertEqual(2, len(usage["series"]))
+        self.assertGreater(usage["totals"]["cpu_seconds"], 0)
+        self.assertGreater(usage["totals"]["peak_rss_mb"], 0)
+        self.assertEqual(2, usage["totals"]["log_mb"])
+        # the exited processes keep their counters
+        self.assertEqual({}, sampler.processes)
+
+    def test_downsampling(self):
+        sampler = ProcessTreeSampler(-1, interval=5, max_points=4)
+        for _sample in range(12):
+            sampler.sample()
+        usage = sampler.usage()
+        self.assertLessEqual(len(usage["series"]), 4)
+        self.assertEqual(20, usage["interval"])
+
+    @staticmethod
+    def write_cgroup(path, cpu_usec, rbytes, memory):
+        os.makedirs(path, exist_ok=True)
+        for name, content in (("cpu.stat", f"usage_usec {cpu_usec}\nuser_usec {cpu_usec}\n"),
+                              ("io.stat", f"8:0 rbytes={rbytes} wbytes=1048576 rios=1\n259:0 rbytes={rbytes} wbytes=0\n"),
+                              ("memory.current", str(memory)), ("memory.peak", str(2 * memory)), ("pids.current", "3")):
+            with open(os.path.join(path, name), 'w', encoding='utf-8') as cgroup_file:
+                cgroup_file.write(content)
+
+    def test_container(self):
+        with tempfile.TemporaryDirectory() as cgroup_root, \
+                mock.patch.object(procsampler, 'CGROUP_ROOT', cgroup_root), \
+                mock.patch('uploader.procsampler.container_ids', return_value=["abc"]) as container_ids:
+            cgroup = os.path.join(cgroup_root, "system.slice", "docker-abc.scope")
+            self.write_cgroup(cgroup, 2000000, 1048576, 64 * 1024 * 1024)
+            sampler = ProcessTreeSampler(-1, cgroup_root, interval=60)
+            sampler.sample()
+            self.write_cgroup(cgroup, 5000000, 2097152, 32 * 1024 * 1024)
+            sampler.sample()
+            # the container is gone, its last counters stay
+            for name in os.listdir(cgroup):
+                os.remove(os.path.join(cgroup, name))
+            usage = sampler.stop()
+        container_ids.assert_called_with(cgroup_root)
+        self.assertEqual(5.0, usage["totals"]["cpu_seconds"])
+        self.assertEqual(4, usage["totals"]["read_mb"])
+        self.assertEqual(1, usage["totals"]["write_mb"])
+        self.assertEqual(128, usage["totals"]["peak_rss_mb"])
+        self.assertEqual(3, usage["totals"]["peak_processes"])
+        self.assertEqual([3, 3, 0], [point[SERIES_COLUMNS.index("processes")] for point in usage["series"]])
+
+    def test_without_docker(self):
+        with tempfile.TemporaryDirectory() as log_dir, \
+                mock.patch('uploader.procsampler.container_ids', return_value=None) as container_ids:
+            sampler = ProcessTreeSampler(-1, log_dir, interval=60)
+            sampler.sample()
+            sampler.sample()
+        container_ids.assert_called_once()
@@ -0,0 +1,46 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import subprocess
+
+from django.test import TestCase
+
+from embark.tests.base import AnalysisLogMixin
+from uploader.runstate import AnalysisClaim, emba_process_alive
+
+
+class TestRunState(AnalysisLogMixin, TestCase):
+
+    def write_pid_file(self, pid):
+        with open(f"{self.tmp_dir.name}/{self.analysis.id}/emba_run.pid", 'w', encoding='utf-8') as pid_file:
+            pid_file.write(str(pid))
+
+    def test_claim_exclusive(self):
+        first = AnalysisClaim(self.analysis.id)
+        second = AnalysisClaim(self.analysis.id)
+        self.assertTrue(first.acquire())
+        self.assertFalse(second.acquire())
+        first.release()
+        self.assertTrue(second.acquire())
+        second.release()
+
+    def test_emba_process_alive(self):
+        # the analysis id has to be part of the command line, like the log dir of a real EMBA run
+        with subprocess.Popen(f"sleep 30; echo {self.analysis.id}", shell=True, start_new_session=True) as proc:    # nosec
+            self.analysis.pid = proc.pid
+            self.assertFalse(emba_process_alive(self.analysis))
+            with AnalysisClaim(self.analysis.id):
+                self.write_pid_file(proc.pid)
+            self.assertTrue(emba_process_alive(self.analysis))
+            proc.kill()
+            proc.wait()
+        self.assertFalse(emba_process_alive(self.analysis))
+
+    def test_foreign_process(self):
+        with subprocess.Popen(["sleep", "30"]) as proc:
+            self.analysis.pid = proc.pid
+            with AnalysisClaim(self.analysis.id):
+                self.write_pid_file(proc.pid)
+            self.assertFalse(emba_process_alive(self.analysis))
+            proc.kill()
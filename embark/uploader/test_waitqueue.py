@@ -0,0 +1,129 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+import threading
+import uuid
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from uploader.boundedexecutor import ANALYSIS_POOL, BoundedExecutor, analysis_leases, pools
+from uploader.leases import REDIS_CLIENT
+from uploader.models import AnalysisQueueEntry, FirmwareAnalysis
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class TestWaitQueue(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.release = threading.Event()
+        self.started = []
+        patcher = mock.patch.object(BoundedExecutor, 'run_emba_cmd', side_effect=self.run_emba_cmd)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # only the slots decide here, test_admission covers the resources
+        patcher = mock.patch('uploader.admission.decide', return_value={'verdict': 'admit'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('uploader.boundedexecutor.LogReader')
+        self.log_reader = patcher.start()
+        self.addCleanup(patcher.stop)
+        # no left over leases of other test runs
+        REDIS_CLIENT.delete(analysis_leases.key)
+        # all slots busy
+        self.semaphore = pools[ANALYSIS_POOL].semaphore
+        self.busy_slots = pools[ANALYSIS_POOL].limit
+        for _slot in range(self.busy_slots):
+            self.semaphore.acquire()     # pylint: disable=consider-using-with
+        self.analyses = [FirmwareAnalysis.objects.create(id=uuid.uuid4()) for _analysis in range(3)]
+
+    def tearDown(self):
+        for _slot in range(self.busy_slots):
+            self.semaphore.release()
+        self.release.set()
+        super().tearDown()
+
+    def run_emba_cmd(self, cmd, _analysis_id=None, _active_analyzer_dir=None):
+        self.started.append(cmd)
+        self.release.wait(timeout=10)
+
+    def submit(self, analysis):
+        return BoundedExecutor.submit_analysis(f"emba {analysis.id}", analysis.id, f"/tmp/{analysis.id}/")
+
+    def free_slot(self):
+        self.busy_slots -= 1
+        self.semaphore.release()
+
+    def test_queue_order(self):
+        for analysis in self.analyses:
+            self.assertIsInstance(self.submit(analysis), AnalysisQueueEntry)
+        self.assertEqual([1, 2, 3], [AnalysisQueueEntry.position(analysis.id) for analysis in self.analyses])
+
+        self.free_slot()
+        BoundedExecutor.dispatch_waiting()
+        self.assertEqual([f"emba {self.analyses[0].id}"], self.started)
+        self.log_reader.assert_called_once_with(self.analyses[0].id)
+        self.assertEqual([None, 1, 2], [AnalysisQueueEntry.position(analysis.id) for analysis in self.analyses])
+
+        # no slot left, the next one keeps its place
+        BoundedExecutor.dispatch_waiting()
+        self.assertEqual(1, AnalysisQueueEntry.position(self.analyses[1].id))
+        # new analyses queue up behind the waiting ones even with a free slot
+        self.free_slot()
+        late = FirmwareAnalysis.objects.create(id=uuid.uuid4())
+        self.submit(late)
+        self.assertEqual(f"emba {self.analyses[1].id}", self.started[-1])
+        self.assertEqual(2, AnalysisQueueEntry.position(late.id))
+
+    def test_cancel(self):
+        self.submit(self.analyses[0])
+        self.submit(self.analyses[1])
+        self.assertTrue(BoundedExecutor.cancel_waiting(self.analyses[0].id))
+        self.assertFalse(BoundedExecutor.cancel_waiting(self.analyses[0].id))
+        analysis = FirmwareAnalysis.objects.get(id=self.analyses[0].id)
+        self.assertTrue(analysis.failed and analysis.finished)
+        self.assertEqual(1, AnalysisQueueEntry.position(self.analyses[1].id))
+
+    def test_failed_dispatch_keeps_entry(self):
+        self.submit(self.analyses[0])
+        self.free_slot()
+        with mock.patch('uploader.admission.decide', side_effect=RuntimeError("db gone")):
+            with self.assertRaises(RuntimeError):
+                BoundedExecutor.dispatch_waiting()
+        with mock.patch.object(BoundedExecutor, 'submit', side_effect=RuntimeError("shut down")):
+            BoundedExecutor.dispatch_waiting()
+        self.assertEqual(1, AnalysisQueueEntry.position(self.analyses[0].id))
+        self.assertEqual([], self.started)
+
+    def test_cancel_while_held_back(self):
+        self.submit(self.analyses[0])
+        self.free_slot()
+
+        def cancel(analysis):
+            # cancelled by another request while the dispatcher decides
+            self.assertTrue(AnalysisQueueEntry.objects.filter(analysis=analysis).exists())
+            BoundedExecutor.cancel_waiting(analysis.id)
+            return {'verdict': 'queue'}
+
+        with mock.patch('uploader.admission.decide', side_effect=cancel), \
+                mock.patch.object(BoundedExecutor, 'retry_dispatch'):
+            BoundedExecutor.dispatch_waiting()
+        self.assertFalse(AnalysisQueueEntry.objects.exists())
+        self.assertEqual([], self.started)
+
+    def test_reattach_over_limit(self):
+        # all slots of the host are taken, but the reattached EMBA runs already
+        leases = [analysis_leases.acquire() for _slot in range(analysis_leases.limit)]
+        self.addCleanup(lambda: [analysis_leases.release(lease) for lease in leases])
+        claim = mock.Mock(analysis_id=self.analyses[0].id)
+        with mock.patch.object(BoundedExecutor, 'wait_for_emba', side_effect=lambda *_args: self.release.wait(timeout=10)) as wait_for_emba:
+            waiter = BoundedExecutor.submit_reattached(claim, 4711, "/tmp/active/")
+            self.assertIsInstance(waiter, threading.Thread)
+            self.assertEqual(analysis_leases.limit + 1, analysis_leases.in_use())
+            self.release.set()
+            waiter.join(timeout=10)
+        wait_for_emba.assert_called_once_with(claim, 4711, "/tmp/active/")
+        self.assertEqual(analysis_leases.limit, analysis_leases.in_use())
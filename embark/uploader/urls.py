@@ -19,6 +19,7 @@ urlpatterns = [
     path('uploader/download/', views.download_firmware, name='embark-uploader-download'),
 
     path('uploader/start/', views.start_analysis, name='embark-uploader-start-analysis'),
+    path('uploader/admission/', views.admission_decisions, name='embark-uploader-admission'),
 
     path('uploader/device/', views.device_setup, name='embark-uploader-device'),
     path('uploader/vendor/', views.vendor, name='embark-uploader-vendor'),
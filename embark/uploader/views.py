@@ -9,7 +9,7 @@ import os
 from wsgiref.util import FileWrapper
 
 from django.conf import settings
-from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseServerError, QueryDict, StreamingHttpResponse
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseServerError, JsonResponse, QueryDict, StreamingHttpResponse
 from django.contrib.auth.decorators import login_required, permission_required
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
@@ -21,9 +21,10 @@ from rest_framework.parsers import MultiPartParser
 from rest_framework import serializers
 
 from embark.helper import disk_space_check, user_is_auth
+from uploader.admission import host_resources, recent_decisions, slot_count
 from uploader.executor import submit_firmware
 from uploader.forms import DeviceForm, DownloadFirmwareForm, FirmwareAnalysisForm, DeleteFirmwareForm, LabelForm, VendorForm
-from uploader.models import FirmwareFile
+from uploader.models import AnalysisQueueEntry, FirmwareFile
 from uploader.serializers import FirmwareAnalysisSerializer
 from users.decorators import require_api_key
 
@@ -76,6 +77,14 @@ class BufferFullException(Exception):
     pass
 
 
+def refusal_reason(analysis_id):
+    """
+    :return: why the admission control refused the analysis
+    """
+    decisions = recent_decisions(analysis_id)
+    return f"not enough resources, {decisions[0]['reason']}" if decisions else "Buffer full"
+
+
 class UploaderView(APIView):
     parser_classes = [MultiPartParser]
 
@@ -116,9 +125,13 @@ class UploaderView(APIView):
 
         try:
             analysis_id = start_analysis_serialized(query_dict)
+            # all slots busy, the analysis starts when it's its turn
+            position = AnalysisQueueEntry.position(analysis_id)
+            if position is not None:
+                return Response({'status': 'queued', 'id': analysis_id, 'position': position}, status=202)
             return Response({'status': 'success', 'id': analysis_id}, status=201)
-        except BufferFullException:
-            return Response({'status': 'Error: Buffer full'}, status=503)
+        except BufferFullException as exception:
+            return Response({'status': 'Error: Buffer full', 'reason': str(exception)}, status=503)
         except serializers.ValidationError as exception:
             return Response({'status': 'Error: Form invalid', 'errors': exception.detail}, status=400)
 
@@ -150,7 +163,7 @@ def start_analysis_serialized(data):
 
     # inject into bounded Executor
     if not submit_firmware(firmware_analysis=new_analysis, firmware_file=new_firmware_file):
-        raise BufferFullException
+        raise BufferFullException(refusal_reason(new_analysis.id))
 
     return new_analysis.id
 
@@ -264,7 +277,14 @@ def start_analysis(request):
             new_analysis.save()
             logger.debug("new_analysis %s has label: %s", new_analysis, new_analysis.label)
             # inject into bounded Executor
-            if submit_firmware(firmware_analysis=new_analysis, firmware_file=new_firmware_file):
+            submitted = submit_firmware(firmware_analysis=new_analysis, firmware_file=new_firmware_file)
+            # refused by the admission control, it shows up as failed
+            if submitted or recent_decisions(new_analysis.id):
+                position = AnalysisQueueEntry.position(new_analysis.id)
+                if not submitted:
+                    messages.error(request, f'Analysis {new_analysis.id} refused: {refusal_reason(new_analysis.id)}')
+                elif position is not None:
+                    messages.info(request, f'All analysis slots are busy, {new_analysis.id} is queued at position {position}.')
                 return redirect('embark-dashboard-service')
             logger.error("Server Queue full, or other boundedexec error")
             return HttpResponseServerError("Queue full")
@@ -376,3 +396,19 @@ def download_firmware(request):
     logger.error("Form error: %s", form.errors)
     messages.error(request, 'error in form')
     return redirect('embark-uploader-manage-file')
+
+
+@permission_required("users.uploader_permission_advanced", login_url='/')
+@login_required(login_url='/' + settings.LOGIN_URL)
+@require_http_methods(["GET"])
+def admission_decisions(request):
+    """
+    Host capacity and the recent admission decisions for local analyses, to tune the cost profiles and reserves
+    """
+    req_logger.info("User %s called admission_decisions", request.user.username)
+    resources = host_resources()
+    return JsonResponse({
+        'resources': resources,
+        'slots': slot_count(resources),
+        'decisions': recent_decisions(),
+    })
@@ -7,7 +7,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.sessions.models import Session
 
-from users.models import User, Team
+from users.models import OutboxMail, User, Team
 
 
 UserAdmin.list_display += ('timezone', 'team',)
@@ -27,4 +27,5 @@ class SessionAdmin(admin.ModelAdmin):
 
 admin.site.register(User, UserAdmin)
 admin.site.register(Team)
+admin.site.register(OutboxMail)
 admin.site.register(Session, SessionAdmin)
@@ -3,8 +3,13 @@ __author__ = 'Benedikt Kuehne'
 __license__ = 'MIT'
 
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from users.tasks import create_periodic_tasks  # pylint: disable=import-outside-toplevel
+        post_migrate.connect(create_periodic_tasks)
@@ -5,6 +5,7 @@ __license__ = 'MIT'
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
+from django.utils import timezone
 
 
 class Team(models.Model):
@@ -36,3 +37,26 @@ class User(AbstractUser):
             ("worker_permission", "Can access worker functionalities of embark"),
             ("settings_permission", "Can access settings functionalities of embark")
         )
+
+
+class OutboxMail(models.Model):
+    """
+    class OutboxMail
+    Mail waiting for users.tasks.dispatch_outbox. Pending mails of one recipient with the same digest key are sent as one digest,
+    failed ones are retried with backoff and kept with their error once they ran out of attempts
+    """
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    from_email = models.CharField(max_length=255)
+    recipient = models.EmailField()
+    digest_key = models.CharField(max_length=64, blank=True, default='', help_text='Mails with the same key are merged')
+    created = models.DateTimeField(auto_now_add=True)
+    next_attempt = models.DateTimeField(default=timezone.now, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.subject} to {self.recipient}"
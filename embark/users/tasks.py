@@ -0,0 +1,141 @@
+__copyright__ = 'Copyright 2026 Siemens Energy AG'
+__author__ = 'Benedikt Kuehne'
+__license__ = 'MIT'
+
+from datetime import timedelta
+from smtplib import SMTPException
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+from django_celery_beat.models import IntervalSchedule, PeriodicTask
+from redis import Redis
+
+from users.models import OutboxMail
+
+logger = get_task_logger(__name__)
+
+REDIS_CLIENT = Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
+LOCK_TIMEOUT = 60 * 5
+
+# retries wait BACKOFF_BASE * 2^(attempts - 1) seconds, at most BACKOFF_MAX
+BACKOFF_BASE = 60
+BACKOFF_MAX = 6 * 60 * 60
+
+
+def create_periodic_tasks(**kwargs):
+    """
+    Create the periodic outbox dispatch with the start of the application. (called in ready() method of the app config)
+    """
+    schedule, _ = IntervalSchedule.objects.get_or_create(
+        every=settings.OUTBOX_INTERVAL, period=IntervalSchedule.SECONDS
+    )
+    # the name is unique, a changed OUTBOX_INTERVAL updates the existing task
+    PeriodicTask.objects.update_or_create(
+        name="Dispatch mail outbox",
+        defaults={"interval": schedule, "task": "users.tasks.dispatch_outbox"},
+    )
+
+
+def queue_mail(subject, message, recipients, digest_key=''):
+    """
+    Puts a mail into the outbox instead of sending it right away
+
+    :param subject: mail subject
+    :param message: mail body
+    :param recipients: list of addresses, empty ones are skipped
+    :param digest_key: mails with the same key to the same recipient are merged, they wait OUTBOX_DIGEST_WINDOW for the rest of a burst
+    """
+    next_attempt = timezone.now() + timedelta(seconds=settings.OUTBOX_DIGEST_WINDOW if digest_key else 0)
+    OutboxMail.objects.bulk_create([
+        OutboxMail(subject=subject, message=message, from_email='system@' + settings.DOMAIN, recipient=recipient,
+                   digest_key=digest_key, next_attempt=next_attempt)
+        for recipient in recipients if recipient
+    ])
+
+
+def build_message(mails):
+    """
+    :param mails: pending OutboxMail of one recipient, more than one for a digest
+    :return: EmailMessage
+    """
+    first = mails[0]
+    if len(mails) == 1:
+        return EmailMessage(first.subject, first.message, first.from_email, [first.recipient])
+    body = "\n".join(mail.message for mail in mails)
+    return EmailMessage(f"{first.subject} ({len(mails)}x)", body, first.from_email, [first.recipient])
+
+
+def postpone(mails, error):
+    """
+    Schedules the next attempt with exponential backoff
+    """
+    now = timezone.now()
+    for mail in mails:
+        mail.attempts += 1
+        mail.next_attempt = now + timedelta(seconds=min(BACKOFF_BASE * 2 ** (mail.attempts - 1), BACKOFF_MAX))
+        mail.last_error = str(error)
+    OutboxMail.objects.bulk_update(mails, ["attempts", "next_attempt", "last_error"])
+    logger.warning("Mail to %s postponed after %d attempts: %s", mails[0].recipient, mails[0].attempts, error)
+
+
+def pending_groups():
+    """
+    :return: due mails grouped into the messages to send, a digest takes all pending mails of its key
+    """
+    pending = OutboxMail.objects.filter(attempts__lt=settings.OUTBOX_MAX_ATTEMPTS)
+    groups = {}
+    for mail in pending.filter(next_attempt__lte=timezone.now())[:settings.OUTBOX_BATCH]:
+        key = (mail.recipient, mail.digest_key or mail.id)
+        if key not in groups:
+            groups[key] = [mail]
+            if mail.digest_key:
+                groups[key] = list(pending.filter(recipient=mail.recipient, digest_key=mail.digest_key))
+    return list(groups.values())
+
+
+def send_outbox():
+    """
+    Sends the due mails over one connection
+
+    :return: number of outbox mails that were sent
+    """
+    groups = pending_groups()
+    if not groups:
+        return 0
+    sent = 0
+    connection = get_connection()
+    try:
+        connection.open()
+        for mails in groups:
+            try:
+                connection.send_messages([build_message(mails)])
+            except (OSError, SMTPException) as error:
+                # the connection is probably gone, the other mails stay due for the next run
+                postpone(mails, error)
+                break
+            OutboxMail.objects.filter(id__in=[mail.id for mail in mails]).delete()
+            sent += len(mails)
+    except (OSError, SMTPException) as error:
+        logger.error("Mail server not reachable: %s", error)
+        postpone([mail for mails in groups for mail in mails], error)
+    finally:
+        connection.close()
+    return sent
+
+
+@shared_task
+def dispatch_outbox():
+    """
+    Periodic task: sends the outbox, one run at a time
+    """
+    lock = REDIS_CLIENT.lock("DISPATCH_OUTBOX_LOCK", LOCK_TIMEOUT)
+    if lock.locked():
+        logger.info("Outbox dispatch is already running")
+        return
+    with lock:
+        sent = send_outbox()
+        if sent:
+            logger.info("Sent %d mails from the outbox", sent)
@@ -4,12 +4,19 @@ __license__ = 'MIT'
 
 from http import HTTPStatus
 import secrets
-from django.conf import settings
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import mock
 
-from django.test import TestCase
+from django.conf import settings
+from django.core import mail
+from django.test import TestCase, override_settings
 from django.test import Client
+from django.utils import timezone
+from django_celery_beat.models import PeriodicTask
 
-from users.models import User
+from users.models import OutboxMail, User
+from users.tasks import create_periodic_tasks, queue_mail, send_outbox
 
 
 # class SeleniumTests(StaticLiveServerTestCase):
@@ -130,3 +137,45 @@ class TestUsers(TestCase):
         """
         response = self.client.post(settings.LOGIN_URL, {'email': 'testuser', 'password': '12345'})
         self.assertEqual(response.status_code, HTTPStatus.OK)
+
+
+class TestOutbox(TestCase):
+
+    def test_periodic_task(self):
+        create_periodic_tasks()
+        with override_settings(OUTBOX_INTERVAL=120):
+            # a changed interval updates the task instead of adding a second one
+            create_periodic_tasks()
+        task = PeriodicTask.objects.get(name="Dispatch mail outbox")
+        self.assertEqual(120, task.interval.every)
+
+    def test_send(self):
+        queue_mail("Analysis completed", "done", ["user@embark.local", ""])
+        self.assertEqual(1, OutboxMail.objects.count())
+        self.assertEqual(1, send_outbox())
+        self.assertEqual(["user@embark.local"], mail.outbox[0].to)
+        self.assertFalse(OutboxMail.objects.exists())
+
+    def test_digest(self):
+        for analysis in range(3):
+            queue_mail("Failed EMBA run", f"analysis {analysis} failed", ["admin@embark.local"], digest_key="run_failed")
+        # the burst waits for the digest window
+        self.assertEqual(0, send_outbox())
+        OutboxMail.objects.filter(id=OutboxMail.objects.first().id).update(next_attempt=timezone.now())
+        self.assertEqual(3, send_outbox())
+        self.assertEqual(1, len(mail.outbox))
+        self.assertEqual("Failed EMBA run (3x)", mail.outbox[0].subject)
+        self.assertEqual(3, len(mail.outbox[0].body.splitlines()))
+
+    def test_retry(self):
+        queue_mail("Analysis completed", "first", ["first@embark.local"])
+        queue_mail("Analysis completed", "second", ["second@embark.local"])
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=SMTPException("timeout")):
+            self.assertEqual(0, send_outbox())
+        first, second = OutboxMail.objects.all()
+        self.assertEqual((1, "timeout"), (first.attempts, first.last_error))
+        self.assertGreater(first.next_attempt, timezone.now() + timedelta(seconds=30))
+        # not tried after the connection broke
+        self.assertEqual(0, second.attempts)
+        self.assertEqual(1, send_outbox())
+        self.assertEqual(["second@embark.local"], mail.outbox[0].to)
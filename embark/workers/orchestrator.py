@@ -12,6 +12,7 @@ from redis import Redis
 from django.conf import settings
 from django.utils import timezone
 
+from embark.liveprogress import LiveProgress
 from uploader.models import FirmwareAnalysis
 from workers.models import Worker, OrchestratorState
 
@@ -145,12 +146,10 @@ class Orchestrator:
                 analysis = FirmwareAnalysis.objects.get(id=worker.analysis_id)
                 analysis.failed = True
                 analysis.finished = True
-                analysis.status['finished'] = True
-                analysis.status['work'] = False
                 analysis.end_date = timezone.now()
                 analysis.scan_time = timezone.now() - analysis.start_date
                 analysis.duration = str(analysis.scan_time)
-                analysis.save()
+                LiveProgress(analysis.id).materialize(analysis, {'finished': True, 'work': False}, ["finished", "failed", "end_date", "scan_time", "duration"])
             self._remove_worker(worker)
             worker_soft_reset_task.delay(worker.id, True)
 
@@ -26,6 +26,9 @@ from django.utils import timezone
 from django.conf import settings
 
 from embark.helper import is_ip_local_host, get_size
+from embark.liveprogress import LiveProgress
+from embark.logviewer import write_line_index
+from embark.statussnapshot import publish_status
 from uploader.archiver import Archiver
 from workers.models import Worker, Configuration, DependencyVersion, DependencyType, WorkerDependencyVersion
 from workers.update.dependencies import eval_outdated_dependencies, get_script_name, update_dependency, setup_dependency
@@ -150,8 +153,8 @@ def _new_analysis_from(old_analysis: FirmwareAnalysis) -> FirmwareAnalysis:
     #   If they have been archived (old_analysis.archived=True), the archived logs (old_analysis.zip_file) will be deleted.
     # - We may want to set keep_parents=True in case the analysis is still referenced by a parent object.
     #   This is how it was previously done in dashboard/views::delete_analysis().
-    # - We don't need to worry about an unterminated LogReader.read_loop() since this only gets started for local analyses
-    #   via BoundedExecutor.submit() of LogReader.__init__() with the analysis ID.
+    # - We don't need to worry about an unfinished LogReader since it doesn't occupy a thread,
+    #   it only keeps a watch registered with the shared embark.logwatcher.log_watcher.
     # - Since we assume that the old analysis was running on an unreachable worker, we don't need to check
     #   if the analysis is still running (old_analysis.finished) but we do need to reset the worker once it becomes reachable again.
     # - We have to explicitly reset the worker once it reconnects because the monitoring task
@@ -356,12 +359,15 @@ def monitor_worker_and_fetch_logs(worker_id) -> None:
         analysis.failed = True
     finally:
         analysis.finished = True
-        analysis.status['finished'] = True
-        analysis.status['work'] = False
         analysis.end_date = timezone.now()
         analysis.scan_time = timezone.now() - analysis.start_date
         analysis.duration = str(analysis.scan_time)
-        analysis.save()
+        # narrow update, the reader might still write the status of the fetched log
+        LiveProgress(analysis.id).materialize(analysis, {'finished': True, 'work': False}, ["finished", "failed", "end_date", "scan_time", "duration"])
+        publish_status(analysis)
+
+        # emba_run.log got fetched for the last time
+        write_line_index(f"{settings.EMBA_LOG_ROOT}/{analysis.id}/emba_run.log")
 
         if not ssh_failed:
             orchestrator.remove_worker(worker)
@@ -427,7 +433,7 @@ def _fetch_analysis_logs(worker) -> None:
         logger.info("[Worker %s] Downloaded emba_run.log.", worker.id)
         worker.write_log(f"\nDownloaded emba_run.log.\n")
 
-        # Note: The LogReader.read_loop() will look for logfiles in <analysis.path_to_logs>/emba.log
+        # Note: The LogReader watches for changes of <analysis.path_to_logs>/emba.log
         #       where path_to_logs will be set to settings.EMBA_LOG_ROOT/<analysis.id>/emba_logs/
         unzip_cmd = ["7z", "x", "-y", local_zip_path, f"-o{local_log_dir}/"]
         subprocess.run(unzip_cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=True)  # nosec
@@ -499,12 +505,11 @@ def stop_remote_analysis(worker_id) -> None:
         analysis = FirmwareAnalysis.objects.get(id=worker.analysis_id)
         analysis.failed = True
         analysis.finished = True
-        analysis.status['finished'] = True
-        analysis.status['work'] = False
         analysis.end_date = timezone.now()
         analysis.scan_time = timezone.now() - analysis.start_date
         analysis.duration = str(analysis.scan_time)
-        analysis.save()
+        LiveProgress(analysis.id).materialize(analysis, {'finished': True, 'work': False}, ["finished", "failed", "end_date", "scan_time", "duration"])
+        publish_status(analysis)
 
         logger.info("[Worker %s] Successfully stopped the analysis.", worker.id)
         worker.write_log(f"\nSuccessfully stopped the analysis.\n")
@@ -906,7 +911,7 @@ def worker_log_rotate():
     workers = Worker.objects.all()
     for worker in workers:
         try:
-            if worker.log_location and worker.log_location.exists():
+            if worker.log_location and Path(worker.log_location).is_file():
                 if get_size(worker.log_location) > 200000000:  # bigger than 200 MB
                     logger.info("Rotating log file for worker %s", worker.name)
                     worker.write_log(f"\nRotating log file...\n")
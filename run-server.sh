@@ -34,6 +34,8 @@ export EMBARK_BASEDIR=""
 export OS_TYPE=""
 
 STRICT_MODE=0
+# EMBA runs survive a server stop, the next start takes them over. -k stops them
+STOP_EMBA=0
 EMBARK_BASEDIR="$(realpath "$(dirname "${0}")")"
 
 CELERY_PID=0
@@ -57,15 +59,19 @@ import_helper()
 }
 
 cleaner() {
-  # stops ALL emba processes started from within embark that were not killed successfully
+  # running EMBA analyses are reattached by the next server start, they are only stopped with -k
   # timeout 30s pkill -u root -f "embark/emba/emba"
   local PID_FILES=()
   mapfile -d '' PID_FILES < <(find "${EMBA_LOG_ROOT:-emba_logs}" -type f -name "emba_run.pid" -print0 2> /dev/null)
 
   if [[ ${#PID_FILES[@]} -ne 0 ]]; then
     for FILE in "${PID_FILES[@]}"; do
-      echo -e "${RED}""${BOLD}""Making sure the EMBA process with PID ""$(cat "${FILE}")"" from ""${FILE}"" is stopped""${NC}"
-      timeout 3s pkill -F "${FILE}"
+      if [[ ${STOP_EMBA} -eq 1 ]]; then
+        echo -e "${RED}""${BOLD}""Making sure the EMBA process with PID ""$(cat "${FILE}")"" from ""${FILE}"" is stopped""${NC}"
+        timeout 3s pkill -F "${FILE}"
+      elif pgrep -F "${FILE}" &>/dev/null; then
+        echo -e "${ORANGE}""${BOLD}""Leaving the EMBA process with PID ""$(cat "${FILE}")"" from ""${FILE}"" running, the next start takes it over""${NC}"
+      fi
     done
   fi
 
@@ -91,7 +97,7 @@ cleaner() {
 # main
 echo -e "\\n${ORANGE}""${BOLD}""EMBArk Startup""${NC}\\n""${BOLD}=================================================================${NC}"
 
-while getopts "ha:b:i:" OPT ; do
+while getopts "ha:b:i:k" OPT ; do
   case ${OPT} in
     h)
       echo -e "\\n""${CYAN}""USAGE""${NC}"
@@ -99,6 +105,7 @@ while getopts "ha:b:i:" OPT ; do
       echo -e "${CYAN}-a <IP/Name>${NC} Add a server Virtualhost alias"
       echo -e "${CYAN}-b <IP/Range>${NC} Add a ipv4 to access the admin pages from"
       echo -e "${CYAN}-i <IP>${NC} specify the ipv4 to host the server on (default=0.0.0.0)"
+      echo -e "${CYAN}-k${NC}           Stop running EMBA analyses on shutdown (default: the next start takes them over)"
       echo -e "---------------------------------------------------------------------------"
       if ip addr show eth0 &>/dev/null ; then
         IP=$(ip addr show eth0 | grep "inet\b" | awk '{print $2}' | cut -d/ -f1)
@@ -123,8 +130,11 @@ while getopts "ha:b:i:" OPT ; do
       BIND_IP="${OPTARG}"
       echo -e "${GREEN} Bind IP set to: ${BIND_IP}""${NC}"
       ;;
+    k)
+      STOP_EMBA=1
+      ;;
     :)
-      echo -e "${CYAN} Usage: [-a <IP/HOSTNAME>] [-b <IP/Range>] [-i <IP>] ${NC}"
+      echo -e "${CYAN} Usage: [-a <IP/HOSTNAME>] [-b <IP/Range>] [-i <IP>] [-k] ${NC}"
       exit 1
       ;;
     *)